@@ -0,0 +1,103 @@
+# Benchmark of mesh flattening: the former list-based recursive_parse vs parse_meshes
+# (NumPy). Builds a temporary stage of transformed grid meshes, checks that both
+# produce the same mesh and prints the timings. Needs only pxr and numpy, not Isaac Sim.
+#
+#   PYTHONPATH=src python scripts/benchmarks/bench_mesh_parse.py --meshes 200 --grid 32
+import os
+import shutil
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from pxr import Gf, Usd, UsdGeom
+
+from render_usd.utils.usd_utils.prim_utils import parse_meshes
+
+
+def build_stage(usd_path: str, num_meshes: int, grid: int) -> Usd.Stage:
+    """
+    Stage with num_meshes grid meshes of grid x grid quads under nested transforms.
+    """
+    stage = Usd.Stage.CreateNew(usd_path)
+    root = UsdGeom.Xform.Define(stage, "/World")
+    xs, ys = np.meshgrid(np.arange(grid + 1, dtype=np.float32), np.arange(grid + 1, dtype=np.float32))
+    points = np.stack([xs.ravel(), ys.ravel(), np.zeros(xs.size, dtype=np.float32)], axis=1)
+    corners = (np.arange(grid)[None, :] + (grid + 1) * np.arange(grid)[:, None]).ravel()
+    indices = np.stack([corners, corners + 1, corners + grid + 2, corners + grid + 1], axis=1).ravel()
+    for idx_mesh in range(num_meshes):
+        if idx_mesh % 10 == 0:
+            group = UsdGeom.Xform.Define(stage, f"/World/group_{idx_mesh // 10}")
+            group.AddTranslateOp().Set(Gf.Vec3d(idx_mesh // 10, 0, 0))
+        mesh = UsdGeom.Mesh.Define(stage, f"/World/group_{idx_mesh // 10}/mesh_{idx_mesh}")
+        mesh.AddTranslateOp().Set(Gf.Vec3d(0, idx_mesh, 0))
+        mesh.AddRotateXYZOp().Set(Gf.Vec3f(idx_mesh, 2 * idx_mesh, 0))
+        mesh.CreatePointsAttr(points)
+        mesh.CreateFaceVertexCountsAttr(np.full(grid * grid, 4, dtype=np.int32))
+        mesh.CreateFaceVertexIndicesAttr(indices.astype(np.int32))
+    stage.SetDefaultPrim(root.GetPrim())
+    stage.Save()
+    return stage
+
+
+def list_parse(prim: Usd.Prim):
+    """
+    Baseline: recursive_parse as it was before parse_meshes (per-point Python lists,
+    one world transform per mesh, recursion over children). The stage has no NaN points.
+    """
+    points_total, counts_total, indices_total = [], [], []
+    if prim.IsA(UsdGeom.Mesh):
+        transform = np.array(UsdGeom.Imageable(prim).ComputeLocalToWorldTransform(Usd.TimeCode.Default()))
+        points = np.array([_ for _ in prim.GetAttribute("points").Get()])
+        points_h = np.dot(np.hstack([points, np.ones((points.shape[0], 1))]), transform)
+        points_total.extend(np.array((points_h[:, :3] / points_h[:, 3][:, np.newaxis]).tolist()))
+        counts_total.extend([_ for _ in prim.GetAttribute("faceVertexCounts").Get()])
+        indices_total.extend(np.array([_ for _ in prim.GetAttribute("faceVertexIndices").Get()]).tolist())
+    for child in prim.GetChildren():
+        child_points, child_counts, child_indices = list_parse(child)
+        indices_total.extend((len(points_total) + np.array(child_indices, dtype=np.int64)).tolist())
+        counts_total.extend(child_counts)
+        points_total.extend(child_points)
+    return points_total, counts_total, indices_total
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list-based mesh parsing against parse_meshes.")
+    parser.add_argument("--meshes", type=int, default=200, help="Number of meshes")
+    parser.add_argument("--grid", type=int, default=32, help="Quads per mesh side")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per implementation, the best is reported")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_mesh_parse_")
+    stage = build_stage(os.path.join(work_dir, "bench.usdc"), args.meshes, args.grid)
+    root = stage.GetPrimAtPath("/World")
+
+    points_ref, counts_ref, indices_ref = list_parse(root)
+    points, counts, indices = parse_meshes(root)
+    assert np.allclose(np.asarray(points_ref, dtype=np.float32), points, atol=1e-4)
+    assert np.array_equal(np.asarray(counts_ref), counts) and np.array_equal(np.asarray(indices_ref), indices)
+
+    time_ref = best_of(lambda: list_parse(root), args.repeat)
+    time_new = best_of(lambda: parse_meshes(root), args.repeat)
+    cache_dir = os.path.join(work_dir, "cache")
+    parse_meshes(root, cache_dir=cache_dir)
+    time_cached = best_of(lambda: parse_meshes(root, cache_dir=cache_dir), args.repeat)
+    shutil.rmtree(work_dir)
+
+    print(f"[Benchmark] {args.meshes} meshes, {points.shape[0]} points, {counts.shape[0]} faces")
+    print(f"[Benchmark] list-based parse:       {time_ref * 1000:9.1f} ms")
+    print(f"[Benchmark] parse_meshes:           {time_new * 1000:9.1f} ms ({time_ref / time_new:.1f}x)")
+    print(f"[Benchmark] parse_meshes (cached):  {time_cached * 1000:9.1f} ms ({time_ref / time_cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,509 @@
 import argparse
+import contextlib
+import io
+import json
 import sys
 import os
+import time
 from pathlib import Path
-from isaacsim import SimulationApp
+from natsort import natsorted
+
+from render_usd.config.settings import (
+    DEFAULT_GRSCENES100_ASSETS_DIR, DEFAULT_GRSCENES100_SAVE_DIR,
+    DEFAULT_GRSCENES_DIR, DEFAULT_GRSCENES_SCENE_DIR, DEFAULT_DAEMON_SOCKET
+)
 
 # Configuration for SimulationApp
 CONFIG = {"headless": True, "anti_aliasing": 4, "multi_gpu": False, "renderer": "PathTracing"}
 
-def main():
+
+def add_render_arguments(parser):
+    parser.add_argument('--settle', type=str, default="fixed", choices=["fixed", "adaptive"], help="Settle strategy: fixed 100 physics + 8 render steps, or render until frames converge")
+    parser.add_argument('--settle_threshold', type=float, default=0.002, help="Adaptive settle: max normalised frame difference between consecutive render steps")
+    parser.add_argument('--static_scene', action='store_true', help="Render-only mode: disable physics simulation and advance frames through render ticks only")
+    parser.add_argument('--annotators', type=str, default=None, help="Comma-separated annotators to attach, e.g. 'rgb,bbox2d_tight'. Defaults to the minimum each pipeline reads")
+    parser.add_argument('--tile_size', type=int, default=1, help="Number of objects rendered together per settle cycle (objects without background only)")
+    parser.add_argument('--prefetch', type=int, default=2, help="Number of upcoming assets whose USD layers are opened in the background (0 disables)")
+    parser.add_argument('--manifest', type=str, default=None, help="Render manifest (JSONL) used for resume/skip decisions instead of listing output directories")
+    parser.add_argument('--rebuild_manifest', action='store_true', help="Import outputs already on disk into --manifest and exit without rendering")
+    parser.add_argument('--profile', action='store_true', help="Time every render phase and print p50/p95/p99 per phase at the end of the run")
+    parser.add_argument('--backend', type=str, default="isaac", choices=["isaac", "mock"], help="Render backend: Isaac Sim, or a CPU-only mock that synthesises frames (for testing and profiling the pipeline)")
+    parser.add_argument('--mock_frame_size', type=str, default=None, help="Mock backend: synthesised frame size as WIDTHxHEIGHT (default: camera resolution)")
+    parser.add_argument('--mock_latency', type=float, default=0.0, help="Mock backend: seconds slept per rendered step")
+    parser.add_argument('--incremental', action='store_true', help="Also re-render objects whose content fingerprint (layers, MDLs, textures) or render settings changed")
+    parser.add_argument('--no_precheck', action='store_true', help="Boot Isaac Sim without first checking in pure Python whether anything is pending")
+    parser.add_argument('--profile_output', type=str, default=None, help="JSONL file receiving one phase-timing record per rendered object (implies --profile)")
+
+
+def check_arguments(parser, args):
+    """
+    Checks argparse cannot express. Exits through parser.error like a parsing error.
+    """
+    if args.command == 'grscenes100' and not args.queue and (args.chunk_id is None or args.chunk_total is None):
+        parser.error("grscenes100 requires --chunk_id and --chunk_total unless --queue is given")
+    if args.command == 'grscenes100' and args.incremental and args.save_dir == 'inplace':
+        # Fingerprints would land in the asset directories whose mtimes the asset index watches
+        parser.error("--incremental stores fingerprints in the output directory and cannot be used with --save_dir inplace")
+
+def launch_app(backend_name):
+    """
+    Boot Isaac Sim for the isaac backend. The mock backend runs without an app.
+    """
+    if backend_name != "isaac":
+        return None
+    from isaacsim import SimulationApp
+    return SimulationApp(CONFIG)
+
+def close_app(kit):
+    if kit is not None:
+        kit.close()
+
+def restart_renderer(renderer, kit, work_queue=None):
+    """
+    Release what this process holds and replace it with a fresh run of the same command.
+
+    Pending writes are flushed and the writer threads stopped, held queue leases are given
+    back and Kit is closed, so the new process resumes from what is on disk. Manifest
+    records are fsynced as they are appended and need no flush.
+    """
+    from render_usd.core.scene_lifecycle import restart_process
+
+    renderer.write_errors += renderer.image_writer.close()
+    renderer.prefetcher.close()
+    close_work_queue(work_queue)
+    renderer.timer.print_summary()
+    close_app(kit)
+    restart_process()
+
+def backend_kwargs(args):
+    """
+    Constructor arguments of the selected backend.
+    """
+    if args.backend != "mock":
+        return {}
+    frame_size = tuple(int(v) for v in args.mock_frame_size.lower().split("x")) if args.mock_frame_size else None
+    return {"frame_size": frame_size, "render_latency": args.mock_latency}
+
+def add_asset_index_arguments(parser):
+    parser.add_argument('--asset_index', type=str, default=None, help="Asset index file shared by chunk workers; built on first use (see the index command)")
+    parser.add_argument('--refresh_index', action='store_true', help="Incrementally refresh the asset index (changed directories only) before slicing it")
+
+
+def add_queue_arguments(parser):
+    parser.add_argument('--queue', type=str, default=None, help="Shared queue directory: workers claim small batches until all assets are done, instead of rendering a fixed chunk")
+    parser.add_argument('--queue_batch_size', type=int, default=4, help="Objects per claimed batch (set when the queue is created)")
+    parser.add_argument('--lease_seconds', type=float, default=600.0, help="A batch whose worker stopped renewing its claim for this long is reclaimed")
+
+
+def open_work_queue(args, object_usd_paths, thumbnail_wo_bg_dir):
+    """
+    Create or join the work queue of --queue. Returns None without --queue.
+    """
+    if not args.queue:
+        return None
+    from render_usd.core.outputs import resolve_thumbnail_save_dir
+    from render_usd.core.work_queue import WorkQueue
+
+    work_queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds)
+    items = [(object_usd_path, resolve_thumbnail_save_dir(object_usd_path, thumbnail_wo_bg_dir, idx_obj)) for idx_obj, object_usd_path in enumerate(object_usd_paths)]
+    work_queue.initialize(items, batch_size=args.queue_batch_size)
+    return work_queue
+
+
+def close_work_queue(work_queue):
+    if work_queue is None:
+        return
+    work_queue.close()
+    print(f"[WorkQueue] This worker completed {work_queue.completed} batches (reclaimed {work_queue.reclaimed}). Queue: {work_queue.status()}")
+
+
+def build_asset_index(args):
+    """
+    Build or refresh an asset index file, without booting Isaac Sim.
+    """
+    from render_usd.core.asset_index import AssetIndex
+
+    assets_dir = Path(args.assets_dir) if args.assets_dir else DEFAULT_GRSCENES100_ASSETS_DIR
+    if not assets_dir.exists():
+        print(f"[Error] Assets dir not found: {assets_dir}")
+        return
+    if args.full and os.path.exists(args.output):
+        os.remove(args.output)
+    start_time = time.perf_counter()
+    index = AssetIndex.load_or_build(args.output, assets_dir, args.layout, refresh=True, num_workers=args.workers)
+    print(f"[AssetIndex] {len(index.usd_paths())} assets in {len(index.categories)} categories ({time.perf_counter() - start_time:.2f}s).")
+
+
+def preprocess_grscenes(args):
+    """
+    Build the render-ready cache of the selected GRScenes scenes and print a validation summary.
+    """
+    from render_usd.config.settings import DEFAULT_MDL_PATH
+    from render_usd.core.preprocess import preprocess_scenes, summarize_reports
+
+    usd_paths = [scene["scene_copy_usd_path"] for scene in resolve_grscenes_scenes(args)]
+    start_time = time.perf_counter()
+    reports = preprocess_scenes(usd_paths, args.cache_dir, DEFAULT_MDL_PATH, num_workers=args.workers, force=args.force)
+    summary = summarize_reports(reports)
+    print(f"[Preprocess] {len(reports)} scenes in {time.perf_counter() - start_time:.2f}s: {summary}")
+    for report in reports:
+        if report["status"] == "error":
+            print(f"[Preprocess] {report['source']}: {report['error']}")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"summary": summary, "scenes": reports}, f, indent=1)
+
+
+def load_asset_index(assets_dir, layout, asset_index=None, refresh_index=False):
+    """
+    Asset index of a library: loaded from (or saved to) `asset_index` if given, else scanned in memory.
+    """
+    from render_usd.core.asset_index import AssetIndex
+
+    if asset_index:
+        return AssetIndex.load_or_build(asset_index, assets_dir, layout, refresh=refresh_index)
+    return AssetIndex.build(assets_dir, layout)
+
+
+def scan_grscenes100_assets(assets_dir, asset_index=None, refresh_index=False):
+    """
+    Scan for assets in Category/AssetID/AssetID.usd structure.
+    """
+    return load_asset_index(assets_dir, "grscenes100", asset_index, refresh_index).usd_paths()
+
+
+def scan_custom_assets(assets_dir, asset_index=None, refresh_index=False):
+    """
+    Scan for assets in Category/UID/usd/UID.usd structure.
+
+    Returns:
+        Tuple of (object USD paths, output directories). Outputs go directly under the UID folder.
+    """
+    object_usd_paths = load_asset_index(assets_dir, "custom", asset_index, refresh_index).usd_paths()
+    save_dirs = [usd_file.parent.parent for usd_file in object_usd_paths]  # Save directly under UID folder
+    return object_usd_paths, save_dirs
+
+
+def select_chunk(items, chunk_id, chunk_total):
+    """
+    Select the contiguous slice of items belonging to a chunk.
+
+    Returns:
+        Tuple of (chunk items, start index, end index).
+    """
+    total = len(items)
+    chunk_size = (total + chunk_total - 1) // chunk_total
+    start_idx = chunk_id * chunk_size
+    end_idx = min(start_idx + chunk_size, total)
+    return items[start_idx:end_idx], start_idx, end_idx
+
+
+def select_grscenes100_chunk(args, all_asset_usds, report=False, chunk_cache=None):
+    """
+    Select this worker's chunk of assets, by count (contiguous) or by estimated cost (lpt).
+    With --queue, all assets are shared through the queue instead.
+
+    Args:
+        report: Print the predicted load of every chunk, not only the makespan.
+        chunk_cache: Optional dict shared by the calls of one run (precheck and render), so
+                     the lpt costs are estimated once per process.
+
+    Returns:
+        Tuple of (chunk assets, description of the chunk).
+    """
+    if args.queue:
+        return all_asset_usds, f"{len(all_asset_usds)} assets (queue {args.queue})"
+    if args.partition == "contiguous":
+        object_usd_paths, start_idx, end_idx = select_chunk(all_asset_usds, args.chunk_id, args.chunk_total)
+        return object_usd_paths, f"{len(object_usd_paths)} assets ({start_idx}-{end_idx})"
+
+    cache_key = tuple(str(usd_path) for usd_path in all_asset_usds)
+    if chunk_cache is not None and cache_key in chunk_cache:
+        return chunk_cache[cache_key]
+
+    from render_usd.core.partition import estimate_costs, load_measured_times, lpt_partition, contiguous_loads
+
+    measured_times = load_measured_times(args.cost_timings) if args.cost_timings else None
+    costs, calibrated = estimate_costs(all_asset_usds, args.cost_method, measured_times, args.cost_cache)
+    bins, loads = lpt_partition(costs, args.chunk_total)
+    unit = "s" if calibrated else " cost units"
+    if report:
+        for idx_bin, (items, load) in enumerate(zip(bins, loads)):
+            print(f"[Partition] Chunk {idx_bin}: {len(items)} assets, predicted {load:.1f}{unit}")
+    print(f"[Partition] Predicted makespan {max(loads):.1f}{unit} over {args.chunk_total} chunks (contiguous chunks: {max(contiguous_loads(costs, args.chunk_total)):.1f}{unit}).")
+    object_usd_paths = [all_asset_usds[idx] for idx in bins[args.chunk_id]]
+    selection = (object_usd_paths, f"{len(object_usd_paths)} assets, predicted {loads[args.chunk_id]:.1f}{unit}")
+    if chunk_cache is not None:
+        chunk_cache[cache_key] = selection
+    return selection
+
+
+def grscenes100_save_dir(args):
+    if args.save_dir == 'inplace':
+        return None
+    return Path(args.save_dir) if args.save_dir else DEFAULT_GRSCENES100_SAVE_DIR
+
+
+def find_scene_object_usds(source_object_usd_dir):
+    """
+    Collect the object USDs of a GRScenes scene from its models directory.
+    """
+    # source_object_usd_dir contains either object USD files or one directory per
+    # object; for directories the first .usd file inside is rendered.
+    object_paths = []
+    for obj_name in os.listdir(source_object_usd_dir):
+        obj_path = source_object_usd_dir / obj_name
+        if obj_path.is_dir():
+            usd_files = list(obj_path.glob("*.usd"))
+            if usd_files:
+                object_paths.append(usd_files[0])
+        elif obj_path.suffix == '.usd':
+            object_paths.append(obj_path)
+    return object_paths
+
+
+def resolve_grscenes_scenes(args):
+    """
+    Resolve the renderable scenes of a GRScenes part/usd index in pure Python.
+
+    Scenes without a scene directory, a copy.usd or a models directory are reported and left out.
+
+    Returns:
+        List of dicts with the scene paths, object USDs and manifest keys.
+    """
+    from render_usd.utils.common_utils.path_utils import find_all_files_in_folder
+
+    objects_dir = Path(args.objects_dir) if args.objects_dir else DEFAULT_GRSCENES_DIR
+    scene_dir_root = Path(args.scene_dir) if args.scene_dir else DEFAULT_GRSCENES_SCENE_DIR
+
+    usd_index = f"part{args.part}/{args.usd}_usd"
+    object_dir = objects_dir / usd_index
+
+    if args.scene:
+        scene_list = [args.scene]
+    else:
+        if object_dir.exists():
+            scene_list = natsorted(os.listdir(object_dir))
+        else:
+            print(f"[Error] Object dir not found: {object_dir}")
+            scene_list = []
+
+    scenes = []
+    for scene_name in scene_list:
+        object_usd_dir = object_dir / scene_name
+        scene_usd_dir = scene_dir_root / usd_index / scene_name
+        source_object_usd_dir = object_usd_dir / "models"
+        output_thumbnail_dir = object_usd_dir / "thumbnails"
+
+        # Check scene USD
+        if not scene_usd_dir.exists():
+            print(f"Scene dir not found: {scene_usd_dir}")
+            continue
+
+        scene_usd_list = find_all_files_in_folder(scene_usd_dir, suffix='.usd')
+        scene_copy_usd_path = next((f for f in scene_usd_list if 'copy.usd' in str(f)), None)
+
+        if not scene_copy_usd_path:
+            print(f"[CLI] {scene_name} has no copy.usd, skip.")
+            continue
+
+        # Check object USDs
+        if not source_object_usd_dir.exists():
+            print(f"Object models dir not found: {source_object_usd_dir}")
+            continue
+
+        scenes.append({
+            "name": scene_name,
+            "object_usd_dir": object_usd_dir,
+            "source_object_usd_dir": source_object_usd_dir,
+            "scene_copy_usd_path": scene_copy_usd_path,
+            "thumbnail_wo_bg_dir": output_thumbnail_dir / "multi_views",
+            "thumbnail_with_bg_dir": output_thumbnail_dir / "multi_views_with_bg",
+            "wo_bg_key": f"{object_usd_dir}#multi_views",
+            "with_bg_key": f"{object_usd_dir}#multi_views_with_bg",
+            "object_paths": find_scene_object_usds(source_object_usd_dir),
+        })
+    return scenes
+
+
+def is_grscenes_rendered(scene, thumbnail_dir_name, manifest=None):
+    """
+    Scene-level skip rule of the grscenes command ("multi_views" or "multi_views_with_bg").
+    """
+    from render_usd.core.outputs import count_rendered_dirs
+
+    if manifest is not None:
+        return manifest.is_complete(scene["wo_bg_key"] if thumbnail_dir_name == "multi_views" else scene["with_bg_key"])
+    thumbnail_dir = scene["object_usd_dir"] / "thumbnails" / thumbnail_dir_name
+    return count_rendered_dirs(thumbnail_dir) == len(os.listdir(scene["source_object_usd_dir"]))
+
+
+def incremental_render_settings(args):
+    """
+    Render settings stored in the fingerprints of --incremental runs, as run_command passes
+    them to render_thumbnail_wo_bg (grscenes keeps the bbox2d overlay). None without --incremental.
+    """
+    from render_usd.core.fingerprint import renderer_label, thumbnail_render_settings
+
+    if not args.incremental:
+        return None
+    return thumbnail_render_settings(renderer_label(args.backend), show_bbox2d=args.command == 'grscenes', naming_style=args.naming_style)
+
+
+def plan_render(args, chunk_cache=None):
+    """
+    Compute the pending work of a render command without booting Isaac Sim.
+
+    Resolves the asset list (and chunk slice) like the command itself and applies the
+    renderer's skip rules. For grscenes, scene instances are taken from the models
+    directory; instances missing from the scene stage are skipped at render time.
+
+    Args:
+        chunk_cache: Passed to select_grscenes100_chunk, see there.
+
+    Returns:
+        Dict with the command, the total number of units and the pending units
+        ({"kind", "key", "save_dir"}).
+    """
+    from render_usd.core.manifest import RenderManifest
+    from render_usd.core.outputs import pending_thumbnails, scene_instance_key, is_scene_instance_rendered
+
+    manifest = RenderManifest(args.manifest) if args.manifest else None
+    total = 0
+    pending = []
+    render_settings = incremental_render_settings(args)
+
+    def add_thumbnails(object_usd_paths, thumbnail_wo_bg_dir):
+        nonlocal total
+        total += len(object_usd_paths)
+        for object_usd_path, save_dir in pending_thumbnails(object_usd_paths, thumbnail_wo_bg_dir, 4, manifest, render_settings):
+            pending.append({"kind": "object", "key": str(object_usd_path), "save_dir": str(save_dir)})
+
+    if args.command in ('grscenes100', 'render_custom') and args.queue and os.path.isdir(Path(args.queue) / "tasks"):
+        from render_usd.core.work_queue import WorkQueue
+
+        # Workers share the queue: pending work is the batches not yet done
+        work_queue = WorkQueue(args.queue)
+        total = work_queue.status()["total"]
+        pending = [{"kind": "batch", "key": batch_id, "save_dir": args.queue} for batch_id in work_queue.pending_batch_ids()]
+    elif args.command == 'grscenes100':
+        assets_dir = Path(args.assets_dir) if args.assets_dir else DEFAULT_GRSCENES100_ASSETS_DIR
+        if assets_dir.exists():
+            object_usd_paths, _ = select_grscenes100_chunk(args, scan_grscenes100_assets(assets_dir, args.asset_index, args.refresh_index), report=True, chunk_cache=chunk_cache)
+            add_thumbnails(object_usd_paths, grscenes100_save_dir(args))
+    elif args.command == 'single':
+        if Path(args.usd_path).exists():
+            add_thumbnails([Path(args.usd_path)], Path(args.output_dir))
+    elif args.command == 'render_list':
+        add_thumbnails([Path(usd_path) for usd_path in args.usd_paths if Path(usd_path).exists()], Path(args.output_dir))
+    elif args.command == 'render_custom':
+        if Path(args.assets_dir).exists():
+            object_usd_paths, save_dirs = scan_custom_assets(Path(args.assets_dir), args.asset_index, args.refresh_index)
+            add_thumbnails(object_usd_paths, save_dirs)
+    elif args.command == 'grscenes':
+        for scene in resolve_grscenes_scenes(args):
+            if is_grscenes_rendered(scene, "multi_views", manifest) and not args.incremental:
+                total += len(scene["object_paths"])
+            else:
+                add_thumbnails(scene["object_paths"], scene["thumbnail_wo_bg_dir"])
+            instance_names = natsorted(os.listdir(scene["source_object_usd_dir"]))
+            total += len(instance_names)
+            if is_grscenes_rendered(scene, "multi_views_with_bg", manifest):
+                continue
+            for instance_name in instance_names:
+                mesh_dir = scene["thumbnail_with_bg_dir"] / instance_name
+                key = scene_instance_key(scene["scene_copy_usd_path"], instance_name)
+                if not is_scene_instance_rendered(mesh_dir, key, manifest):
+                    pending.append({"kind": "scene_instance", "key": key, "save_dir": str(mesh_dir)})
+    return {"command": args.command, "total": total, "pending": pending}
+
+
+def print_plan(plan, max_listed=20):
+    pending = plan["pending"]
+    print(f"[Plan] {plan['command']}: {plan['total']} units, {plan['total'] - len(pending)} done, {len(pending)} pending.")
+    for unit in pending[:max_listed]:
+        print(f"[Plan]   {unit['kind']}: {unit['key']}")
+    if len(pending) > max_listed:
+        print(f"[Plan]   ... and {len(pending) - max_listed} more")
+
+
+def rebuild_manifest(args):
+    """
+    Import outputs that already exist on disk into the render manifest, without booting Isaac Sim.
+    With --incremental, objects whose thumbnails are complete but have no fingerprint also get
+    their current one, so the first incremental run does not render them again.
+    """
+    from render_usd.core.manifest import RenderManifest
+    from render_usd.core.outputs import resolve_thumbnail_save_dir, scene_instance_key, thumbnail_output_paths
+    from render_usd.core.fingerprint import adopt_fingerprint
+
+    if not args.manifest:
+        print("[Error] --rebuild_manifest requires --manifest")
+        return
+    manifest = RenderManifest(args.manifest)
+    render_settings = incremental_render_settings(args)
+    adopted = 0
+
+    def thumbnail_entries(object_usd_paths, thumbnail_wo_bg_dir, show_bbox2d=False):
+        nonlocal adopted
+        for idx_obj, object_usd_path in enumerate(object_usd_paths):
+            save_dir = resolve_thumbnail_save_dir(object_usd_path, thumbnail_wo_bg_dir, idx_obj)
+            output_paths = thumbnail_output_paths(save_dir, Path(object_usd_path).stem, naming_style=args.naming_style, show_bbox2d=show_bbox2d)
+            if render_settings is not None and all(os.path.exists(path) for path in output_paths):
+                adopted += adopt_fingerprint(object_usd_path, save_dir, render_settings)
+            yield str(object_usd_path), output_paths
+
+    if args.command == 'grscenes100':
+        assets_dir = Path(args.assets_dir) if args.assets_dir else DEFAULT_GRSCENES100_ASSETS_DIR
+        object_usd_paths, _ = select_grscenes100_chunk(args, scan_grscenes100_assets(assets_dir, args.asset_index, args.refresh_index))
+        manifest.rebuild_from_disk(thumbnail_entries(object_usd_paths, grscenes100_save_dir(args)))
+    elif args.command == 'single':
+        manifest.rebuild_from_disk(thumbnail_entries([Path(args.usd_path)], Path(args.output_dir)))
+    elif args.command == 'render_list':
+        manifest.rebuild_from_disk(thumbnail_entries([Path(usd_path) for usd_path in args.usd_paths], Path(args.output_dir)))
+    elif args.command == 'render_custom':
+        object_usd_paths, save_dirs = scan_custom_assets(Path(args.assets_dir), args.asset_index, args.refresh_index)
+        manifest.rebuild_from_disk(thumbnail_entries(object_usd_paths, save_dirs))
+    elif args.command == 'grscenes':
+        imported = 0
+        for scene in resolve_grscenes_scenes(args):
+            # Objects are imported too: incremental runs check them even in completed scenes
+            manifest.rebuild_from_disk(thumbnail_entries(scene["object_paths"], scene["thumbnail_wo_bg_dir"], show_bbox2d=True))
+            # Instances with at least one saved view, as in is_scene_instance_rendered
+            instance_entries = []
+            for instance_name in natsorted(os.listdir(scene["source_object_usd_dir"])):
+                mesh_dir = scene["thumbnail_with_bg_dir"] / instance_name
+                output_paths = natsorted(mesh_dir.glob("*.png")) if mesh_dir.is_dir() else []
+                instance_entries.append((scene_instance_key(scene["scene_copy_usd_path"], instance_name), output_paths))
+            manifest.rebuild_from_disk(instance_entries)
+            for thumbnail_dir_name, key in (("multi_views", scene["wo_bg_key"]), ("multi_views_with_bg", scene["with_bg_key"])):
+                # Scene-level units hold per-object directories, so only the completion itself is recorded.
+                if key not in manifest and is_grscenes_rendered(scene, thumbnail_dir_name):
+                    manifest.record(key, views=[], save_dir=str(scene["object_usd_dir"] / "thumbnails" / thumbnail_dir_name), rebuilt=True)
+                    imported += 1
+        print(f"[Manifest] Imported {imported} completed scenes into {manifest.manifest_path}")
+    if render_settings is not None:
+        print(f"[Manifest] Stored current fingerprints for {adopted} rendered objects.")
+
+
+def build_parser():
     parser = argparse.ArgumentParser(description="Render USD assets using Isaac Sim")
     subparsers = parser.add_subparsers(dest='command', help='Sub-commands')
 
     # GRScenes100 command
     parser_gr100 = subparsers.add_parser('grscenes100', help='Render GRScenes-100 dataset')
-    parser_gr100.add_argument('--chunk_id', type=int, required=True, help="Chunk ID")
-    parser_gr100.add_argument('--chunk_total', type=int, required=True, help="Total chunks")
+    parser_gr100.add_argument('--chunk_id', type=int, default=None, help="Chunk ID (required unless --queue is given)")
+    parser_gr100.add_argument('--chunk_total', type=int, default=None, help="Total chunks (required unless --queue is given)")
     parser_gr100.add_argument('--assets_dir', type=str, default=None, help="Assets directory")
     parser_gr100.add_argument('--save_dir', type=str, default=None, help="Save directory. Use 'inplace' to save in same dir as USD.")
     parser_gr100.add_argument('--naming_style', type=str, default="index", choices=["index", "view"], help="Naming convention: index (0,1,...) or view (front,left,...)")
+    add_asset_index_arguments(parser_gr100)
+    add_queue_arguments(parser_gr100)
+    parser_gr100.add_argument('--partition', type=str, default="contiguous", choices=["contiguous", "lpt"], help="contiguous: equal asset counts; lpt: chunks balanced by estimated cost (longest processing time first)")
+    parser_gr100.add_argument('--cost_method', type=str, default="size", choices=["size", "sdf"], help="Cost estimate for --partition lpt: file size, or also prim/mesh counts and texture bytes from a light Sdf pass")
+    parser_gr100.add_argument('--cost_timings', type=str, nargs='+', default=None, help="--profile_output files of earlier runs; measured times replace and calibrate the estimates")
+    parser_gr100.add_argument('--cost_cache', type=str, default=None, help="JSON cache of cost inputs, reused while asset mtimes are unchanged")
+    add_render_arguments(parser_gr100)
 
     # GRScenes command
     parser_gr = subparsers.add_parser('grscenes', help='Render GRScenes dataset')
@@ -27,80 +513,178 @@ def main():
     parser_gr.add_argument('--objects_dir', type=str, default=None)
     parser_gr.add_argument('--scene_dir', type=str, default=None)
     parser_gr.add_argument('--naming_style', type=str, default="index", choices=["index", "view"], help="Naming convention")
+    parser_gr.add_argument('--label_all_instances', action='store_true', help="With-background pass: label every scene instance once and select bbox2d rows by label, instead of relabelling per instance")
+    parser_gr.add_argument('--cluster_instances', action='store_true', help="With-background pass: render clusters of nearby instances from shared frames and crop each thumbnail (implies --label_all_instances)")
+    parser_gr.add_argument('--max_cluster_size', type=int, default=6, help="Maximum instances sharing one set of frames with --cluster_instances")
+    parser_gr.add_argument('--max_rss_gb', type=float, default=None, help="Restart the renderer process (same command, resuming from the manifest or outputs) after a scene when its resident memory exceeds this many GiB")
+    parser_gr.add_argument('--scene_cache', type=str, default=None, help="Render-ready scene cache (see the preprocess command): load the cached flattened copy of each scene instead of fixing MDLs in the source")
+    parser_gr.add_argument('--visibility_precheck', action='store_true', help="With-background pass: predict occluded views on the CPU before rendering, try other azimuths, and skip views that would be discarded")
+    add_render_arguments(parser_gr)
 
     # Single file command
     parser_single = subparsers.add_parser('single', help='Render a single USD file')
     parser_single.add_argument('--usd_path', type=str, required=True, help="Path to the USD file")
     parser_single.add_argument('--output_dir', type=str, required=True, help="Directory to save results")
     parser_single.add_argument('--naming_style', type=str, default="index", choices=["index", "view"], help="Naming convention: index (0,1,...) or view (front,left,...)")
+    add_render_arguments(parser_single)
 
     # Render custom subset command
     parser_custom = subparsers.add_parser('render_custom', help='Render assets in a custom directory structure')
     parser_custom.add_argument('--assets_dir', type=str, required=True, help="Root directory of the assets (e.g. GRScenes_assets)")
     parser_custom.add_argument('--naming_style', type=str, default="view", choices=["index", "view"], help="Naming convention (default: view)")
+    add_asset_index_arguments(parser_custom)
+    add_queue_arguments(parser_custom)
+    add_render_arguments(parser_custom)
 
-    args = parser.parse_args()
+    # List of USD files command
+    parser_list = subparsers.add_parser('render_list', help='Render a list of USD files into one output directory')
+    parser_list.add_argument('--usd_paths', type=str, nargs='+', required=True, help="Paths to the USD files")
+    parser_list.add_argument('--output_dir', type=str, required=True, help="Directory to save results")
+    parser_list.add_argument('--naming_style', type=str, default="index", choices=["index", "view"], help="Naming convention: index (0,1,...) or view (front,left,...)")
+    add_render_arguments(parser_list)
 
-    if not args.command:
-        parser.print_help()
-        return
+    # Asset index builder
+    parser_index = subparsers.add_parser('index', help='Build or incrementally refresh the asset index shared by grscenes100/render_custom chunk workers')
+    parser_index.add_argument('--layout', type=str, required=True, choices=["grscenes100", "custom"], help="grscenes100: Category/AssetID/AssetID.usd, custom: Category/UID/usd/UID.usd")
+    parser_index.add_argument('--assets_dir', type=str, default=None, help="Asset library root (default: the GRScenes-100 library)")
+    parser_index.add_argument('--output', type=str, required=True, help="Index file to write")
+    parser_index.add_argument('--workers', type=int, default=16, help="Scanning threads")
+    parser_index.add_argument('--full', action='store_true', help="Rebuild from scratch instead of refreshing an existing index")
+
+    # Offline scene preprocessing
+    parser_pre = subparsers.add_parser('preprocess', help='Write render-ready copies of GRScenes scenes (resolved MDLs, flattened .usdc) into a cache, without booting Isaac Sim')
+    parser_pre.add_argument('--part', type=int, required=True)
+    parser_pre.add_argument('--usd', type=int, required=True)
+    parser_pre.add_argument('--scene', type=str, default=None)
+    parser_pre.add_argument('--objects_dir', type=str, default=None)
+    parser_pre.add_argument('--scene_dir', type=str, default=None)
+    parser_pre.add_argument('--cache_dir', type=str, required=True, help="Cache root, passed to grscenes --scene_cache")
+    parser_pre.add_argument('--workers', type=int, default=8, help="Preprocessing processes")
+    parser_pre.add_argument('--force', action='store_true', help="Rebuild entries that are already cached")
+    parser_pre.add_argument('--report', type=str, default=None, help="Write the validation report of every scene as JSON to this file")
+
+    # Dry-run planner
+    parser_plan = subparsers.add_parser('plan', help='Print the pending work of a render command without booting Isaac Sim, e.g. plan -- grscenes100 --chunk_id 0 --chunk_total 30')
+    parser_plan.add_argument('--output', type=str, default=None, help="Write the plan (counts and every pending unit) as JSON to this file")
+    parser_plan.add_argument('job', nargs=argparse.REMAINDER, help="Render sub-command with its options")
+
+    # Render daemon: boot Kit once and serve jobs
+    parser_serve = subparsers.add_parser('serve', help='Run a render daemon that keeps Isaac Sim warm and accepts jobs over a Unix socket')
+    parser_serve.add_argument('--socket', type=str, default=str(DEFAULT_DAEMON_SOCKET), help="Unix socket path to listen on")
+    add_render_arguments(parser_serve)
+
+    # Client of the render daemon
+    parser_submit = subparsers.add_parser('submit', help='Submit a job to a running render daemon, e.g. submit -- single --usd_path a.usd --output_dir out')
+    parser_submit.add_argument('--socket', type=str, default=str(DEFAULT_DAEMON_SOCKET), help="Unix socket of the daemon")
+    parser_submit.add_argument('--shutdown', action='store_true', help="Stop the daemon")
+    parser_submit.add_argument('job', nargs=argparse.REMAINDER, help="Job arguments: any render sub-command with its options")
+    return parser
 
-    # Initialize Isaac Sim
-    kit = SimulationApp(CONFIG)
 
+# Options fixed when the renderer is created; a daemon ignores them per job.
+ENGINE_OPTIONS = ("backend", "settle", "settle_threshold", "static_scene", "prefetch", "profile", "profile_output", "mock_frame_size", "mock_latency")
+
+def create_renderer(args, kit):
+    """
+    Create the RenderManager for the engine options of `args`.
+    """
     # Lazy import to avoid Omni issues before SimulationApp starts
+    from render_usd.core.backends import create_backend
     from render_usd.core.renderer import RenderManager
-    from render_usd.config.settings import (
-        DEFAULT_GRSCENES100_ASSETS_DIR, DEFAULT_GRSCENES100_SAVE_DIR,
-        DEFAULT_GRSCENES_DIR, DEFAULT_GRSCENES_SCENE_DIR
+    from render_usd.core.settle import SettleStrategy
+
+    if args.settle == "adaptive":
+        settle_strategy = SettleStrategy.adaptive(threshold=args.settle_threshold)
+    else:
+        settle_strategy = SettleStrategy.fixed()
+    return RenderManager(
+        kit,
+        settle_strategy=settle_strategy,
+        static_scene=args.static_scene,
+        prefetch_lookahead=args.prefetch,
+        profile=args.profile or args.profile_output is not None,
+        profile_output=args.profile_output,
+        backend=create_backend(args.backend, **backend_kwargs(args)),
     )
-    from natsort import natsorted
-    from render_usd.utils.common_utils.path_utils import find_all_files_in_folder
 
-    renderer = RenderManager(kit)
+
+def parse_job(parser, argv, daemon_args):
+    """
+    Parse the arguments of a daemon job.
+
+    Returns:
+        Tuple of (parsed arguments, warnings about engine options that differ from the daemon's).
+
+    Raises:
+        ValueError: If the arguments are invalid or not a render command.
+    """
+    error = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(error):
+            job_args = parser.parse_args(argv)
+            check_arguments(parser, job_args)
+    except SystemExit:
+        raise ValueError(error.getvalue().strip().splitlines()[-1] if error.getvalue().strip() else "invalid arguments")
+    if job_args.command in (None, 'index', 'preprocess', 'plan', 'serve', 'submit'):
+        raise ValueError(f"'{job_args.command}' is not a render command")
+    given_options = {arg.split("=")[0] for arg in argv if arg.startswith("--")}
+    warnings = [
+        f"--{option} is fixed by the daemon ({getattr(daemon_args, option)}), ignoring {getattr(job_args, option)}"
+        for option in ENGINE_OPTIONS
+        if f"--{option}" in given_options and getattr(job_args, option) != getattr(daemon_args, option)
+    ]
+    return job_args, warnings
+
+
+def units_recorded(renderer, manifest, unit_keys, write_errors_before):
+    """
+    Whether a render call recorded every unit it rendered, each with at least one view, and
+    none of its writes failed. The scene-level manifest key is only recorded then, so a unit
+    left without views is rendered again as by is_scene_instance_rendered.
+    """
+    return unit_keys is not None and len(renderer.write_errors) == write_errors_before \
+        and all(manifest.is_complete(key, expected_views=1) for key in unit_keys)
+
+
+def run_command(args, renderer, restart=None, chunk_cache=None):
+    """
+    Run one render command with an existing renderer (CLI run or daemon job).
+
+    Args:
+        restart: Called to replace the process when grscenes crosses --max_rss_gb.
+                 Daemon jobs pass None and only report the crossing.
+        chunk_cache: Passed to select_grscenes100_chunk, see there.
+    """
+    from render_usd.core.manifest import RenderManifest
+
+    if args.rebuild_manifest:
+        rebuild_manifest(args)
+        return
+    manifest = RenderManifest(args.manifest) if args.manifest else None
+    annotators = args.annotators.split(",") if args.annotators else None
 
     if args.command == 'grscenes100':
         assets_dir = Path(args.assets_dir) if args.assets_dir else DEFAULT_GRSCENES100_ASSETS_DIR
-        
-        if args.save_dir == 'inplace':
-            save_dir = None
-        else:
-            save_dir = Path(args.save_dir) if args.save_dir else DEFAULT_GRSCENES100_SAVE_DIR
+        save_dir = grscenes100_save_dir(args)
         
         if not assets_dir.exists():
             print(f"[Error] Assets dir not found: {assets_dir}")
-            kit.close()
             return
 
-        # Scan for assets in Category/AssetID/AssetID.usd structure
-        all_asset_usds = []
-        # First level: Categories
-        for cat_path in sorted(assets_dir.iterdir()):
-            if not cat_path.is_dir():
-                continue
-            # Second level: Asset IDs
-            for asset_path in sorted(cat_path.iterdir()):
-                if not asset_path.is_dir():
-                    continue
-                
-                # Check for USD file named after the directory (AssetID.usd)
-                usd_file = asset_path / f"{asset_path.name}.usd"
-                if usd_file.exists():
-                    all_asset_usds.append(usd_file)
+        all_asset_usds = scan_grscenes100_assets(assets_dir, args.asset_index, args.refresh_index)
 
         total_assets = len(all_asset_usds)
         if total_assets == 0:
              print(f"[Error] No assets found in {assets_dir}")
-             kit.close()
              return
 
-        chunk_size = (total_assets + args.chunk_total - 1) // args.chunk_total
-        start_idx = args.chunk_id * chunk_size
-        end_idx = min(start_idx + chunk_size, total_assets)
-        
-        object_usd_paths = all_asset_usds[start_idx:end_idx]
-        
-        print(f"[CLI] GRScenes-100 Chunk {args.chunk_id}/{args.chunk_total}: {len(object_usd_paths)} assets ({start_idx}-{end_idx}).")
+        work_queue = open_work_queue(args, all_asset_usds, save_dir)
+        if work_queue is None:
+            object_usd_paths, chunk_description = select_grscenes100_chunk(args, all_asset_usds, chunk_cache=chunk_cache)
+            print(f"[CLI] GRScenes-100 Chunk {args.chunk_id}/{args.chunk_total}: {chunk_description}.")
+        else:
+            object_usd_paths = all_asset_usds
+            print(f"[CLI] GRScenes-100 queue {args.queue}: {total_assets} assets.")
         
         renderer.render_thumbnail_wo_bg(
             object_usd_paths, 
@@ -109,89 +693,40 @@ def main():
             sample_number=4,
             show_bbox2d=False,
             naming_style=args.naming_style,
+            manifest=manifest,
+            annotators=annotators,
+            tile_size=args.tile_size,
+            incremental=args.incremental,
+            work_queue=work_queue,
         )
+        close_work_queue(work_queue)
 
     elif args.command == 'grscenes':
-        objects_dir = Path(args.objects_dir) if args.objects_dir else DEFAULT_GRSCENES_DIR
-        scene_dir_root = Path(args.scene_dir) if args.scene_dir else DEFAULT_GRSCENES_SCENE_DIR
-        
-        usd_index = f"part{args.part}/{args.usd}_usd"
-        object_dir = objects_dir / usd_index
-        
-        if args.scene:
-            scene_list = [args.scene]
-        else:
-            if object_dir.exists():
-                scene_list = natsorted(os.listdir(object_dir))
-            else:
-                print(f"[Error] Object dir not found: {object_dir}")
-                scene_list = []
-            
-        for scene_name in scene_list:
-            object_usd_dir = object_dir / scene_name
-            scene_usd_dir = scene_dir_root / usd_index / scene_name
-            source_object_usd_dir = object_usd_dir / "models"
-            output_thumbnail_dir = object_usd_dir / "thumbnails"
-            thumbnail_wo_bg_dir = output_thumbnail_dir / "multi_views"
-            thumbnail_with_bg_dir = output_thumbnail_dir / "multi_views_with_bg"
-            
-            # Check scene USD
-            if not scene_usd_dir.exists():
-                 print(f"Scene dir not found: {scene_usd_dir}")
-                 continue
-                 
-            scene_usd_list = find_all_files_in_folder(scene_usd_dir, suffix='.usd')
-            scene_copy_usd_path = next((f for f in scene_usd_list if 'copy.usd' in str(f)), None)
-            
-            if not scene_copy_usd_path:
-                print(f"[CLI] {scene_name} has no copy.usd, skip.")
-                continue
+        for scene in resolve_grscenes_scenes(args):
+            # Incremental runs check every object's fingerprint even in completed scenes
+            if args.incremental or not is_grscenes_rendered(scene, "multi_views", manifest):
+                os.makedirs(scene["thumbnail_wo_bg_dir"], exist_ok=True)
+                write_errors_before = len(renderer.write_errors)
+                unit_keys = []
+                if scene["object_paths"]:
+                    unit_keys = renderer.render_thumbnail_wo_bg(scene["object_paths"], scene["thumbnail_wo_bg_dir"], naming_style=args.naming_style, manifest=manifest, annotators=annotators, tile_size=args.tile_size, incremental=args.incremental)
+                if manifest is not None and units_recorded(renderer, manifest, unit_keys, write_errors_before):
+                    manifest.record(scene["wo_bg_key"], views=[], save_dir=str(scene["thumbnail_wo_bg_dir"]))
 
-            # Check object USDs
-            if not source_object_usd_dir.exists():
-                 print(f"Object models dir not found: {source_object_usd_dir}")
-                 continue
-            
-            # Logic to skip if done
-            object_usd_list_length = len(os.listdir(source_object_usd_dir))
-            has_rendered_wo_bg = os.path.exists(thumbnail_wo_bg_dir) and len(os.listdir(thumbnail_wo_bg_dir)) == object_usd_list_length
-            has_rendered_with_bg = os.path.exists(thumbnail_with_bg_dir) and len(os.listdir(thumbnail_with_bg_dir)) == object_usd_list_length
-            
-            if not has_rendered_wo_bg:
-                os.makedirs(thumbnail_wo_bg_dir, exist_ok=True)
-                # Gather USD paths for render_thumbnail_wo_bg
-                # Assuming models are in source_object_usd_dir
-                # Note: The original code logic was unclear, but assuming we render each model in the folder.
-                # Usually source_object_usd_dir contains subfolders per object or USD files?
-                # In render_grscenes_main: "source_object_usd_dir = object_usd_dir / 'models'"
-                # and "object_usd_list_length = len(os.listdir(source_object_usd_dir))"
-                # This implies source_object_usd_dir contains the objects.
-                # If they are USD files:
-                model_files = [f for f in os.listdir(source_object_usd_dir) if f.endswith('.usd')]
-                # Or directories?
-                # The original render_thumbnail_wo_bg iterated: "object_name = object_usd_path.parent.name"
-                # This implies object_usd_path is .../object_name/something.usd
-                # If source_object_usd_dir contains directories of objects, then:
-                object_paths = []
-                for obj_name in os.listdir(source_object_usd_dir):
-                    obj_path = source_object_usd_dir / obj_name
-                    if obj_path.is_dir():
-                        # Assume instance.usd or similar? Or check for usd file?
-                        # Original code didn't show how object_usd_paths was constructed for grscenes mode.
-                        # It just passed `object_usd_dir`.
-                        # I'll try to find a .usd file in it.
-                        usd_files = list(obj_path.glob("*.usd"))
-                        if usd_files:
-                            object_paths.append(usd_files[0])
-                    elif obj_path.suffix == '.usd':
-                        object_paths.append(obj_path)
-
-                if object_paths:
-                    renderer.render_thumbnail_wo_bg(object_paths, thumbnail_wo_bg_dir, naming_style=args.naming_style)
-
-            if not has_rendered_with_bg:
-                os.makedirs(thumbnail_with_bg_dir, exist_ok=True)
-                renderer.render_thumbnail_with_bg(scene_copy_usd_path, object_usd_dir, thumbnail_with_bg_dir)
+            if not is_grscenes_rendered(scene, "multi_views_with_bg", manifest):
+                os.makedirs(scene["thumbnail_with_bg_dir"], exist_ok=True)
+                write_errors_before = len(renderer.write_errors)
+                unit_keys = renderer.render_thumbnail_with_bg(scene["scene_copy_usd_path"], scene["object_usd_dir"], scene["thumbnail_with_bg_dir"], manifest=manifest, annotators=annotators, label_all_instances=args.label_all_instances, cluster_instances=args.cluster_instances, max_cluster_size=args.max_cluster_size, visibility_precheck=args.visibility_precheck, scene_cache_dir=args.scene_cache)
+                if manifest is not None and units_recorded(renderer, manifest, unit_keys, write_errors_before):
+                    manifest.record(scene["with_bg_key"], views=[], save_dir=str(scene["thumbnail_with_bg_dir"]))
+
+                max_rss_bytes = int(args.max_rss_gb * 2**30) if args.max_rss_gb else None
+                if renderer.scenes.memory_exceeded(max_rss_bytes):
+                    # A restart only makes progress if this scene is skipped when the run resumes
+                    if restart is None or not is_grscenes_rendered(scene, "multi_views_with_bg", manifest):
+                        print(f"[CLI] Resident memory above {args.max_rss_gb} GiB, continuing without restart.")
+                    else:
+                        restart()
 
     elif args.command == 'single':
         usd_path = Path(args.usd_path)
@@ -199,7 +734,6 @@ def main():
         
         if not usd_path.exists():
             print(f"[Error] USD file not found: {usd_path}")
-            kit.close()
             return
             
         print(f"[CLI] Rendering single file: {usd_path}")
@@ -209,57 +743,131 @@ def main():
             init_azimuth_angle=0, 
             sample_number=4, 
             show_bbox2d=False,
-            naming_style=args.naming_style
+            naming_style=args.naming_style,
+            manifest=manifest,
+            annotators=annotators,
+            tile_size=args.tile_size,
+            incremental=args.incremental,
+        )
+
+    elif args.command == 'render_list':
+        usd_paths = [Path(usd_path) for usd_path in args.usd_paths]
+        missing = [usd_path for usd_path in usd_paths if not usd_path.exists()]
+        for usd_path in missing:
+            print(f"[Error] USD file not found: {usd_path}")
+        usd_paths = [usd_path for usd_path in usd_paths if usd_path.exists()]
+
+        print(f"[CLI] Rendering {len(usd_paths)} files into {args.output_dir}")
+        renderer.render_thumbnail_wo_bg(
+            usd_paths,
+            Path(args.output_dir),
+            init_azimuth_angle=0,
+            sample_number=4,
+            show_bbox2d=False,
+            naming_style=args.naming_style,
+            manifest=manifest,
+            annotators=annotators,
+            tile_size=args.tile_size,
+            incremental=args.incremental,
         )
 
     elif args.command == 'render_custom':
         assets_dir = Path(args.assets_dir)
         if not assets_dir.exists():
             print(f"[Error] Assets dir not found: {assets_dir}")
-            kit.close()
             return
             
         print(f"[CLI] Scanning assets in {assets_dir}...")
         # Expected structure: assets_dir / Category / UID / usd / UID.usd
         # We want to output to: assets_dir / Category / UID /
         
-        object_usd_paths = []
-        save_dirs = []
-        
-        # Walk through the directory structure
-        # Level 1: Category
-        for cat_path in sorted(assets_dir.iterdir()):
-            if not cat_path.is_dir(): continue
-            
-            # Level 2: UID
-            for uid_path in sorted(cat_path.iterdir()):
-                if not uid_path.is_dir(): continue
-                
-                # Level 3: usd directory
-                usd_dir = uid_path / "usd"
-                if not usd_dir.exists(): continue
-                
-                # Look for .usd file with same name as UID
-                uid = uid_path.name
-                usd_file = usd_dir / f"{uid}.usd"
-                
-                if usd_file.exists():
-                    object_usd_paths.append(usd_file)
-                    save_dirs.append(uid_path) # Save directly under UID folder
+        object_usd_paths, save_dirs = scan_custom_assets(assets_dir, args.asset_index, args.refresh_index)
         
         print(f"[CLI] Found {len(object_usd_paths)} assets.")
         
         if object_usd_paths:
+            work_queue = open_work_queue(args, object_usd_paths, save_dirs)
             renderer.render_thumbnail_wo_bg(
                 object_usd_paths, 
                 save_dirs, # Pass list of output directories
                 init_azimuth_angle=0, 
                 sample_number=4, 
                 show_bbox2d=False,
-                naming_style=args.naming_style
+                naming_style=args.naming_style,
+                manifest=manifest,
+                annotators=annotators,
+                tile_size=args.tile_size,
+                incremental=args.incremental,
+                work_queue=work_queue,
             )
+            close_work_queue(work_queue)
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    check_arguments(parser, args)
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    if args.command == 'submit':
+        from render_usd.daemon import submit_job
+        job = args.job[1:] if args.job[:1] == ["--"] else args.job
+        sys.exit(submit_job(args.socket, job, shutdown=args.shutdown))
+
+    if args.command == 'index':
+        build_asset_index(args)
+        return
+
+    if args.command == 'preprocess':
+        preprocess_grscenes(args)
+        return
+
+    if args.command == 'plan':
+        job_args = parser.parse_args(args.job[1:] if args.job[:1] == ["--"] else args.job)
+        check_arguments(parser, job_args)
+        if job_args.command in (None, 'index', 'preprocess', 'plan', 'serve', 'submit'):
+            parser.error("plan expects a render command, e.g. plan -- single --usd_path a.usd --output_dir out")
+        plan = plan_render(job_args)
+        print_plan(plan)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(plan, f, indent=2)
+        return
+
+    if args.rebuild_manifest:
+        rebuild_manifest(args)
+        return
+
+    # The precheck and the render select the same chunk
+    chunk_cache = {}
+    if args.command != 'serve' and not args.no_precheck:
+        plan = plan_render(args, chunk_cache)
+        print_plan(plan)
+        if not plan["pending"]:
+            print("[CLI] Nothing to render, exiting without booting Isaac Sim.")
+            return
+
+    # Initialize Isaac Sim (isaac backend only)
+    kit = launch_app(args.backend)
+    renderer = create_renderer(args, kit)
+
+    if args.command == 'serve':
+        from render_usd.daemon import RenderDaemon
+        daemon = RenderDaemon(
+            args.socket,
+            renderer,
+            parse_job=lambda argv: parse_job(parser, argv, args),
+            run_job=lambda job_args: run_command(job_args, renderer),
+        )
+        daemon.serve_forever()
+    else:
+        run_command(args, renderer, restart=lambda: restart_renderer(renderer, kit), chunk_cache=chunk_cache)
 
-    kit.close()
+    renderer.timer.print_summary()
+    close_app(kit)
 
 if __name__ == "__main__":
     main()
@@ -23,3 +23,11 @@ SIM_CONFIG = {
     "multi_gpu": False,
     "renderer": "PathTracing"
 }
+
+# Thumbnail cameras (setup_camera keeps its default apertures)
+CAMERA_HORIZONTAL_APERTURE = 20.0955
+THUMBNAIL_WO_BG_CAMERA = {"image_width": 512, "image_height": 512, "focal_length": 18.0}
+THUMBNAIL_WITH_BG_CAMERA = {"image_width": 600, "image_height": 450, "focal_length": 9.0}
+
+# Render daemon (render_usd.cli serve / submit)
+DEFAULT_DAEMON_SOCKET = Path("/tmp/render_usd.sock")
@@ -0,0 +1,208 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+#==============================================================================
+#                               ASSET INDEX
+#==============================================================================
+# Asset libraries are laid out as Category/AssetID/... on a shared filesystem.
+# Walking them costs one listing per category and a few stats per asset; with
+# 30 chunk workers that walk is repeated 30 times. The index is built once by a
+# parallel os.scandir walk and stored as a compact JSON file that every worker
+# slices. Refreshing only re-lists categories whose directory mtime changed and
+# only re-checks assets whose watched directory mtime changed.
+#
+# Layouts:
+#   grscenes100: Category/AssetID/AssetID.usd      (watched dir: AssetID/)
+#   custom:      Category/UID/usd/UID.usd          (watched dir: UID/usd/, or UID/ while it has none)
+
+INDEX_VERSION = 1
+LAYOUTS = ("grscenes100", "custom")
+
+
+def _asset_usd_path(asset_dir: Path, layout: str) -> Path:
+    if layout == "grscenes100":
+        return asset_dir / f"{asset_dir.name}.usd"
+    return asset_dir / "usd" / f"{asset_dir.name}.usd"
+
+
+def _watched_mtime(asset_dir: Path, layout: str) -> Optional[float]:
+    """
+    Mtime of the directory whose listing decides whether the asset has a USD file.
+    """
+    candidates = [asset_dir / "usd", asset_dir] if layout == "custom" else [asset_dir]
+    for path in candidates:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            continue
+    return None
+
+
+def _scan_asset(asset_dir: Path, layout: str) -> dict:
+    """
+    Check one asset directory. Uses stat only, no directory listing.
+    """
+    entry = {"mtime": _watched_mtime(asset_dir, layout), "usd": None}
+    try:
+        stat = os.stat(_asset_usd_path(asset_dir, layout))
+        entry["usd"] = [stat.st_size, stat.st_mtime]
+    except OSError:
+        pass
+    return entry
+
+
+def _list_dirs(path: Path) -> List[str]:
+    with os.scandir(path) as it:
+        return sorted(entry.name for entry in it if entry.is_dir())
+
+
+class AssetIndex:
+    """
+    Cached list of the asset USDs under an asset library root.
+    """
+    def __init__(self, root: Union[str, Path], layout: str = "grscenes100", categories: Optional[Dict[str, dict]] = None):
+        """
+        Initialize an index. Use `build`, `load` or `load_or_build` to fill it.
+
+        Args:
+            root: Asset library root.
+            layout: "grscenes100" or "custom".
+            categories: {category: {"mtime": float, "assets": {asset_id: {"mtime": float, "usd": [size, mtime] | None}}}}.
+        """
+        if layout not in LAYOUTS:
+            raise ValueError(f"Invalid layout {layout}, should be one of {LAYOUTS}")
+        self.root = Path(root)
+        self.layout = layout
+        self.categories = categories or {}
+
+    @classmethod
+    def build(cls, root: Union[str, Path], layout: str = "grscenes100", num_workers: int = 16) -> "AssetIndex":
+        """
+        Scan the library from scratch.
+        """
+        index = cls(root, layout)
+        index.refresh(num_workers=num_workers)
+        return index
+
+    def refresh(self, num_workers: int = 16) -> Tuple[int, int]:
+        """
+        Bring the index up to date, re-scanning only what changed.
+
+        Categories are re-listed when their mtime changed (assets added, removed or renamed).
+        Assets are re-checked when their watched directory mtime changed (USD file added,
+        removed or replaced).
+
+        Returns:
+            Tuple of (re-listed categories, re-checked assets).
+        """
+        category_names = _list_dirs(self.root)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            category_mtimes = list(executor.map(lambda name: os.stat(self.root / name).st_mtime, category_names))
+
+            # Re-list changed categories in parallel
+            changed = [name for name, mtime in zip(category_names, category_mtimes) if self.categories.get(name, {}).get("mtime") != mtime]
+            listings = dict(zip(changed, executor.map(lambda name: _list_dirs(self.root / name), changed)))
+
+            categories = {}
+            to_check = []
+            for name, mtime in zip(category_names, category_mtimes):
+                old_assets = self.categories.get(name, {}).get("assets", {})
+                asset_names = listings[name] if name in listings else list(old_assets)
+                categories[name] = {"mtime": mtime, "assets": {asset: old_assets.get(asset) for asset in asset_names}}
+                to_check.extend((name, asset) for asset in asset_names)
+
+            # Stat each asset's watched directory; re-check only those that changed
+            asset_dirs = [self.root / name / asset for name, asset in to_check]
+            watched = list(executor.map(lambda asset_dir: _watched_mtime(asset_dir, self.layout), asset_dirs))
+            stale = [(key, asset_dir) for key, asset_dir, mtime in zip(to_check, asset_dirs, watched)
+                     if categories[key[0]]["assets"][key[1]] is None or categories[key[0]]["assets"][key[1]]["mtime"] != mtime]
+            entries = executor.map(lambda item: _scan_asset(item[1], self.layout), stale)
+            for ((name, asset), _), entry in zip(stale, entries):
+                categories[name]["assets"][asset] = entry
+
+        self.categories = categories
+        return len(changed), len(stale)
+
+    def usd_paths(self) -> List[Path]:
+        """
+        Asset USD paths in category/asset name order (the order chunks are sliced in).
+        """
+        return [
+            _asset_usd_path(self.root / name / asset, self.layout)
+            for name, category in sorted(self.categories.items())
+            for asset, entry in sorted(category["assets"].items())
+            if entry and entry["usd"]
+        ]
+
+    def records(self) -> List[dict]:
+        """
+        One record per asset USD: path, size, mtime and category.
+        """
+        return [
+            {"path": str(_asset_usd_path(self.root / name / asset, self.layout)), "size": entry["usd"][0], "mtime": entry["usd"][1], "category": name}
+            for name, category in sorted(self.categories.items())
+            for asset, entry in sorted(category["assets"].items())
+            if entry and entry["usd"]
+        ]
+
+    #--------------------------------------------------------------------------
+    #                               PERSISTENCE
+    #--------------------------------------------------------------------------
+    def save(self, index_path: Union[str, Path]) -> None:
+        """
+        Write the index atomically (temporary file + rename), so readers never see a partial file.
+        """
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": INDEX_VERSION, "root": str(self.root.resolve()), "layout": self.layout, "categories": self.categories}
+        tmp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def load(cls, index_path: Union[str, Path]) -> "AssetIndex":
+        with open(index_path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported asset index version {data.get('version')} in {index_path}")
+        return cls(data["root"], data["layout"], data["categories"])
+
+    @classmethod
+    def load_or_build(
+        cls,
+        index_path: Union[str, Path],
+        root: Union[str, Path],
+        layout: str = "grscenes100",
+        refresh: bool = False,
+        num_workers: int = 16,
+    ) -> "AssetIndex":
+        """
+        Load the index of `root`, building (and saving) it if missing or built for another root.
+
+        Args:
+            index_path: Index file shared by all chunk workers.
+            root: Asset library root.
+            layout: "grscenes100" or "custom".
+            refresh: Incrementally refresh a loaded index and save it if anything changed.
+            num_workers: Threads used for scanning.
+        """
+        index_path = Path(index_path)
+        if index_path.exists():
+            index = cls.load(index_path)
+            if index.root.resolve() == Path(root).resolve() and index.layout == layout:
+                index.root = Path(root)  # paths are reported as the caller spells the root
+                if refresh:
+                    relisted, rechecked = index.refresh(num_workers=num_workers)
+                    print(f"[AssetIndex] Refreshed {index_path}: {relisted} categories re-listed, {rechecked} assets re-checked.")
+                    if relisted or rechecked:
+                        index.save(index_path)
+                return index
+            print(f"[AssetIndex] {index_path} indexes {index.root} ({index.layout}), rebuilding for {root} ({layout}).")
+        index = cls.build(root, layout, num_workers=num_workers)
+        index.save(index_path)
+        print(f"[AssetIndex] Indexed {len(index.usd_paths())} assets under {root} into {index_path}")
+        return index
@@ -0,0 +1,26 @@
+from render_usd.core.backends.base import RenderBackend
+
+BACKENDS = ("isaac", "mock")
+
+
+def create_backend(name: str = "isaac", **kwargs) -> RenderBackend:
+    """
+    Create a render backend by name.
+
+    The Isaac Sim backend is imported lazily: its omni imports only work once a
+    SimulationApp is running, while the mock backend needs pxr only.
+
+    Args:
+        name: "isaac" or "mock".
+        **kwargs: Backend constructor arguments (e.g. frame_size, render_latency for mock).
+
+    Returns:
+        RenderBackend: The backend instance.
+    """
+    if name == "isaac":
+        from render_usd.core.backends.isaac import IsaacSimBackend
+        return IsaacSimBackend(**kwargs)
+    if name == "mock":
+        from render_usd.core.backends.mock import MockBackend
+        return MockBackend(**kwargs)
+    raise ValueError(f"Invalid backend {name}, should be one of {BACKENDS}")
@@ -0,0 +1,145 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+from pxr import Usd
+
+#==============================================================================
+#                            RENDER BACKEND INTERFACE
+#==============================================================================
+
+class RenderBackend(ABC):
+    """
+    Every simulator interaction RenderManager needs.
+
+    The orchestration code (skip rules, chunking, tiling, settle, writers, manifest)
+    only talks to the simulator through this interface, so it can run against Isaac
+    Sim or against a CPU-only stand-in. Pure USD edits (bbox, shadows, lights, MDL
+    fixes) are done on the stage returned by get_stage() and are shared by all
+    backends. Backends implement every abstract method; the others have defaults
+    built on them.
+    """
+    name = "base"
+
+    # ------------------------------------------------------------------ world
+    @abstractmethod
+    def init_world(self, static_scene: bool = False):
+        """
+        Create the world. The returned object exposes step(render=bool).
+        """
+        raise NotImplementedError
+
+    def stepper(self, world):
+        """
+        Return the object settle strategies step: the world, or a render-only tick in static mode.
+        """
+        return world
+
+    @abstractmethod
+    def get_stage(self) -> Usd.Stage:
+        raise NotImplementedError
+
+    @abstractmethod
+    def setup_environment(self, env_path: Optional[str] = None) -> None:
+        """
+        Load the lighting environment used for objects rendered without background.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def enable_auto_exposure(self) -> None:
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------ prims
+    @abstractmethod
+    def add_reference(self, usd_path: str, prim_path: str) -> Usd.Prim:
+        raise NotImplementedError
+
+    def add_payload(self, usd_path: str, prim_path: str) -> Usd.Prim:
+        """
+        Define an Xform prim with `usd_path` as its payload and load it, e.g. a whole scene
+        that is unloaded again with unload_payload.
+        """
+        stage = self.get_stage()
+        prim = stage.DefinePrim(prim_path, "Xform")
+        prim.GetPayloads().AddPayload(str(usd_path))
+        stage.Load(prim.GetPath())
+        return prim
+
+    def unload_payload(self, prim_path: str) -> None:
+        self.get_stage().Unload(prim_path)
+
+    @abstractmethod
+    def create_prim(
+        self,
+        prim_path: str,
+        usd_path: str,
+        position: Sequence[float] = (0, 0, 0),
+        scale: Sequence[float] = (1, 1, 1),
+    ) -> Usd.Prim:
+        """
+        Create an Xform prim referencing `usd_path`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_prim(self, prim_path: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_prim_position(self, prim_path: str, position: Sequence[float]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_semantics(self, prim: Usd.Prim, semantic_label: str) -> None:
+        """
+        Attach a "class" semantic label read by the bbox/segmentation annotators.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove_semantics(self, prim: Usd.Prim) -> None:
+        raise NotImplementedError
+
+    def add_semantics_batch(self, prim_labels: Iterable[Tuple[Usd.Prim, str]]) -> None:
+        """
+        Label many prims at once, e.g. every instance of a scene. Backends whose labels live
+        on the stage override this with a single batched edit.
+        """
+        for prim, semantic_label in prim_labels:
+            self.add_semantics(prim, semantic_label)
+
+    # ----------------------------------------------------------------- camera
+    @abstractmethod
+    def create_camera(
+        self,
+        camera_name: str,
+        image_width: int,
+        image_height: int,
+        focal_length: float = 18.0,
+        annotators: Optional[Iterable[str]] = None,
+        **setup_kwargs,
+    ):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_camera_active(self, camera, active: bool) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_camera_look_at(
+        self,
+        camera,
+        target: np.ndarray,
+        distance: float = 0.4,
+        elevation: float = 90.0,
+        azimuth: float = 0.0,
+    ) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_src(self, camera, type: str) -> Union[np.ndarray, dict, tuple, None]:
+        """
+        Read one annotator output of a camera (same types and formats as camera.get_src).
+        """
+        raise NotImplementedError
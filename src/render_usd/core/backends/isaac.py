@@ -0,0 +1,97 @@
+import omni
+import omni.kit.commands
+import numpy as np
+from typing import Iterable, Optional, Sequence, Tuple
+
+from pxr import Usd
+from omni.isaac.core.utils.stage import add_reference_to_stage
+from omni.isaac.core.utils.prims import delete_prim, create_prim
+from omni.isaac.core.utils.semantics import add_update_semantics, remove_all_semantics
+from omni.isaac.core.prims import XFormPrim
+
+from render_usd.core.backends.base import RenderBackend
+from render_usd.utils.usd_utils.edit_utils import StageEditBatch
+from render_usd.core.scene import init_world, setup_environment, RenderTick
+from render_usd.core.camera import init_camera, setup_camera, set_camera_active, set_camera_look_at, get_src
+
+#==============================================================================
+#                              ISAAC SIM BACKEND
+#==============================================================================
+
+class IsaacSimBackend(RenderBackend):
+    """
+    RenderBackend on top of omni.isaac.core. Requires a running SimulationApp.
+    """
+    name = "isaac"
+
+    def __init__(self):
+        self.static_scene = False
+
+    def init_world(self, static_scene: bool = False):
+        self.static_scene = static_scene
+        return init_world(static_scene=static_scene)
+
+    def stepper(self, world):
+        return RenderTick(world) if self.static_scene else world
+
+    def get_stage(self) -> Usd.Stage:
+        return omni.usd.get_context().get_stage()
+
+    def setup_environment(self, env_path: Optional[str] = None) -> None:
+        setup_environment(env_path)
+
+    def enable_auto_exposure(self) -> None:
+        omni.kit.commands.execute('ChangeSetting', path='/rtx/post/histogram/enabled', value=True)
+        omni.kit.commands.execute('ChangeSetting', path='/rtx/post/histogram/whiteScale', value=10.0)
+
+    def add_reference(self, usd_path: str, prim_path: str) -> Usd.Prim:
+        return add_reference_to_stage(str(usd_path), prim_path)
+
+    def create_prim(
+        self,
+        prim_path: str,
+        usd_path: str,
+        position: Sequence[float] = (0, 0, 0),
+        scale: Sequence[float] = (1, 1, 1),
+    ) -> Usd.Prim:
+        return create_prim(prim_path, position=position, scale=scale, usd_path=str(usd_path))
+
+    def delete_prim(self, prim_path: str) -> None:
+        delete_prim(prim_path)
+
+    def set_prim_position(self, prim_path: str, position: Sequence[float]) -> None:
+        XFormPrim(prim_path).set_world_pose(position=np.asarray(position))
+
+    def add_semantics(self, prim: Usd.Prim, semantic_label: str) -> None:
+        add_update_semantics(prim, semantic_label=semantic_label, type_label="class")
+
+    def remove_semantics(self, prim: Usd.Prim) -> None:
+        remove_all_semantics(prim)
+
+    def add_semantics_batch(self, prim_labels: Iterable[Tuple[Usd.Prim, str]]) -> None:
+        batch = StageEditBatch(self.get_stage())
+        for prim, semantic_label in prim_labels:
+            batch.add_semantics(prim, semantic_label, type_label="class")
+        batch.apply()
+
+    def create_camera(
+        self,
+        camera_name: str,
+        image_width: int,
+        image_height: int,
+        focal_length: float = 18.0,
+        annotators: Optional[Iterable[str]] = None,
+        **setup_kwargs,
+    ):
+        camera = init_camera(camera_name, image_width=image_width, image_height=image_height)
+        setup_camera(camera, focal_length=focal_length, annotators=annotators, **setup_kwargs)
+        return camera
+
+    def set_camera_active(self, camera, active: bool) -> None:
+        set_camera_active(camera, active)
+
+    def set_camera_look_at(self, camera, target, distance=0.4, elevation=90.0, azimuth=0.0) -> None:
+        set_camera_look_at(camera, target, distance=distance, elevation=elevation, azimuth=azimuth)
+
+    def get_src(self, camera, type: str):
+        return get_src(camera, type)
@@ -0,0 +1,245 @@
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pxr import Gf, Usd, UsdGeom, UsdLux
+
+from render_usd.core.backends.base import RenderBackend
+from render_usd.core.camera_pool import validate_annotators
+from render_usd.core.tiling import camera_look_at_frame
+from render_usd.utils.usd_utils.prim_utils import compute_bbox
+
+#==============================================================================
+#                           HEADLESS MOCK BACKEND
+#==============================================================================
+# CPU-only stand-in for Isaac Sim built on pxr alone. Assets are referenced into
+# an in-memory stage exactly as in Isaac Sim, so bounding boxes, tiling and skip
+# logic see real geometry, but frames are synthesised: a background gradient with
+# every labelled object's projected bounding box filled in. Rendered steps can be
+# given a latency so schedulers and writers are profiled under realistic timing.
+
+BBOX2D_DTYPE = np.dtype([
+    ("semanticId", "<u4"),
+    ("x_min", "<i4"),
+    ("y_min", "<i4"),
+    ("x_max", "<i4"),
+    ("y_max", "<i4"),
+    ("occlusionRatio", "<f4"),
+])
+
+
+class MockWorld:
+    """
+    World stand-in that only counts and times steps.
+    """
+    def __init__(self, render_latency: float = 0.0, physics_latency: float = 0.0, static_scene: bool = False):
+        self.render_latency = render_latency
+        self.physics_latency = physics_latency
+        self.static_scene = static_scene
+        self.physics_steps = 0
+        self.render_steps = 0
+
+    def step(self, render: bool = True) -> None:
+        if render:
+            self.render()
+        elif not self.static_scene:
+            self.physics_steps += 1
+            if self.physics_latency > 0:
+                time.sleep(self.physics_latency)
+
+    def render(self) -> None:
+        self.render_steps += 1
+        if self.render_latency > 0:
+            time.sleep(self.render_latency)
+
+    def reset(self) -> None:
+        self.physics_steps = 0
+        self.render_steps = 0
+
+
+@dataclass
+class MockCamera:
+    """
+    Pinhole camera state kept by the mock backend.
+    """
+    name: str
+    image_width: int
+    image_height: int
+    focal_length: float = 18.0
+    horizontal_aperture: float = 20.0955
+    annotators: frozenset = frozenset({"rgb"})
+    position: np.ndarray = field(default_factory=lambda: np.zeros(3))
+    forward: np.ndarray = field(default_factory=lambda: np.array([1.0, 0.0, 0.0]))
+    active: bool = True
+
+
+class MockBackend(RenderBackend):
+    """
+    RenderBackend that needs neither Isaac Sim nor a GPU.
+    """
+    name = "mock"
+
+    def __init__(
+        self,
+        frame_size: Optional[Tuple[int, int]] = None,
+        render_latency: float = 0.0,
+        physics_latency: float = 0.0,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            frame_size: (width, height) of synthesised frames. Defaults to each camera's resolution.
+            render_latency: Seconds slept per rendered step, emulating GPU frame time.
+            physics_latency: Seconds slept per physics-only step.
+        """
+        self.frame_size = frame_size
+        self.render_latency = render_latency
+        self.physics_latency = physics_latency
+        self.static_scene = False
+        self.stage = Usd.Stage.CreateInMemory()
+        UsdGeom.SetStageUpAxis(self.stage, UsdGeom.Tokens.z)
+        self.stage.SetDefaultPrim(UsdGeom.Xform.Define(self.stage, "/World").GetPrim())
+        self._semantics: Dict[str, str] = {}
+        self._backgrounds: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def init_world(self, static_scene: bool = False) -> MockWorld:
+        self.static_scene = static_scene
+        return MockWorld(self.render_latency, self.physics_latency, static_scene=static_scene)
+
+    def get_stage(self) -> Usd.Stage:
+        return self.stage
+
+    def setup_environment(self, env_path: Optional[str] = None) -> None:
+        if not self.stage.GetPrimAtPath("/World/default_dome_light"):
+            dome_light = UsdLux.DomeLight.Define(self.stage, "/World/default_dome_light")
+            dome_light.CreateIntensityAttr(1000)
+
+    def enable_auto_exposure(self) -> None:
+        pass
+
+    def add_reference(self, usd_path: str, prim_path: str) -> Usd.Prim:
+        prim = self.stage.DefinePrim(prim_path, "Xform")
+        prim.GetReferences().AddReference(str(usd_path))
+        return prim
+
+    def create_prim(
+        self,
+        prim_path: str,
+        usd_path: str,
+        position: Sequence[float] = (0, 0, 0),
+        scale: Sequence[float] = (1, 1, 1),
+    ) -> Usd.Prim:
+        prim = self.add_reference(usd_path, prim_path)
+        xformable = UsdGeom.Xformable(prim)
+        translate_op = xformable.AddTranslateOp(opSuffix="mock")
+        scale_op = xformable.AddScaleOp(opSuffix="mock")
+        translate_op.Set(Gf.Vec3d(*[float(v) for v in position]))
+        scale_op.Set(Gf.Vec3f(*[float(v) for v in scale]))
+        # World-space placement first, then the referenced root transform
+        ordered_ops = [op for op in xformable.GetOrderedXformOps() if op.GetOpName() not in (translate_op.GetOpName(), scale_op.GetOpName())]
+        xformable.SetXformOpOrder([translate_op, scale_op] + ordered_ops)
+        return prim
+
+    def delete_prim(self, prim_path: str) -> None:
+        for path in [path for path in self._semantics if path == prim_path or path.startswith(prim_path + "/")]:
+            del self._semantics[path]
+        self.stage.RemovePrim(prim_path)
+
+    def set_prim_position(self, prim_path: str, position: Sequence[float]) -> None:
+        prim = self.stage.GetPrimAtPath(prim_path)
+        translate_attr = prim.GetAttribute("xformOp:translate:mock")
+        if not translate_attr:
+            translate_attr = UsdGeom.Xformable(prim).AddTranslateOp(opSuffix="mock").GetAttr()
+        translate_attr.Set(Gf.Vec3d(*[float(v) for v in position]))
+
+    def add_semantics(self, prim: Usd.Prim, semantic_label: str) -> None:
+        self._semantics[str(prim.GetPath())] = semantic_label
+
+    def remove_semantics(self, prim: Usd.Prim) -> None:
+        self._semantics.pop(str(prim.GetPath()), None)
+
+    def create_camera(
+        self,
+        camera_name: str,
+        image_width: int,
+        image_height: int,
+        focal_length: float = 18.0,
+        annotators: Optional[Iterable[str]] = None,
+        horizontal_aperture: float = 20.0955,
+        **setup_kwargs,
+    ) -> MockCamera:
+        annotators = validate_annotators(annotators if annotators is not None else ())
+        return MockCamera(camera_name, image_width, image_height, focal_length, horizontal_aperture, annotators)
+
+    def set_camera_active(self, camera: MockCamera, active: bool) -> None:
+        camera.active = active
+
+    def set_camera_look_at(self, camera: MockCamera, target, distance=0.4, elevation=90.0, azimuth=0.0) -> None:
+        camera.position, camera.forward = camera_look_at_frame(np.asarray(target, dtype=np.float64), distance, elevation, azimuth)
+
+    def get_src(self, camera: MockCamera, type: str):
+        width, height = self.frame_size or (camera.image_width, camera.image_height)
+        if type == "rgb":
+            return self._synthesise_rgb(camera, width, height)
+        if type in ("bbox2d_tight", "bbox2d_loose"):
+            return self._project_bboxes(camera, width, height)
+        if type == "depth":
+            return np.zeros((height, width), dtype=np.float32)
+        if type == "seg":
+            return dict(mask=np.zeros((height, width), dtype=np.int8), id2labels={})
+        return None
+
+    #--------------------------------------------------------------------------
+    #                           FRAME SYNTHESIS
+    #--------------------------------------------------------------------------
+    def _background(self, width: int, height: int) -> np.ndarray:
+        if (width, height) not in self._backgrounds:
+            ramp = np.linspace(96, 192, height, dtype=np.uint8)
+            self._backgrounds[(width, height)] = np.repeat(np.repeat(ramp[:, None, None], width, axis=1), 3, axis=2)
+        return self._backgrounds[(width, height)]
+
+    def _synthesise_rgb(self, camera: MockCamera, width: int, height: int) -> np.ndarray:
+        frame = self._background(width, height).copy()
+        bboxes, _ = self._project_bboxes(camera, width, height)
+        for row in bboxes:
+            color = ((row["semanticId"] * 67 + 40) % 256, (row["semanticId"] * 131 + 90) % 256, 200)
+            frame[row["y_min"]:row["y_max"] + 1, row["x_min"]:row["x_max"] + 1] = color
+        return frame
+
+    def _project_bboxes(self, camera: MockCamera, width: int, height: int) -> Tuple[np.ndarray, Dict[str, dict]]:
+        """
+        Project every labelled prim's world bbox, in the bbox2d annotator format.
+        """
+        world_up = np.array([0.0, 0.0, 1.0])
+        right = np.cross(camera.forward, world_up)
+        if np.linalg.norm(right) < 1e-9:
+            right = np.array([0.0, 1.0, 0.0])
+        right = right / np.linalg.norm(right)
+        up = np.cross(right, camera.forward)
+        focal_px = camera.focal_length / camera.horizontal_aperture * width
+
+        rows: List[tuple] = []
+        id_to_labels: Dict[str, dict] = {}
+        for semantic_id, (prim_path, label) in enumerate(self._semantics.items()):
+            id_to_labels[str(semantic_id)] = {"class": label}
+            prim = self.stage.GetPrimAtPath(prim_path)
+            if not prim:
+                continue
+            bbox_min, bbox_max = compute_bbox(prim)
+            if np.any(bbox_min > bbox_max):
+                continue  # empty bound
+            corners = np.array([[x, y, z] for x in (bbox_min[0], bbox_max[0]) for y in (bbox_min[1], bbox_max[1]) for z in (bbox_min[2], bbox_max[2])])
+            rel = corners - camera.position
+            depth = rel @ camera.forward
+            if np.any(depth <= 1e-6):
+                continue
+            u = width / 2 + (rel @ right) / depth * focal_px
+            v = height / 2 - (rel @ up) / depth * focal_px
+            x_min, x_max = int(max(u.min(), 0)), int(min(u.max(), width - 1))
+            y_min, y_max = int(max(v.min(), 0)), int(min(v.max(), height - 1))
+            if x_min > x_max or y_min > y_max:
+                continue
+            rows.append((semantic_id, x_min, y_min, x_max, y_max, 0.0))
+        return np.array(rows, dtype=BBOX2D_DTYPE), id_to_labels
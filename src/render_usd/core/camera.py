@@ -4,7 +4,9 @@ import numpy as np
 from scipy.spatial.transform import Rotation as R
 from omni.isaac.sensor import Camera
 from omni.isaac.core.prims import XFormPrim
-from typing import Tuple, List, Dict, Optional, Union
+from typing import Tuple, List, Dict, Iterable, Optional, Union
+
+from render_usd.core.camera_pool import ANNOTATOR_TYPES, validate_annotators
 
 #==============================================================================
 #                                INIT/SETUP CAMERA
@@ -49,6 +51,26 @@ def set_camera_look_at(
     camera.set_world_pose(position=camera_position, orientation=quaternion)
 
 
+def attach_annotators(camera: Camera, annotators: Iterable[str]) -> None:
+    """
+    Attach exactly the annotators needed for a validated spec.
+    """
+    annotators = validate_annotators(annotators)
+    if "depth" in annotators:
+        camera.add_distance_to_image_plane_to_frame()
+    if "cloud" in annotators:
+        camera.add_pointcloud_to_frame()
+    if "seg" in annotators:
+        camera.add_semantic_segmentation_to_frame()
+    if "bbox2d_tight" in annotators:
+        camera.add_bounding_box_2d_tight_to_frame()
+    if "bbox2d_loose" in annotators:
+        camera.add_bounding_box_2d_loose_to_frame()
+    if "bbox3d" in annotators:
+        camera.add_bounding_box_3d_to_frame()
+    if "motion_vectors" in annotators:
+        camera.add_motion_vectors_to_frame()
+
 def setup_camera(
     camera: Camera,
     focal_length: float = 18.0,
@@ -63,28 +85,46 @@ def setup_camera(
     with_motion_vector: bool = False,
     camera_params: Optional[dict] = None,
     panorama: bool = False,
+    annotators: Optional[Iterable[str]] = None,
 ) -> None:
     camera.initialize()
     camera.set_focal_length(focal_length)
     camera.set_clipping_range(clipping_range_min, clipping_range_max)
     camera.set_vertical_aperture(vertical_aperture)
     camera.set_horizontal_aperture(horizontal_aperture)
-    if with_distance:
-        camera.add_distance_to_image_plane_to_frame()
-    if with_semantic:
-        camera.add_semantic_segmentation_to_frame()
-    if with_bbox2d:
-        camera.add_bounding_box_2d_tight_to_frame()
-        camera.add_bounding_box_2d_loose_to_frame()
-    if with_bbox3d:
-        camera.add_bounding_box_3d_to_frame()
-    if with_motion_vector:
-        camera.add_motion_vectors_to_frame()
+    if annotators is not None:
+        # An explicit spec replaces the with_* flags
+        attach_annotators(camera, annotators)
+    else:
+        if with_distance:
+            camera.add_distance_to_image_plane_to_frame()
+        if with_semantic:
+            camera.add_semantic_segmentation_to_frame()
+        if with_bbox2d:
+            camera.add_bounding_box_2d_tight_to_frame()
+            camera.add_bounding_box_2d_loose_to_frame()
+        if with_bbox3d:
+            camera.add_bounding_box_3d_to_frame()
+        if with_motion_vector:
+            camera.add_motion_vectors_to_frame()
     if camera_params is not None:
         set_camera_rational_polynomial(camera, **camera_params)
     if panorama:
         camera.set_projection_type("fisheyeSpherical")
 
+def set_camera_active(camera: Camera, active: bool) -> None:
+    """
+    Attach or detach a camera from rendering without destroying its render product.
+    """
+    render_product = getattr(camera, "_render_product", None)
+    hydra_texture = getattr(render_product, "hydra_texture", None)
+    if hydra_texture is not None:
+        hydra_texture.set_updates_enabled(active)
+    if active and camera.is_paused():
+        camera.resume()
+    elif not active and not camera.is_paused():
+        camera.pause()
+
 #==============================================================================
 #                            PARSE CAMERA INFO
 #==============================================================================
@@ -0,0 +1,119 @@
+from typing import Dict, Iterable, List, Optional
+
+#==============================================================================
+#                               ANNOTATOR SPEC
+#==============================================================================
+
+# Data types readable through get_src. "rgb" comes with every camera; the others
+# need an annotator attached by setup_camera.
+ANNOTATOR_TYPES = ("rgb", "depth", "cloud", "seg", "bbox2d_tight", "bbox2d_loose", "bbox3d", "motion_vectors")
+
+def validate_annotators(annotators: Iterable[str], required: Iterable[str] = ()) -> frozenset:
+    """
+    Validate an annotator spec against the get_src types.
+
+    Args:
+        annotators: Requested data types, e.g. {"rgb", "bbox2d_tight"}.
+        required: Types the caller reads and therefore must be present.
+
+    Returns:
+        frozenset: The validated spec, always including "rgb".
+
+    Raises:
+        ValueError: If a type is unknown or a required type is missing.
+    """
+    annotators = frozenset(annotators) | {"rgb"}
+    unknown = annotators - set(ANNOTATOR_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown annotators {sorted(unknown)}, should be in {ANNOTATOR_TYPES}")
+    missing = set(required) - annotators
+    if missing:
+        raise ValueError(f"Annotator spec {sorted(annotators)} is missing required {sorted(missing)}")
+    return annotators
+
+#==============================================================================
+#                                 CAMERA POOL
+#==============================================================================
+
+class CameraPool:
+    """
+    Cameras reused across render calls, keyed by their configuration.
+
+    Creating a camera initializes a render product and attaches annotators, which is
+    expensive to repeat for every scene. The pool hands out existing cameras when the
+    resolution, focal length and annotator configuration match, and pauses every
+    camera that is not handed out so the renderer stops producing frames for it.
+    Cameras are created and paused through the render backend.
+    """
+    def __init__(self, backend, name_prefix: str = "camera"):
+        """
+        Initialize the pool.
+
+        Args:
+            backend: RenderBackend creating and (de)activating the cameras.
+            name_prefix: Prefix of the camera prim names.
+        """
+        self.backend = backend
+        self.name_prefix = name_prefix
+        self._pools: Dict[tuple, List] = {}
+        self._num_created = 0
+
+    @staticmethod
+    def make_key(
+        image_width: int,
+        image_height: int,
+        focal_length: float,
+        annotators: Optional[Iterable[str]] = None,
+        **setup_kwargs,
+    ) -> tuple:
+        annotator_key = tuple(sorted(validate_annotators(annotators))) if annotators is not None else None
+        return (image_width, image_height, focal_length, annotator_key, tuple(sorted(setup_kwargs.items())))
+
+    def acquire(
+        self,
+        count: int,
+        image_width: int = 640,
+        image_height: int = 480,
+        focal_length: float = 18.0,
+        annotators: Optional[Iterable[str]] = None,
+        **setup_kwargs,
+    ) -> List:
+        """
+        Get `count` cameras with the given configuration, creating only missing ones.
+
+        Args:
+            count: Number of cameras needed.
+            image_width: Image width.
+            image_height: Image height.
+            focal_length: Focal length passed to setup_camera.
+            annotators: Annotator spec passed to setup_camera, e.g. {"rgb", "bbox2d_tight"}.
+            **setup_kwargs: Remaining setup_camera arguments (apertures, legacy with_* flags, ...).
+
+        Returns:
+            List: Active cameras. All other pooled cameras are detached.
+        """
+        key = self.make_key(image_width, image_height, focal_length, annotators, **setup_kwargs)
+        cameras = self._pools.setdefault(key, [])
+        while len(cameras) < count:
+            camera = self.backend.create_camera(
+                f"{self.name_prefix}_{self._num_created}",
+                image_width=image_width,
+                image_height=image_height,
+                focal_length=focal_length,
+                annotators=annotators,
+                **setup_kwargs,
+            )
+            self._num_created += 1
+            cameras.append(camera)
+        for pool_key, pool_cameras in self._pools.items():
+            for idx, camera in enumerate(pool_cameras):
+                self.backend.set_camera_active(camera, pool_key == key and idx < count)
+        return cameras[:count]
+
+    def release_all(self) -> None:
+        """
+        Detach every pooled camera.
+        """
+        for pool_cameras in self._pools.values():
+            for camera in pool_cameras:
+                self.backend.set_camera_active(camera, False)
@@ -0,0 +1,136 @@
+import cv2
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+#==============================================================================
+#                        CO-VISIBLE INSTANCE CLUSTERS
+#==============================================================================
+# Small instances that sit together (a table setting, a shelf) can share their
+# path-traced frames: the cameras frame the union of a cluster, every member's
+# bbox2d rows are picked from the same frames by semantic label, and each
+# member's thumbnail is a crop around its loose bbox, resized to the output
+# size. Cameras stand at one bound diagonal from their target, so a member with
+# diagonal d in a cluster with union diagonal D keeps its dedicated framing in a
+# crop of d / D of the frame. A cluster only accepts members with D / d up to
+# max_extent_ratio, so crops cover at least 1 / max_extent_ratio of the frame.
+
+def _diagonal(bboxes: np.ndarray) -> np.ndarray:
+    return np.linalg.norm(bboxes[..., 1, :] - bboxes[..., 0, :], axis=-1)
+
+
+def cluster_instances(
+    bboxes: np.ndarray,
+    max_cluster_size: int = 6,
+    max_extent_ratio: float = 2.0,
+) -> List[List[int]]:
+    """
+    Group instances whose union can be framed together.
+
+    Greedy: the largest unassigned instance seeds a cluster, then its nearest unassigned
+    neighbours (by bbox center) join while the union diagonal stays within
+    max_extent_ratio times the diagonal of every member.
+
+    Args:
+        bboxes: (N, 2, 3) world bounds, e.g. from WorldBBoxCache.compute_many.
+        max_cluster_size: Maximum members per cluster.
+        max_extent_ratio: Union diagonal / member diagonal limit. Member crops then cover at
+                          least 1 / max_extent_ratio of the shared frame's width.
+
+    Returns:
+        Clusters as lists of indices into bboxes, in ascending order; singletons included.
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 2, 3)
+    diagonals = _diagonal(bboxes)
+    centers = bboxes.mean(axis=1)
+    assigned = np.zeros(len(bboxes), dtype=bool)
+    clusters = []
+    for seed in sorted(range(len(bboxes)), key=lambda idx: (-diagonals[idx], idx)):
+        if assigned[seed]:
+            continue
+        assigned[seed] = True
+        members = [seed]
+        union = bboxes[seed].copy()
+        min_diagonal = diagonals[seed]
+        distances = np.linalg.norm(centers - centers[seed], axis=1)
+        for candidate in np.argsort(distances, kind="stable"):
+            if len(members) >= max_cluster_size:
+                break
+            if assigned[candidate] or diagonals[candidate] <= 0:
+                continue
+            candidate_union = np.stack([np.minimum(union[0], bboxes[candidate, 0]), np.maximum(union[1], bboxes[candidate, 1])])
+            if _diagonal(candidate_union) > max_extent_ratio * min(min_diagonal, diagonals[candidate]):
+                continue
+            assigned[candidate] = True
+            members.append(int(candidate))
+            union = candidate_union
+            min_diagonal = min(min_diagonal, diagonals[candidate])
+        clusters.append(sorted(members))
+    return sorted(clusters)
+
+
+def cluster_bounds(bboxes: np.ndarray, members: Sequence[int]) -> np.ndarray:
+    """
+    Union bound [(min), (max)] of the given members.
+    """
+    member_bboxes = np.asarray(bboxes)[list(members)]
+    return np.stack([member_bboxes[:, 0].min(axis=0), member_bboxes[:, 1].max(axis=0)])
+
+
+def crop_window(
+    bbox2d: Sequence[float],
+    frame_size: Tuple[int, int],
+    output_size: Tuple[int, int],
+    scale: Optional[float] = None,
+    margin: float = 0.25,
+) -> Tuple[int, int, int, int]:
+    """
+    Crop window around a bbox2d row with the output aspect ratio, kept inside the frame.
+
+    Args:
+        bbox2d: Row (id, x_min, y_min, x_max, y_max, ...), usually the loose bbox.
+        frame_size: (width, height) of the shared frame.
+        output_size: (width, height) of the thumbnail.
+        scale: Minimum window width as a fraction of the frame width, e.g. member / union
+               diagonal to keep the framing of a dedicated view.
+        margin: Padding around the bbox, as a fraction of its size on each side.
+
+    Returns:
+        (x0, y0, x1, y1) pixel window; x1/y1 exclusive.
+    """
+    frame_width, frame_height = frame_size
+    aspect = output_size[0] / output_size[1]
+    x_min, y_min, x_max, y_max = (float(value) for value in tuple(bbox2d)[1:5])
+    width = (x_max - x_min + 1) * (1 + 2 * margin)
+    height = (y_max - y_min + 1) * (1 + 2 * margin)
+    width = max(width, height * aspect, (scale or 0.0) * frame_width)
+    width = min(width, frame_width, frame_height * aspect)
+    height = width / aspect
+    center_x = min(max((x_min + x_max + 1) / 2, width / 2), frame_width - width / 2)
+    center_y = min(max((y_min + y_max + 1) / 2, height / 2), frame_height - height / 2)
+    x0, y0 = int(round(center_x - width / 2)), int(round(center_y - height / 2))
+    return x0, y0, x0 + int(round(width)), y0 + int(round(height))
+
+
+def crop_view(
+    rgb: np.ndarray,
+    window: Tuple[int, int, int, int],
+    output_size: Tuple[int, int],
+    bbox2d: Optional[Sequence[float]] = None,
+) -> Tuple[np.ndarray, Optional[tuple]]:
+    """
+    Cut a window out of a shared frame and resize it to the thumbnail size.
+
+    Returns:
+        Tuple of (cropped frame, bbox2d row mapped into the crop or None).
+    """
+    x0, y0, x1, y1 = window
+    crop = np.ascontiguousarray(rgb[y0:y1, x0:x1])
+    scale_x, scale_y = output_size[0] / (x1 - x0), output_size[1] / (y1 - y0)
+    interpolation = cv2.INTER_AREA if scale_x < 1 else cv2.INTER_LINEAR
+    crop = cv2.resize(crop, tuple(output_size), interpolation=interpolation)
+    if bbox2d is None:
+        return crop, None
+    row = list(tuple(bbox2d))  # structured annotator rows do not support item assignment
+    row[1], row[3] = int(round((row[1] - x0) * scale_x)), int(round((row[3] - x0) * scale_x))
+    row[2], row[4] = int(round((row[2] - y0) * scale_y)), int(round((row[4] - y0) * scale_y))
+    return crop, tuple(row)
@@ -0,0 +1,175 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from render_usd.core.manifest import file_checksum
+
+#==============================================================================
+#                             ASSET FINGERPRINTS
+#==============================================================================
+# A fingerprint hashes everything an asset's renders depend on: the root layer,
+# every resolved sublayer/reference/payload layer, and every asset path they use
+# (MDLs, textures). It is stored next to the renders as
+# <save_dir>/<object_name>.fingerprint.json together with a hash of the render
+# settings. An object is re-rendered when either hash changes.
+#
+# Checking is cheap: if no recorded dependency changed size or mtime and no
+# previously unresolved dependency appeared, the stored digest is reused without
+# opening any layer. Files whose mtime changed are re-hashed, so a touched but
+# unchanged texture does not trigger a re-render.
+
+FINGERPRINT_VERSION = 1
+
+
+def fingerprint_path(save_dir: Union[str, Path], object_name: str) -> Path:
+    return Path(save_dir) / f"{object_name}.fingerprint.json"
+
+
+def render_settings_hash(settings: dict) -> str:
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def thumbnail_render_settings(
+    renderer: str,
+    sample_number: int = 4,
+    init_azimuth_angle: float = 0,
+    show_bbox2d: bool = False,
+    naming_style: str = "index",
+    resolution: Tuple[int, int] = (512, 512),
+) -> dict:
+    """
+    Settings that change the thumbnails of an object rendered without background.
+
+    Args:
+        renderer: Backend and renderer, e.g. "isaac:PathTracing" or "mock".
+    """
+    return {
+        "renderer": renderer,
+        "resolution": list(resolution),
+        "views": sample_number,
+        "init_azimuth_angle": init_azimuth_angle,
+        "show_bbox2d": show_bbox2d,
+        "naming_style": naming_style,
+    }
+
+
+def renderer_label(backend_name: str) -> str:
+    """
+    Renderer identity stored in the render settings, e.g. "isaac:PathTracing".
+    """
+    from render_usd.config.settings import SIM_CONFIG
+
+    return f"{backend_name}:{SIM_CONFIG['renderer']}" if backend_name == "isaac" else backend_name
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def collect_dependencies(usd_path: Union[str, Path]) -> Tuple[List[str], List[str]]:
+    """
+    Resolved files an asset depends on (itself included) and the unresolved asset paths.
+    """
+    from pxr import UsdUtils
+
+    layers, assets, unresolved_paths = UsdUtils.ComputeAllDependencies(str(usd_path))
+    files = {os.path.realpath(usd_path)}
+    files.update(os.path.realpath(layer.realPath) for layer in layers if layer is not None and layer.realPath)
+    files.update(os.path.realpath(asset_path) for asset_path in assets if os.path.isfile(asset_path))
+    return sorted(files), sorted(str(path) for path in unresolved_paths)
+
+
+def compute_fingerprint(usd_path: Union[str, Path], previous: Optional[dict] = None) -> dict:
+    """
+    Fingerprint the content of an asset and its dependencies.
+
+    Args:
+        usd_path: Asset USD path.
+        previous: Fingerprint stored by an earlier render. Used to skip re-hashing files whose
+                  size and mtime are unchanged, and to skip opening layers when nothing changed.
+
+    Returns:
+        dict with "digest", "files" ({path: [size, mtime_ns, sha1]}) and "unresolved".
+    """
+    previous_files = previous.get("files", {}) if previous else {}
+    if previous_files and all(_stat_key(path) == entry[:2] for path, entry in previous_files.items()) \
+            and not any(os.path.exists(path) for path in previous.get("unresolved", [])):
+        return {key: previous[key] for key in ("digest", "files", "unresolved")}
+
+    dependency_paths, unresolved_paths = collect_dependencies(usd_path)
+    root_dir = os.path.dirname(os.path.realpath(usd_path))
+    files = {}
+    digest = hashlib.sha1()
+    for path in dependency_paths:
+        stat_key = _stat_key(path)
+        if stat_key is None:
+            continue
+        entry = previous_files.get(path)
+        sha1 = entry[2] if entry is not None and entry[:2] == stat_key else file_checksum(path)
+        files[path] = stat_key + [sha1]
+        # Relative paths keep fingerprints stable when the whole library is moved
+        digest.update(f"{os.path.relpath(path, root_dir)}\0{sha1}\n".encode("utf-8"))
+    return {"digest": digest.hexdigest(), "files": files, "unresolved": unresolved_paths}
+
+
+def load_fingerprint(save_dir: Union[str, Path], object_name: str) -> Optional[dict]:
+    try:
+        with open(fingerprint_path(save_dir, object_name), "r") as f:
+            fingerprint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return fingerprint if fingerprint.get("version") == FINGERPRINT_VERSION else None
+
+
+def save_fingerprint(save_dir: Union[str, Path], object_name: str, fingerprint: dict, settings: dict) -> None:
+    """
+    Store a fingerprint next to the renders (temporary file + rename).
+    """
+    record = dict(fingerprint, version=FINGERPRINT_VERSION, settings=settings, settings_hash=render_settings_hash(settings))
+    path = fingerprint_path(save_dir, object_name)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(record, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def fingerprint_changed(object_usd_path: Union[str, Path], save_dir: Union[str, Path], settings: dict) -> bool:
+    """
+    Whether an object's renders are out of date: no stored fingerprint, other render
+    settings, or changed content of the asset or any of its dependencies.
+    """
+    stored = load_fingerprint(save_dir, Path(object_usd_path).stem)
+    if stored is None or stored.get("settings_hash") != render_settings_hash(settings):
+        return True
+    try:
+        current = compute_fingerprint(object_usd_path, previous=stored)
+    except Exception as e:
+        print(f"[Fingerprint] Cannot fingerprint {object_usd_path}: {e}")
+        return True
+    return current["digest"] != stored["digest"]
+
+
+def adopt_fingerprint(object_usd_path: Union[str, Path], save_dir: Union[str, Path], settings: dict) -> bool:
+    """
+    Store the current fingerprint for renders made without one (e.g. before --incremental
+    was used), so they count as up to date. Existing fingerprints are left untouched.
+
+    Returns:
+        bool: True if a fingerprint was written.
+    """
+    object_name = Path(object_usd_path).stem
+    if load_fingerprint(save_dir, object_name) is not None:
+        return False
+    try:
+        fingerprint = compute_fingerprint(object_usd_path)
+    except Exception as e:
+        print(f"[Fingerprint] Cannot fingerprint {object_usd_path}: {e}")
+        return False
+    save_fingerprint(save_dir, object_name, fingerprint, settings)
+    return True
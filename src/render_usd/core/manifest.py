@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+#==============================================================================
+#                             RENDER MANIFEST
+#==============================================================================
+
+def file_checksum(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-1 checksum of a file.
+
+    Args:
+        path: Path to the file.
+        chunk_size: Read size in bytes.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def describe_output(path: Union[str, Path]) -> dict:
+    """
+    Describe a written output file for the manifest (path, size, checksum).
+    """
+    path = Path(path)
+    return {
+        "path": str(path),
+        "size": os.path.getsize(path),
+        "sha1": file_checksum(path),
+    }
+
+
+class RenderManifest:
+    """
+    Append-only JSON-lines record of completed render units (objects or scenes).
+
+    The manifest is loaded once into memory, so resume and skip decisions are a
+    dictionary lookup instead of a directory listing on the output mount. Each
+    completed unit is appended as a single line with one ``write`` call followed
+    by ``fsync``; a torn trailing line left by a killed worker is ignored on load
+    and the unit is simply rendered again. Recording is thread-safe, so units can
+    be recorded from image writer threads.
+    """
+    def __init__(self, manifest_path: Union[str, Path]):
+        """
+        Initialize the manifest, loading existing records if the file exists.
+
+        Args:
+            manifest_path: Path to the JSONL manifest file. May be per chunk or global.
+        """
+        self.manifest_path = Path(manifest_path)
+        self._records: Dict[str, dict] = {}
+        self._needs_newline = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, "r") as f:
+            for line in f:
+                # A torn trailing line has no newline; the next append must start on a fresh line.
+                self._needs_newline = not line.endswith("\n")
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"[Manifest] Ignoring truncated record in {self.manifest_path}")
+                    continue
+                self._records[record["key"]] = record
+        print(f"[Manifest] Loaded {len(self._records)} records from {self.manifest_path}")
+
+    def __contains__(self, key) -> bool:
+        return str(key) in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key) -> Optional[dict]:
+        """
+        Return the record stored for a key, or None.
+        """
+        return self._records.get(str(key))
+
+    def is_complete(self, key, expected_views: Optional[int] = None) -> bool:
+        """
+        Check whether a render unit has been completed.
+
+        Args:
+            key: Unique key of the render unit (e.g. the object USD path).
+            expected_views: If given, the record must list at least this many views.
+
+        Returns:
+            bool: True if the unit can be skipped.
+        """
+        record = self._records.get(str(key))
+        if record is None:
+            return False
+        if expected_views is not None and len(record.get("views", [])) < expected_views:
+            return False
+        return True
+
+    def record(
+        self,
+        key,
+        output_paths: Iterable[Union[str, Path]] = (),
+        views: Optional[List] = None,
+        **metadata,
+    ) -> dict:
+        """
+        Record a completed render unit and append it to the manifest file.
+
+        Args:
+            key: Unique key of the render unit.
+            output_paths: Files written for this unit. Size and checksum are read back from disk.
+            views: View identifiers rendered for this unit. Defaults to one per output.
+            **metadata: Extra JSON-serialisable fields stored with the record.
+
+        Returns:
+            dict: The stored record.
+        """
+        outputs = [describe_output(path) for path in output_paths]
+        return self.record_outputs(key, outputs, views=views, **metadata)
+
+    def record_outputs(
+        self,
+        key,
+        outputs: List[dict],
+        views: Optional[List] = None,
+        **metadata,
+    ) -> dict:
+        """
+        Record a completed render unit from already described outputs.
+
+        Args:
+            key: Unique key of the render unit.
+            outputs: List of {"path", "size", "sha1"} dictionaries.
+            views: View identifiers rendered for this unit. Defaults to one per output.
+            **metadata: Extra JSON-serialisable fields stored with the record.
+
+        Returns:
+            dict: The stored record.
+        """
+        record = dict(metadata)
+        record.update({
+            "key": str(key),
+            "views": list(views) if views is not None else list(range(len(outputs))),
+            "outputs": outputs,
+            "time": time.time(),
+        })
+        with self._lock:
+            self._append(record)
+            self._records[record["key"]] = record
+        return record
+
+    def _append(self, record: dict) -> None:
+        line = json.dumps(record, sort_keys=True, default=str) + "\n"
+        if self._needs_newline:
+            line = "\n" + line
+            self._needs_newline = False
+        line = line.encode("utf-8")
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.manifest_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def rebuild_from_disk(
+        self,
+        entries: Iterable[Tuple[str, List[Path]]],
+        **metadata,
+    ) -> int:
+        """
+        Import existing outputs into the manifest.
+
+        Args:
+            entries: (key, expected_output_paths) pairs. A unit is imported only if
+                     every expected output exists and it is not recorded yet.
+            **metadata: Extra fields stored with every imported record.
+
+        Returns:
+            int: Number of imported units.
+        """
+        imported = 0
+        for key, output_paths in entries:
+            if key in self:
+                continue
+            if not output_paths or not all(os.path.exists(path) for path in output_paths):
+                continue
+            self.record(key, output_paths, rebuilt=True, **metadata)
+            imported += 1
+        print(f"[Manifest] Imported {imported} completed units into {self.manifest_path}")
+        return imported
@@ -0,0 +1,156 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from render_usd.core.fingerprint import fingerprint_changed
+
+#==============================================================================
+#                             OUTPUT LAYOUT
+#==============================================================================
+# Pure-Python helpers describing where thumbnails are written. They are shared
+# by the renderer, the render manifest and the CLI so that skip decisions and
+# the files actually written never disagree.
+
+VIEW_NAMES = {0: "front", 1: "left", 2: "back", 3: "right"}
+
+
+def resolve_thumbnail_save_dir(
+    object_usd_path: Path,
+    thumbnail_wo_bg_dir: Optional[Union[Path, List[Path]]],
+    idx_obj: int,
+) -> Path:
+    """
+    Resolve the output directory of one object rendered without background.
+
+    Args:
+        object_usd_path: Path to the object USD file.
+        thumbnail_wo_bg_dir: None (save next to the USD), a list of per-object
+                             directories, or a root directory (save to root/object_name).
+        idx_obj: Index of the object in the render list.
+
+    Returns:
+        Path: The directory the object's thumbnails are written to.
+    """
+    object_usd_path = Path(object_usd_path)
+    if thumbnail_wo_bg_dir is None:
+        return object_usd_path.parent
+    if isinstance(thumbnail_wo_bg_dir, list):
+        if idx_obj < len(thumbnail_wo_bg_dir):
+            return Path(thumbnail_wo_bg_dir[idx_obj])
+        print(f"[Error] thumbnail_wo_bg_dir list length mismatch. Using parent dir.")
+        return object_usd_path.parent
+    return Path(thumbnail_wo_bg_dir) / object_usd_path.stem
+
+
+def thumbnail_filename_bases(
+    object_name: str,
+    sample_number: int = 4,
+    init_azimuth_angle: float = 0,
+    naming_style: str = "index",
+) -> List[str]:
+    """
+    Compute the file name (without suffix) of every view of an object.
+
+    Args:
+        object_name: Name of the object (USD file stem).
+        sample_number: Number of views rendered per object.
+        init_azimuth_angle: Initial azimuth angle for the camera.
+        naming_style: "index" ({object_name}_{idx}) or "view" (front, left, back, right).
+
+    Returns:
+        List[str]: One file name base per view.
+    """
+    bases = [f"{object_name}_{idx}" for idx in range(sample_number)]
+    if naming_style == "view":
+        if sample_number == 4 and init_azimuth_angle == 0:
+            bases = [VIEW_NAMES[idx] for idx in range(sample_number)]
+        else:
+            print(f"[Warning] 'view' naming style requires sample_number=4 and init_azimuth_angle=0. Falling back to index style.")
+    return bases
+
+
+def thumbnail_output_paths(
+    save_dir: Path,
+    object_name: str,
+    sample_number: int = 4,
+    init_azimuth_angle: float = 0,
+    naming_style: str = "index",
+    show_bbox2d: bool = False,
+) -> List[Path]:
+    """
+    Compute the PNG paths written for one object rendered without background.
+
+    Returns:
+        List[Path]: One output path per view.
+    """
+    suffix = "_bbox2d.png" if show_bbox2d else ".png"
+    bases = thumbnail_filename_bases(object_name, sample_number, init_azimuth_angle, naming_style)
+    return [Path(save_dir) / f"{base}{suffix}" for base in bases]
+
+
+#==============================================================================
+#                               SKIP RULES
+#==============================================================================
+# `manifest` is a RenderManifest or None. Without a manifest the output
+# directories are listed, as the renderer has always done.
+
+def is_thumbnail_rendered(object_usd_path: Path, save_dir: Path, sample_number: int = 4, manifest=None) -> bool:
+    """
+    Whether an object rendered without background already has all its views.
+    """
+    object_usd_path = Path(object_usd_path)
+    if manifest is not None:
+        return manifest.is_complete(str(object_usd_path), expected_views=sample_number)
+    object_name = object_usd_path.stem
+    return os.path.exists(save_dir) and len([f for f in os.listdir(save_dir) if f.startswith(object_name) and f.endswith('.png')]) >= sample_number
+
+
+def pending_thumbnails(
+    object_usd_paths: List[Path],
+    thumbnail_wo_bg_dir: Optional[Union[Path, List[Path]]],
+    sample_number: int = 4,
+    manifest=None,
+    render_settings: Optional[dict] = None,
+) -> List[Tuple[Path, Path]]:
+    """
+    Apply the skip rule and return (object_usd_path, save_dir) of objects still to render.
+
+    Args:
+        render_settings: Incremental mode. Rendered objects are pending again if their stored
+                         fingerprint is missing or differs from the asset's content and these settings.
+    """
+    pending = []
+    for idx_obj, object_usd_path in enumerate(object_usd_paths):
+        object_usd_path = Path(object_usd_path)
+        save_dir = resolve_thumbnail_save_dir(object_usd_path, thumbnail_wo_bg_dir, idx_obj)
+        if not is_thumbnail_rendered(object_usd_path, save_dir, sample_number, manifest) \
+                or (render_settings is not None and fingerprint_changed(object_usd_path, save_dir, render_settings)):
+            pending.append((object_usd_path, save_dir))
+    return pending
+
+
+def scene_instance_key(scene_usd_path: Union[str, Path], mesh_prim_name: str) -> str:
+    """
+    Manifest key of one scene instance rendered with background.
+    """
+    return f"{scene_usd_path}:{mesh_prim_name}"
+
+
+def is_scene_instance_rendered(mesh_dir: Path, key: str, manifest=None) -> bool:
+    """
+    Whether a scene instance rendered with background is done (any view saved counts).
+    Instances recorded without a view are rendered again, as with the directory rule.
+    """
+    if manifest is not None:
+        return manifest.is_complete(key, expected_views=1)
+    return os.path.isdir(mesh_dir) and len(os.listdir(mesh_dir)) > 0
+
+
+def count_rendered_dirs(thumbnail_dir: Path) -> int:
+    """
+    Number of per-unit output directories under a thumbnail directory holding at least one
+    file. Empty directories (e.g. an instance without any saved view) do not count.
+    """
+    if not os.path.isdir(thumbnail_dir):
+        return 0
+    return sum(1 for entry in os.scandir(thumbnail_dir) if entry.is_dir() and len(os.listdir(entry.path)) > 0)
@@ -0,0 +1,206 @@
+import os
+import json
+import heapq
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+#==============================================================================
+#                         COST-AWARE CHUNK PARTITIONING
+#==============================================================================
+# Static chunks (DLC array jobs) finish when their slowest member does. Instead
+# of equal counts, assets are assigned to chunk_total bins by estimated cost
+# with the longest-processing-time-first heuristic (within 4/3 of the optimal
+# makespan). Costs come from cheap file statistics, optionally a light Sdf pass
+# (prim/mesh counts, texture bytes, no stage composition), and are replaced by
+# measured times from earlier --profile_output runs where available. Every
+# chunk worker computes the same partition, so inputs must be shared files.
+
+COST_METHODS = ("size", "sdf")
+
+# Relative weights of the estimate. Calibrated to seconds when measured times exist.
+DEFAULT_COST_WEIGHTS = {
+    "base": 1.0,        # per-object overhead (prim creation, settle, readback)
+    "file_mb": 0.05,    # layer read and parse
+    "prim": 0.001,      # composition
+    "mesh": 0.01,       # geometry upload
+    "texture_mb": 0.02, # texture load
+}
+
+# PhaseTimer phases of the asynchronous writer. They overlap rendering and depend on
+# the writer settings, so measured times leave them out.
+WRITER_PHASES = ("write_submit", "encode", "write")
+
+TEXTURE_SUFFIXES = (".png", ".jpg", ".jpeg", ".tga", ".exr", ".hdr", ".tif", ".tiff", ".bmp", ".dds")
+
+
+@dataclass
+class AssetCost:
+    """
+    Cost inputs of one asset.
+    """
+    path: str
+    mtime: float
+    file_bytes: int
+    prim_count: int = 0
+    mesh_count: int = 0
+    texture_bytes: int = 0
+
+    def estimate(self, weights: Dict[str, float] = DEFAULT_COST_WEIGHTS) -> float:
+        return (
+            weights["base"]
+            + weights["file_mb"] * self.file_bytes / 2**20
+            + weights["prim"] * self.prim_count
+            + weights["mesh"] * self.mesh_count
+            + weights["texture_mb"] * self.texture_bytes / 2**20
+        )
+
+
+def measure_asset(usd_path: Union[str, Path], method: str = "size") -> AssetCost:
+    """
+    Gather the cost inputs of one asset.
+
+    Args:
+        usd_path: Asset USD path.
+        method: "size" (stat only) or "sdf" (also open its layers and count prims, meshes and texture bytes).
+    """
+    stat = os.stat(usd_path)
+    cost = AssetCost(str(usd_path), stat.st_mtime, stat.st_size)
+    if method != "sdf":
+        return cost
+
+    from pxr import Sdf, UsdUtils
+
+    try:
+        layers, assets, _ = UsdUtils.ComputeAllDependencies(str(usd_path))
+    except Exception as e:
+        print(f"[Partition] Cannot open {usd_path} ({e}), using its file size only.")
+        return cost
+    for layer in layers:
+        if layer is None:
+            continue
+        if layer.realPath and layer.realPath != os.path.realpath(usd_path):
+            cost.file_bytes += os.path.getsize(layer.realPath)
+
+        def _count(path):
+            if path.IsPrimPath():
+                cost.prim_count += 1
+                if layer.GetPrimAtPath(path).typeName == "Mesh":
+                    cost.mesh_count += 1
+        layer.Traverse(Sdf.Path.absoluteRootPath, _count)
+    for asset_path in assets:
+        if asset_path.lower().endswith(TEXTURE_SUFFIXES) and os.path.exists(asset_path):
+            cost.texture_bytes += os.path.getsize(asset_path)
+    return cost
+
+
+def load_measured_times(timing_paths: Iterable[Union[str, Path]]) -> Dict[str, float]:
+    """
+    Median measured seconds per object from PhaseTimer JSONL files (--profile_output).
+
+    Writer phases are excluded. A tile record is split evenly between its member objects.
+    """
+    samples: Dict[str, List[float]] = {}
+    for timing_path in timing_paths:
+        with open(timing_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn trailing line
+                seconds = sum(value for name, value in record["phases"].items() if name not in WRITER_PHASES)
+                members = record.get("members") or [record["key"]]
+                for member in members:
+                    samples.setdefault(member, []).append(seconds / len(members))
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+def estimate_costs(
+    usd_paths: Sequence[Union[str, Path]],
+    method: str = "size",
+    measured_times: Optional[Dict[str, float]] = None,
+    cache_path: Optional[Union[str, Path]] = None,
+    num_workers: int = 16,
+    weights: Dict[str, float] = DEFAULT_COST_WEIGHTS,
+) -> Tuple[List[float], bool]:
+    """
+    Estimate the render cost of every asset.
+
+    Args:
+        usd_paths: Asset USD paths.
+        method: "size" or "sdf", see measure_asset.
+        measured_times: Seconds per asset from earlier runs. Measured assets use their time;
+                        the others are scaled by the median measured/estimated ratio.
+        cache_path: Optional JSON cache of cost inputs, reused while an asset's mtime is unchanged.
+        num_workers: Threads measuring assets.
+        weights: Weights of the estimate.
+
+    Returns:
+        Tuple of (costs, whether costs are calibrated to seconds).
+    """
+    if method not in COST_METHODS:
+        raise ValueError(f"Invalid cost method {method}, should be one of {COST_METHODS}")
+    cache: Dict[str, dict] = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+
+    def _measure(usd_path) -> AssetCost:
+        cached = cache.get(f"{method}:{usd_path}")
+        if cached is not None:
+            try:
+                if os.stat(usd_path).st_mtime == cached["mtime"]:
+                    return AssetCost(**cached)
+            except OSError:
+                pass
+        return measure_asset(usd_path, method)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        asset_costs = list(executor.map(_measure, [str(usd_path) for usd_path in usd_paths]))
+
+    if cache_path:
+        cache.update({f"{method}:{cost.path}": asdict(cost) for cost in asset_costs})
+        tmp_path = Path(cache_path).with_name(f".{Path(cache_path).name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+
+    estimates = [cost.estimate(weights) for cost in asset_costs]
+    if not measured_times:
+        return estimates, False
+    ratios = [measured_times[cost.path] / estimate for cost, estimate in zip(asset_costs, estimates) if cost.path in measured_times]
+    if not ratios:
+        return estimates, False
+    scale = statistics.median(ratios)
+    return [measured_times.get(cost.path, estimate * scale) for cost, estimate in zip(asset_costs, estimates)], True
+
+
+def lpt_partition(costs: Sequence[float], num_bins: int) -> Tuple[List[List[int]], List[float]]:
+    """
+    Assign items to bins, longest processing time first.
+
+    Items are taken in decreasing cost (ties by index) and each goes to the currently
+    least loaded bin (ties by bin index), so every worker computes the same partition.
+
+    Returns:
+        Tuple of (item indices per bin in ascending order, predicted load per bin).
+    """
+    bins: List[List[int]] = [[] for _ in range(num_bins)]
+    loads = [0.0] * num_bins
+    heap = [(0.0, idx_bin) for idx_bin in range(num_bins)]
+    for idx_item in sorted(range(len(costs)), key=lambda idx: (-costs[idx], idx)):
+        load, idx_bin = heapq.heappop(heap)
+        bins[idx_bin].append(idx_item)
+        loads[idx_bin] = load + costs[idx_item]
+        heapq.heappush(heap, (loads[idx_bin], idx_bin))
+    return [sorted(items) for items in bins], loads
+
+
+def contiguous_loads(costs: Sequence[float], num_bins: int) -> List[float]:
+    """
+    Predicted load per bin of the count-based contiguous chunking, for comparison.
+    """
+    chunk_size = (len(costs) + num_bins - 1) // num_bins
+    return [sum(costs[idx_bin * chunk_size:(idx_bin + 1) * chunk_size]) for idx_bin in range(num_bins)]
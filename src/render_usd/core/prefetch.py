@@ -0,0 +1,127 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+from pxr import Sdf, UsdUtils
+
+#==============================================================================
+#                            USD LAYER PREFETCH
+#==============================================================================
+
+def open_layer_with_dependencies(usd_path: str) -> List[Sdf.Layer]:
+    """
+    Open a root layer and every layer it depends on (sublayers, references, payloads).
+
+    Returns:
+        List[Sdf.Layer]: Opened layers. Holding them keeps them in the Sdf layer registry,
+                         so a later reference to the same path resolves from memory.
+    """
+    root_layer = Sdf.Layer.FindOrOpen(usd_path)
+    if root_layer is None:
+        raise IOError(f"Cannot open layer {usd_path}")
+    layers, _, unresolved_paths = UsdUtils.ComputeAllDependencies(usd_path)
+    if unresolved_paths:
+        print(f"[Prefetch] {usd_path} has {len(unresolved_paths)} unresolved dependencies.")
+    return [root_layer] + [layer for layer in layers if layer is not None]
+
+
+class LayerPrefetcher:
+    """
+    Opens the next assets' USD layers on worker threads while the current asset renders.
+
+    Opened layers are held in a bounded LRU cache; create_prim(..., usd_path=...) then
+    finds them already open in the Sdf layer registry instead of reading the network
+    mount on the main thread. Hits, late hits (still loading when needed) and misses
+    are counted.
+    """
+    def __init__(self, lookahead: int = 2, max_cached: int = 8, num_workers: int = 2):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            lookahead: Number of upcoming assets to prefetch. 0 disables prefetching.
+            max_cached: Maximum number of assets whose layers are held in memory.
+            num_workers: Number of loader threads.
+        """
+        self.lookahead = lookahead
+        self.max_cached = max(max_cached, lookahead + 1)
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="layer_prefetch") if lookahead > 0 else None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Future]" = OrderedDict()
+        self.hits = 0
+        self.late_hits = 0
+        self.misses = 0
+        self.wait_time = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._executor is not None
+
+    def prefetch(self, usd_path: Union[str, Path]) -> None:
+        """
+        Start loading one asset's layers unless they are cached or loading already.
+        """
+        if not self.enabled:
+            return
+        key = str(usd_path)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return
+            self._cache[key] = self._executor.submit(open_layer_with_dependencies, key)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+
+    def prefetch_window(self, usd_paths: Sequence[Union[str, Path]], current_index: int) -> None:
+        """
+        Prefetch the `lookahead` assets following `current_index`.
+        """
+        for usd_path in usd_paths[current_index + 1:current_index + 1 + self.lookahead]:
+            self.prefetch(usd_path)
+
+    def acquire(self, usd_path: Union[str, Path]) -> bool:
+        """
+        Make sure an asset's layers are open before it is referenced into the stage.
+
+        Returns:
+            bool: True if the layers came from the prefetch cache.
+        """
+        if not self.enabled:
+            return False
+        key = str(usd_path)
+        with self._lock:
+            future = self._cache.get(key)
+        if future is None:
+            self.misses += 1
+            return False
+        if future.done():
+            self.hits += 1
+        else:
+            self.late_hits += 1
+            start_time = time.perf_counter()
+            future.exception()  # wait; load errors fall back to the normal open path
+            self.wait_time += time.perf_counter() - start_time
+        return future.exception() is None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "late_hits": self.late_hits,
+            "misses": self.misses,
+            "wait_time": round(self.wait_time, 3),
+        }
+
+    def clear(self) -> None:
+        """
+        Drop every cached layer. Counters are kept.
+        """
+        with self._lock:
+            self._cache.clear()
+
+    def close(self) -> None:
+        self.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from tqdm import tqdm
+
+from render_usd.core.fingerprint import compute_fingerprint
+from render_usd.core.manifest import file_checksum
+
+#==============================================================================
+#                        RENDER-READY SCENE CACHE
+#==============================================================================
+# fix_mdls opens a scene, walks every attribute, probes the file system and
+# saves into the source dataset on every render run. Preprocessing does this
+# once per scene content and never writes into the dataset. The scene is
+# composed and its material and texture paths are resolved and made absolute.
+# Missing MDLs get placeholders written next to the cached copy. The stage is
+# then flattened into one binary .usdc layer. Entries are keyed by the scene's
+# dependency fingerprint (layers, MDLs, textures), its location and the
+# default MDL:
+#
+#   <cache_dir>/<key>/<scene stem>.usdc
+#   <cache_dir>/<key>/Materials/<placeholder>.mdl
+#   <cache_dir>/<key>/report.json
+#   <cache_dir>/sources/<sha1 of the source path>.json   (fingerprint + key)
+#
+# The stored fingerprint makes lookups cheap: unchanged files are not re-hashed.
+# Every entry carries a validation report (fixed and missing assets, counts).
+
+PREPROCESS_VERSION = 1
+
+# Material names resolved by the renderer's MDL search path, left untouched (as in fix_mdls)
+BUILTIN_MDLS = ("OmniPBR.mdl",)
+
+
+def _source_record_path(cache_dir: Union[str, Path], usd_path: Union[str, Path]) -> Path:
+    source_hash = hashlib.sha1(os.path.realpath(usd_path).encode("utf-8")).hexdigest()
+    return Path(cache_dir) / "sources" / f"{source_hash}.json"
+
+
+def _load_source_record(cache_dir: Union[str, Path], usd_path: Union[str, Path]) -> Optional[dict]:
+    try:
+        with open(_source_record_path(cache_dir, usd_path), "r") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return record if record.get("version") == PREPROCESS_VERSION else None
+
+
+def _write_json(path: Path, data: dict) -> None:
+    os.makedirs(path.parent, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def preprocess_key(usd_path: Union[str, Path], fingerprint: dict, default_mdl_path: Union[str, Path]) -> str:
+    """
+    Cache key of a scene: its content fingerprint, its location (the cached copy stores
+    absolute asset paths) and the default MDL used for placeholders.
+    """
+    default_mdl = file_checksum(default_mdl_path) if os.path.exists(default_mdl_path) else "missing"
+    key = f"{PREPROCESS_VERSION}\0{os.path.realpath(usd_path)}\0{fingerprint['digest']}\0{default_mdl}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _scene_key(usd_path, cache_dir, default_mdl_path):
+    record = _load_source_record(cache_dir, usd_path)
+    fingerprint = compute_fingerprint(usd_path, previous=record["fingerprint"] if record else None)
+    return preprocess_key(usd_path, fingerprint, default_mdl_path), fingerprint
+
+
+def cached_scene_path(
+    cache_dir: Union[str, Path],
+    usd_path: Union[str, Path],
+    default_mdl_path: Union[str, Path],
+) -> Optional[Path]:
+    """
+    Render-ready copy of a scene if the cache holds one for its current content, else None.
+    """
+    try:
+        key, _ = _scene_key(usd_path, cache_dir, default_mdl_path)
+    except Exception as e:
+        print(f"[Preprocess] Cannot fingerprint {usd_path}: {e}")
+        return None
+    cached_path = Path(cache_dir) / key / f"{Path(usd_path).stem}.usdc"
+    return cached_path if cached_path.exists() else None
+
+
+def _resolve_material_paths(stage, write_dir: Path, entry_dir: Path, default_mdl_path: Union[str, Path], report: dict) -> None:
+    """
+    Make asset attribute values absolute in the session layer, with the fix_mdls rules:
+    assets are looked up under ./Materials/ first, and missing MDLs get a placeholder
+    built from the default MDL. Placeholders are written to write_dir and referenced at
+    their final location in entry_dir, never in the dataset.
+    """
+    from pxr import Sdf
+
+    default_mdl = None
+    stage.SetEditTarget(stage.GetSessionLayer())
+    for prim in stage.TraverseAll():
+        for attr in prim.GetAttributes():
+            if attr.GetTypeName() != Sdf.ValueTypeNames.Asset:
+                continue
+            value = attr.Get()
+            authored_path = value.path if value is not None else ""
+            if not authored_path or Path(authored_path).name in BUILTIN_MDLS:
+                continue
+            property_stack = attr.GetPropertyStack()
+            if not property_stack:
+                continue
+            layer = property_stack[0].layer
+            candidates = [authored_path]
+            if "Materials" not in authored_path.split("/"):
+                candidates.insert(0, "./Materials/" + authored_path)
+            absolute_paths = [os.path.abspath(layer.ComputeAbsolutePath(candidate)) for candidate in candidates]
+            resolved_path = next((path for path in absolute_paths if os.path.exists(path)), None)
+
+            if resolved_path is not None:
+                if os.path.getsize(resolved_path) < 1:
+                    report["empty_assets"].append(resolved_path)
+                if candidates[absolute_paths.index(resolved_path)] != authored_path:
+                    report["materials_fixed"] += 1
+            elif authored_path.endswith(".mdl"):
+                if default_mdl is None:
+                    with open(default_mdl_path, "r") as f:
+                        default_mdl = f.read()
+                placeholder_path = write_dir / "Materials" / Path(authored_path).name
+                if not placeholder_path.exists():
+                    os.makedirs(placeholder_path.parent, exist_ok=True)
+                    with open(placeholder_path, "w") as f:
+                        f.write(default_mdl.replace("Material__43", placeholder_path.stem.split(".")[0]))
+                resolved_path = str(entry_dir / "Materials" / placeholder_path.name)
+                report["placeholders"].append(authored_path)
+            else:
+                # Keep pointing at the dataset, so it behaves as before once relocated
+                resolved_path = absolute_paths[-1]
+                report["missing_assets"].append(resolved_path)
+
+            if resolved_path != authored_path:
+                attr.Set(Sdf.AssetPath(resolved_path))
+
+
+def preprocess_scene(
+    usd_path: Union[str, Path],
+    cache_dir: Union[str, Path],
+    default_mdl_path: Union[str, Path],
+    force: bool = False,
+) -> dict:
+    """
+    Write the render-ready copy of one scene. Runs in pool workers; never raises.
+
+    Args:
+        usd_path: Source scene USD.
+        cache_dir: Cache root.
+        default_mdl_path: MDL used as template for missing materials.
+        force: Rebuild the entry even if it exists.
+
+    Returns:
+        Validation report with "status" ("ok", "cached" or "error"), "cache_path", prim and
+        mesh counts, "materials_fixed", "placeholders", "missing_assets", "empty_assets",
+        "unresolved" layers/assets and "seconds".
+    """
+    from pxr import Usd, UsdGeom
+
+    start_time = time.perf_counter()
+    usd_path = str(usd_path)
+    cache_dir = os.path.abspath(cache_dir)  # placeholders are referenced by absolute path
+    report = {
+        "source": usd_path, "status": "error", "key": None, "cache_path": None, "prims": 0, "meshes": 0,
+        "materials_fixed": 0, "placeholders": [], "missing_assets": [], "empty_assets": [], "unresolved": [],
+    }
+    tmp_dir = None
+    try:
+        key, fingerprint = _scene_key(usd_path, cache_dir, default_mdl_path)
+        report["key"] = key
+        report["unresolved"] = fingerprint["unresolved"]
+        entry_dir = Path(cache_dir) / key
+        cache_path = entry_dir / f"{Path(usd_path).stem}.usdc"
+        if cache_path.exists() and not force:
+            with open(entry_dir / "report.json", "r") as f:
+                report = dict(json.load(f), status="cached")
+        else:
+            tmp_dir = Path(cache_dir) / f".{key}.{os.getpid()}.tmp"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            stage = Usd.Stage.Open(usd_path)
+            _resolve_material_paths(stage, tmp_dir, entry_dir, default_mdl_path, report)
+            for prim in stage.TraverseAll():
+                report["prims"] += 1
+                report["meshes"] += prim.IsA(UsdGeom.Mesh)
+            stage.Flatten().Export(str(tmp_dir / cache_path.name))
+            report.update(status="ok", cache_path=str(cache_path), seconds=time.perf_counter() - start_time)
+            _write_json(tmp_dir / "report.json", report)
+            if force:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                pass  # another worker wrote the same entry
+        _write_json(_source_record_path(cache_dir, usd_path), {"version": PREPROCESS_VERSION, "source": usd_path, "key": key, "fingerprint": fingerprint})
+    except Exception as e:
+        report.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    report["seconds"] = time.perf_counter() - start_time
+    return report
+
+
+def preprocess_scenes(
+    usd_paths: Sequence[Union[str, Path]],
+    cache_dir: Union[str, Path],
+    default_mdl_path: Union[str, Path],
+    num_workers: int = 8,
+    force: bool = False,
+) -> List[dict]:
+    """
+    Preprocess scenes in a process pool (pxr composition and flattening hold the GIL).
+
+    Returns:
+        Validation reports in the order of usd_paths.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    reports: Dict[int, dict] = {}
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(preprocess_scene, str(usd_path), str(cache_dir), str(default_mdl_path), force): idx for idx, usd_path in enumerate(usd_paths)}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Preprocessing scenes"):
+            reports[futures[future]] = future.result()
+    return [reports[idx] for idx in range(len(usd_paths))]
+
+
+def summarize_reports(reports: Sequence[dict]) -> dict:
+    """
+    Totals of a preprocessing run, e.g. for printing or the report file.
+    """
+    summary = {status: sum(report["status"] == status for report in reports) for status in ("ok", "cached", "error")}
+    for field in ("placeholders", "missing_assets", "empty_assets", "unresolved"):
+        summary[field] = sum(len(report.get(field, [])) for report in reports)
+    summary["materials_fixed"] = sum(report.get("materials_fixed", 0) for report in reports)
+    return summary
@@ -0,0 +1,181 @@
+import json
+import time
+import threading
+import contextlib
+import numpy as np
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+#==============================================================================
+#                           PER-PHASE TIMING
+#==============================================================================
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class ObjectTiming:
+    """
+    Wall time spent in each phase for one render unit (object, tile or scene instance).
+
+    Phases measured on writer threads (encode, write) are added concurrently, so
+    accumulation is locked. A unit rendering several objects (a tile or a cluster)
+    lists their keys in `members`.
+    """
+    def __init__(self, key: str, members: Optional[List[str]] = None):
+        self.key = key
+        self.members = members
+        self.phases: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[phase] += seconds
+
+
+class _Phase:
+    __slots__ = ("timing", "name", "start_time")
+
+    def __init__(self, timing: ObjectTiming, name: str):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timing.add(self.name, time.perf_counter() - self.start_time)
+        return False
+
+
+class TimedStepper:
+    """
+    Wraps a world so physics and rendered steps are timed separately.
+    """
+    def __init__(self, world, timing: ObjectTiming):
+        self.world = world
+        self.timing = timing
+
+    def step(self, render: bool = True) -> None:
+        start_time = time.perf_counter()
+        self.world.step(render=render)
+        self.timing.add("render_steps" if render else "physics_steps", time.perf_counter() - start_time)
+
+
+class PhaseTimer:
+    """
+    Optional per-phase instrumentation of the render hot path.
+
+    When disabled, ``phase()`` returns a shared null context and ``begin_object()``
+    returns None, so the cost is one attribute check per phase. When enabled, each
+    finished unit is appended as a JSON line to ``output_path`` (if given) and kept
+    for the p50/p95/p99 summary printed at the end of the run.
+    """
+    PHASES = (
+        "prim_creation", "shadow_semantics", "compute_bbox", "camera_placement",
+        "physics_steps", "render_steps", "readback", "write_submit", "encode", "write",
+    )
+
+    def __init__(self, enabled: bool = False, output_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the timer.
+
+        Args:
+            enabled: Whether timings are recorded.
+            output_path: Optional JSONL file receiving one record per finished unit.
+        """
+        self.enabled = enabled
+        self.output_path = Path(output_path) if output_path else None
+        self._current: Optional[ObjectTiming] = None
+        self._records: List[dict] = []
+        self._lock = threading.Lock()
+
+    def begin_object(self, key: str, members: Optional[List[str]] = None) -> Optional[ObjectTiming]:
+        """
+        Start timing a render unit; subsequent phase() calls are attributed to it.
+
+        Args:
+            key: Unit key.
+            members: Keys of the objects rendered together by this unit, if several.
+        """
+        if not self.enabled:
+            return None
+        self._current = ObjectTiming(str(key), [str(member) for member in members] if members else None)
+        return self._current
+
+    def phase(self, name: str):
+        """
+        Context manager timing one phase of the current unit.
+        """
+        if self._current is None:
+            return _NULL_PHASE
+        return _Phase(self._current, name)
+
+    def stepper(self, world):
+        """
+        Return `world` itself, or a TimedStepper while a unit is being timed.
+        """
+        if self._current is None:
+            return world
+        return TimedStepper(world, self._current)
+
+    def end_object(self) -> None:
+        """
+        Stop attributing phases to the current unit. The record is emitted by finish().
+        """
+        self._current = None
+
+    def finish(self, timing: Optional[ObjectTiming]) -> None:
+        """
+        Emit the record of a unit once all its phases, including async writes, are done.
+        """
+        if timing is None:
+            return
+        with timing._lock:
+            phases = {name: round(seconds, 6) for name, seconds in timing.phases.items()}
+        record = {"key": timing.key, "phases": phases, "total": round(sum(phases.values()), 6)}
+        if timing.members:
+            record["members"] = timing.members
+        with self._lock:
+            self._records.append(record)
+            if self.output_path is not None:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.output_path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Compute p50/p95/p99 per phase (seconds) over all finished units.
+        """
+        with self._lock:
+            records = list(self._records)
+        samples = defaultdict(list)
+        for record in records:
+            for name, seconds in record["phases"].items():
+                samples[name].append(seconds)
+            samples["total"].append(record["total"])
+        result = {}
+        for name in list(self.PHASES) + sorted(set(samples) - set(self.PHASES) - {"total"}) + ["total"]:
+            if not samples.get(name):
+                continue
+            values = np.asarray(samples[name])
+            result[name] = {
+                "count": len(values),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "p99": float(np.percentile(values, 99)),
+            }
+        return result
+
+    def print_summary(self) -> None:
+        if not self.enabled:
+            return
+        summary = self.summary()
+        if not summary:
+            print("[Profiling] No timed units.")
+            return
+        print(f"[Profiling] Phase timings over {summary['total']['count']} units (seconds):")
+        print(f"{'phase':<18}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for name, stats in summary.items():
+            print(f"{name:<18}{stats['p50']:>10.4f}{stats['p95']:>10.4f}{stats['p99']:>10.4f}")
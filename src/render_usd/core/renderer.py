@@ -1,42 +1,107 @@
 import os
-import cv2
+import time
 import numpy as np
 from tqdm import tqdm
 from pathlib import Path
 from natsort import natsorted
-from typing import Tuple, List, Optional, Union
-
-import omni
-import omni.kit.commands
-from pxr import Usd
-from omni.isaac.core.utils.stage import add_reference_to_stage
-from omni.isaac.core.utils.prims import delete_prim, create_prim
-from omni.isaac.core.utils.semantics import add_update_semantics, remove_all_semantics
+from typing import Callable, Tuple, List, Iterable, Optional, Union
 
 from render_usd.utils.common_utils.path_utils import find_all_files_in_folder
-from render_usd.utils.common_utils.images_utils import draw_bbox2d
-from render_usd.utils.usd_utils.prim_utils import compute_bbox, set_prim_cast_shadow_true
-from render_usd.utils.usd_utils.stage_utils import get_all_mesh_prims_from_scope, switch_all_lights
+from render_usd.utils.usd_utils.prim_utils import WorldBBoxCache, compute_bbox, set_prim_cast_shadow_true
+from render_usd.utils.usd_utils.stage_utils import SCENE_COPY_SCOPES, get_all_mesh_prims_from_scope, get_scope_mesh_prims
+from render_usd.utils.usd_utils.edit_utils import StageEditBatch
 from render_usd.utils.usd_utils.mdl_utils import fix_mdls
-from render_usd.config.settings import DEFAULT_MDL_PATH
+from render_usd.config.settings import DEFAULT_MDL_PATH, CAMERA_HORIZONTAL_APERTURE, THUMBNAIL_WO_BG_CAMERA, THUMBNAIL_WITH_BG_CAMERA
 
 # New Core Modules
-from render_usd.core.scene import init_world, setup_environment
-from render_usd.core.camera import init_camera, setup_camera, set_camera_look_at, get_src
+from render_usd.core.backends import RenderBackend, create_backend
+from render_usd.core.camera_pool import CameraPool, validate_annotators
+from render_usd.core.manifest import RenderManifest
+from render_usd.core.outputs import thumbnail_filename_bases, pending_thumbnails, scene_instance_key, is_scene_instance_rendered
+from render_usd.core.writer import AsyncImageWriter, WriteError
+from render_usd.core.settle import SettleStrategy, SettleResult
+from render_usd.core.tiling import compute_tile_layout, select_bbox_row, split_into_tiles
+from render_usd.core.covisible import cluster_bounds, cluster_instances, crop_view, crop_window
+from render_usd.core.visibility import OcclusionScene
+from render_usd.core.prefetch import LayerPrefetcher
+from render_usd.core.scene_lifecycle import SceneLifecycle
+from render_usd.core.preprocess import cached_scene_path, preprocess_scene
+from render_usd.core.profiling import PhaseTimer
+from render_usd.core.work_queue import WorkQueue
+from render_usd.core.fingerprint import compute_fingerprint, load_fingerprint, save_fingerprint, renderer_label, thumbnail_render_settings
 
 class RenderManager:
     """
     Manages the rendering process for USD objects and scenes.
     """
-    def __init__(self, app=None):
+    def __init__(
+        self,
+        app=None,
+        writer_workers: int = 4,
+        max_pending_writes: int = 32,
+        settle_strategy: Optional[SettleStrategy] = None,
+        static_scene: bool = False,
+        prefetch_lookahead: int = 2,
+        profile: bool = False,
+        profile_output: Optional[Union[str, Path]] = None,
+        backend: Optional[RenderBackend] = None,
+    ):
         """
         Initialize the RenderManager.
 
         Args:
             app: The simulation application instance (optional).
+            writer_workers: Number of background image writer threads. 0 writes synchronously.
+            max_pending_writes: Maximum number of frames queued for writing before rendering blocks.
+            settle_strategy: How many physics/render steps are run before readback.
+                             Defaults to a fixed 100 physics + 8 render steps.
+            static_scene: Render-only mode. Physics simulation is disabled and frames advance
+                          through render ticks only; physics steps of the settle strategy are skipped.
+            prefetch_lookahead: Number of upcoming assets whose USD layers are opened in the
+                                background while the current one renders. 0 disables it.
+            profile: Record per-phase wall time of every rendered object, tile or scene instance.
+            profile_output: Optional JSONL file receiving one timing record per unit.
+            backend: Simulator interface. Defaults to Isaac Sim (requires a running SimulationApp);
+                     create_backend("mock") renders synthetic frames on CPU only.
         """
         self.app = app
-        self.world = init_world()
+        self.static_scene = static_scene
+        self.backend = backend if backend is not None else create_backend("isaac")
+        self.world = self.backend.init_world(static_scene=static_scene)
+        self.image_writer = AsyncImageWriter(num_workers=writer_workers, max_pending=max_pending_writes)
+        self.settle_strategy = settle_strategy if settle_strategy is not None else SettleStrategy.fixed()
+        self.camera_pool = CameraPool(self.backend)
+        self.prefetcher = LayerPrefetcher(lookahead=prefetch_lookahead, max_cached=max(8, 2 * prefetch_lookahead))
+        # Shared world bounds of the current scene; cleared whenever the scene changes
+        self.bbox_cache = WorldBBoxCache()
+        # One background scene at a time; the environment is loaded once per stage
+        self.scenes = SceneLifecycle(self.backend)
+        self._environment_ready = False
+        self.timer = PhaseTimer(enabled=profile, output_path=profile_output)
+        # Called with (key, output descriptions) once every view of a unit is on disk,
+        # e.g. by the render daemon to stream per-object status.
+        self.on_unit_done: Optional[Callable[[str, List[dict]], None]] = None
+        self.write_errors: List[WriteError] = []
+
+    def settle(self, cameras: List, label: str) -> SettleResult:
+        """
+        Run the settle strategy for the current object and report the steps used.
+
+        Args:
+            cameras: Cameras looking at the object.
+            label: Name printed with the report.
+
+        Returns:
+            SettleResult: The steps actually used.
+        """
+        stepper = self.timer.stepper(self.backend.stepper(self.world))
+        result = self.settle_strategy.settle(stepper, cameras, lambda camera: self.backend.get_src(camera, "rgb"))
+        if self.static_scene:
+            result.physics_steps = 0
+        if self.settle_strategy.mode != "fixed":
+            status = "converged" if result.converged else "not converged"
+            print(f"[RenderManager: Settle] {label}: {result.physics_steps} physics + {result.render_steps} render steps ({status}).")
+        return result
 
     def compute_2d_bbox_area(self, bbox2d_data: Tuple[int, float, float, float, float, float]) -> float:
         """
@@ -83,6 +148,11 @@ class RenderManager:
         sample_number=4,
         init_azimuth_angle=0,
         naming_style="index",
+        manifest: Optional[RenderManifest] = None,
+        annotators: Optional[Iterable[str]] = None,
+        tile_size: int = 1,
+        work_queue: Optional[WorkQueue] = None,
+        incremental: bool = False,
     ):
         """
         Render thumbnails for objects without a background (using a default environment).
@@ -96,175 +166,521 @@ class RenderManager:
             sample_number: Number of views to render per object.
             init_azimuth_angle: Initial azimuth angle for the camera.
             naming_style: Naming convention for output files. "index" (default) or "view".
+            manifest: Render manifest used for skip decisions and recording completed objects.
+                      If None, the output directory is listed for each object instead.
+            annotators: Annotator spec attached to the cameras. Defaults to the minimum the
+                        pipeline reads: {"rgb"}, plus "bbox2d_tight" if show_bbox2d.
+            tile_size: Number of objects placed and rendered together per settle cycle.
+            work_queue: If given, object_usd_paths and thumbnail_wo_bg_dir are ignored and
+                        batches are claimed from the shared queue until it is drained. A batch
+                        is completed once all its outputs are on disk.
+            incremental: Also re-render objects whose content fingerprint (layers, MDLs, textures)
+                         or render settings changed since they were rendered. The fingerprint is
+                         stored next to the renders once all views are written. Requires an
+                         output directory: fingerprints are never stored next to the asset USDs.
+
+        Returns:
+            List[str]: Manifest keys of the objects rendered by this call.
         """
         # Light settings
         if not self.world:
-            self.world = init_world()
+            self.world = self.backend.init_world(static_scene=self.static_scene)
             
         # Setup Environment (Load USD or Fallback Dome Light)
-        setup_environment()
+        if not self._environment_ready:
+            self.backend.setup_environment()
+            self._environment_ready = True
         
         # Camera settings
-        cameras = []
-        for i in range(sample_number):
-            camera = init_camera(f"camera_{i}", image_width=512, image_height=512)
-            setup_camera(camera, with_bbox2d=show_bbox2d)
-            cameras.append(camera)
-
-        for idx_obj, object_usd_path in enumerate(tqdm(object_usd_paths, desc="Rendering objects")):
-            object_usd_path = Path(object_usd_path)
-            object_name = object_usd_path.stem
-            
-            if thumbnail_wo_bg_dir is None:
-                save_dir = object_usd_path.parent
-            elif isinstance(thumbnail_wo_bg_dir, list):
-                if idx_obj < len(thumbnail_wo_bg_dir):
-                    save_dir = thumbnail_wo_bg_dir[idx_obj]
-                else:
-                    print(f"[Error] thumbnail_wo_bg_dir list length mismatch. Using parent dir.")
-                    save_dir = object_usd_path.parent
-            else:
-                save_dir = thumbnail_wo_bg_dir / object_name 
+        required_annotators = {"rgb", "bbox2d_tight"} if show_bbox2d else {"rgb"}
+        annotators = validate_annotators(annotators if annotators is not None else required_annotators, required=required_annotators)
+        cameras = self.camera_pool.acquire(sample_number * tile_size, annotators=annotators, **THUMBNAIL_WO_BG_CAMERA)
+        if incremental and work_queue is None and thumbnail_wo_bg_dir is None:
+            print("[RenderManager] Incremental mode needs an output directory, fingerprints are not stored next to the asset USDs. Rendering without it.")
+            incremental = False
+        render_settings = thumbnail_render_settings(
+            renderer_label(self.backend.name), sample_number, init_azimuth_angle, show_bbox2d, naming_style,
+        ) if incremental else None
+        render_args = (cameras, tile_size, show_bbox2d, sample_number, init_azimuth_angle, naming_style, manifest, render_settings)
 
-            has_rendered = os.path.exists(save_dir) and len([f for f in os.listdir(save_dir) if f.startswith(object_name) and f.endswith('.png')]) >= sample_number
-            if has_rendered:
-                continue
+        rendered_keys = []
+        if work_queue is None:
+            pending = pending_thumbnails(object_usd_paths, thumbnail_wo_bg_dir, sample_number, manifest, render_settings)
+            self._render_pending_thumbnails(pending, *render_args)
+            rendered_keys += [str(object_usd_path) for object_usd_path, _ in pending]
+        else:
+            for lease in work_queue.leases():
+                print(f"[RenderManager] Claimed batch {lease.batch_id} ({len(lease.items)} objects).")
+                pending = pending_thumbnails(lease.object_usd_paths, lease.save_dirs, sample_number, manifest, render_settings)
+                write_futures = self._render_pending_thumbnails(pending, *render_args)
+                rendered_keys += [str(object_usd_path) for object_usd_path, _ in pending]
+                self.image_writer.when_all_done(
+                    write_futures,
+                    lambda _, lease=lease: work_queue.complete(lease),
+                    on_error=lambda lease=lease: work_queue.release(lease),
+                )
+
+        self._finish_render_call()
+        return rendered_keys
+
+    def _render_pending_thumbnails(
+        self,
+        pending: List[Tuple[Path, Path]],
+        cameras: List,
+        tile_size: int,
+        show_bbox2d: bool,
+        sample_number: int,
+        init_azimuth_angle: float,
+        naming_style: str,
+        manifest: Optional[RenderManifest],
+        render_settings: Optional[dict] = None,
+    ) -> List:
+        """
+        Render (object USD path, save directory) pairs that passed the skip rule.
+
+        Returns:
+            List of write futures of all rendered objects.
+        """
+        if tile_size > 1:
+            return self._render_thumbnail_wo_bg_tiled(
+                pending, cameras, tile_size,
+                show_bbox2d, sample_number, init_azimuth_angle, naming_style, manifest, render_settings,
+            )
+
+        pending_usd_paths = [object_usd_path for object_usd_path, _ in pending]
+        all_write_futures = []
+        for idx_pending, (object_usd_path, save_dir) in enumerate(tqdm(pending, desc="Rendering objects")):
+            object_name = object_usd_path.stem
+            self.prefetcher.prefetch_window(pending_usd_paths, idx_pending)
+            timing = self.timer.begin_object(object_usd_path)
             
             print(f"Rendering: {object_usd_path}")
             show_prim_path = "/World/Show"
-            usd_prim = create_prim(show_prim_path, position=(0, 0, 0), scale=(1, 1, 1), usd_path=str(object_usd_path))
-            set_prim_cast_shadow_true(usd_prim)
-            add_update_semantics(usd_prim, semantic_label="instance", type_label="class")
-            bbox_min, bbox_max = compute_bbox(usd_prim)
+            with self.timer.phase("prim_creation"):
+                self.prefetcher.acquire(object_usd_path)
+                usd_prim = self.backend.create_prim(show_prim_path, str(object_usd_path), position=(0, 0, 0), scale=(1, 1, 1))
+            with self.timer.phase("shadow_semantics"):
+                set_prim_cast_shadow_true(usd_prim)
+                self.backend.add_semantics(usd_prim, "instance")
+            with self.timer.phase("compute_bbox"):
+                bbox_min, bbox_max = compute_bbox(usd_prim)
             center = (bbox_min + bbox_max) / 2
             
-            for i in range(sample_number):
-                # Calculate azimuth angle: 0, 90, 180, 270 degrees
-                # Mapping (assuming standard coordinate system +X=Front, +Y=Left):
-                # i=0 (0 deg)   -> Front View (+X)
-                # i=1 (90 deg)  -> Left View  (+Y)
-                # i=2 (180 deg) -> Back View  (-X)
-                # i=3 (270 deg) -> Right View (-Y)
-                azimuth = init_azimuth_angle + i * 360 / sample_number
-                elevation = 35  # Fixed elevation angle (high angle shot)
-                distance = np.linalg.norm(bbox_max - bbox_min) * 1.0
-                set_camera_look_at(cameras[i], center, azimuth=azimuth, elevation=elevation, distance=distance)
-                
-            for _ in range(100): 
-                 self.world.step(render=False)
-            for _ in range(8):
-                 self.world.step(render=True)
-                 
-            os.makedirs(save_dir, exist_ok=True)
-            for idx, camera in enumerate(cameras):
-                rgb = get_src(camera, "rgb")
+            with self.timer.phase("camera_placement"):
+                for i in range(sample_number):
+                    # Calculate azimuth angle: 0, 90, 180, 270 degrees
+                    # Mapping (assuming standard coordinate system +X=Front, +Y=Left):
+                    # i=0 (0 deg)   -> Front View (+X)
+                    # i=1 (90 deg)  -> Left View  (+Y)
+                    # i=2 (180 deg) -> Back View  (-X)
+                    # i=3 (270 deg) -> Right View (-Y)
+                    azimuth = init_azimuth_angle + i * 360 / sample_number
+                    elevation = 35  # Fixed elevation angle (high angle shot)
+                    distance = np.linalg.norm(bbox_max - bbox_min) * 1.0
+                    self.backend.set_camera_look_at(cameras[i], center, azimuth=azimuth, elevation=elevation, distance=distance)
                 
-                # Determine filename based on naming style
-                filename_base = f"{object_name}_{idx}"
-                if naming_style == "view":
-                    if sample_number == 4 and init_azimuth_angle == 0:
-                        view_names = {0: "front", 1: "left", 2: "back", 3: "right"}
-                        if idx in view_names:
-                            filename_base = view_names[idx]
+            settle_result = self.settle(cameras, object_name)
+            write_futures = self._write_thumbnail_views(
+                object_usd_path, save_dir, cameras, init_azimuth_angle, naming_style,
+                show_bbox2d, manifest, settle_result, timing=timing, render_settings=render_settings,
+            )
+            self.backend.delete_prim(show_prim_path)
+            self._finish_timing(timing, write_futures)
+            all_write_futures += write_futures
+
+        return all_write_futures
+
+    def _finish_timing(self, timing, write_futures: List) -> None:
+        """
+        Stop timing the current unit and emit its record once its writes are on disk.
+        """
+        if timing is None:
+            return
+        self.timer.end_object()
+        self.image_writer.when_all_done(write_futures, lambda _: self.timer.finish(timing))
+
+    def _record_when_written(
+        self,
+        write_futures: List,
+        manifest: Optional[RenderManifest],
+        key: str,
+        views: Optional[List[int]] = None,
+        **metadata,
+    ) -> None:
+        """
+        Record a unit in the manifest and report it to on_unit_done once all its writes succeeded.
+        """
+        if manifest is None and self.on_unit_done is None:
+            return
+
+        def _record(outputs: List[dict]) -> None:
+            if manifest is not None:
+                manifest.record_outputs(key, outputs, views=views, **metadata)
+            if self.on_unit_done is not None:
+                self.on_unit_done(key, outputs)
+
+        self.image_writer.when_all_done(write_futures, _record)
+
+    def _finish_render_call(self) -> None:
+        self.write_errors += self.image_writer.flush()
+        if self.prefetcher.enabled:
+            print(f"[RenderManager: Prefetch] {self.prefetcher.stats()}")
+            self.prefetcher.clear()
+
+    def _write_thumbnail_views(
+        self,
+        object_usd_path: Path,
+        save_dir: Path,
+        cameras: List,
+        init_azimuth_angle: float,
+        naming_style: str,
+        show_bbox2d: bool,
+        manifest: Optional[RenderManifest],
+        settle_result: SettleResult,
+        semantic_label: Optional[str] = None,
+        timing=None,
+        render_settings: Optional[dict] = None,
+    ) -> List:
+        """
+        Read back the views of one object and queue them on the image writer.
+
+        Args:
+            semantic_label: If given, the bbox2d row is selected by this label instead of taking
+                            the first row (used when several objects share a frame batch).
+            timing: ObjectTiming of the current unit, passed on to the writer.
+            render_settings: Incremental mode: store the object's fingerprint once all views are written.
+
+        Returns:
+            List of write futures of this object.
+        """
+        object_name = object_usd_path.stem
+        os.makedirs(save_dir, exist_ok=True)
+        filename_bases = thumbnail_filename_bases(object_name, len(cameras), init_azimuth_angle, naming_style)
+        write_futures = []
+        for idx, camera in enumerate(cameras):
+            with self.timer.phase("readback"):
+                rgb = self.backend.get_src(camera, "rgb")
+                bbox2d = self.backend.get_src(camera, "bbox2d_tight") if show_bbox2d else None
+            filename_base = filename_bases[idx]
+
+            if show_bbox2d:
+                bbox2d_data = None
+                try:
+                    if semantic_label is None:
+                        bbox2d_data = tuple(bbox2d[0][0])  # get the first row data
                     else:
-                        print(f"[Warning] 'view' naming style requires sample_number=4 and init_azimuth_angle=0. Falling back to index style.")
+                        bbox2d_data = tuple(select_bbox_row(bbox2d[0], bbox2d[1], semantic_label))
+                except:
+                    print(f"[RenderManager: Render Thumbnail Without Background] {object_name} {idx} bbox2d is not valid due to the specific aspect.")
+                with self.timer.phase("write_submit"):
+                    write_futures.append(self.image_writer.submit(rgb, f"{save_dir}/{filename_base}_bbox2d.png", bbox2d=bbox2d_data, timing=timing))
+            else:
+                with self.timer.phase("write_submit"):
+                    write_futures.append(self.image_writer.submit(rgb, f"{save_dir}/{filename_base}.png", timing=timing))
+        # Recorded once every view of this object is on disk, while the next object renders.
+        self._record_when_written(write_futures, manifest, str(object_usd_path), save_dir=str(save_dir), settle=settle_result.to_dict())
+        if render_settings is not None:
+            self._store_fingerprint_when_written(write_futures, object_usd_path, save_dir, render_settings)
+        return write_futures
 
-                if show_bbox2d:
-                    bbox2d = get_src(camera, "bbox2d_tight")
-                    try:
-                        bbox2d_data = bbox2d[0][0]  # get the first row data
-                        rgb = draw_bbox2d(rgb, bbox2d_data)
-                    except:
-                        print(f"[RenderManager: Render Thumbnail Without Background] {object_name} {idx} bbox2d is not valid due to the specific aspect.")
-                    cv2.imwrite(f"{save_dir}/{filename_base}_bbox2d.png", cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB))
-                else:
-                    cv2.imwrite(f"{save_dir}/{filename_base}.png", cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB))
-            delete_prim(show_prim_path)
-
-    def render_thumbnail_with_bg(self, scene_usd_path, object_usd_dir, thumbnail_with_bg_dir, show_bbox2d=True):
+    def _store_fingerprint_when_written(self, write_futures: List, object_usd_path: Path, save_dir: Path, render_settings: dict) -> None:
+        """
+        Fingerprint the object on the writer pool once its views are written, off the render thread.
+        """
+        object_name = object_usd_path.stem
+
+        def _store(_):
+            try:
+                fingerprint = compute_fingerprint(object_usd_path, previous=load_fingerprint(save_dir, object_name))
+            except Exception as e:
+                print(f"[RenderManager] Cannot fingerprint {object_usd_path}: {e}")
+                return
+            save_fingerprint(save_dir, object_name, fingerprint, render_settings)
+
+        self.image_writer.when_all_done(write_futures, _store, offload=True)
+
+    def _render_thumbnail_wo_bg_tiled(
+        self,
+        pending: List[Tuple[Path, Path]],
+        cameras: List,
+        tile_size: int,
+        show_bbox2d: bool,
+        sample_number: int,
+        init_azimuth_angle: float,
+        naming_style: str,
+        manifest: Optional[RenderManifest],
+        render_settings: Optional[dict] = None,
+    ) -> List:
+        """
+        Render `tile_size` objects per settle cycle, each with its own `sample_number` cameras.
+
+        Objects are loaded at the origin, then all but the first are moved to grid offsets far
+        enough apart that no object enters another object's view frustum. Each object gets its own semantic
+        label so its bbox2d row can be selected from the shared annotator output.
+
+        Returns:
+            List of write futures of all rendered objects.
+        """
+        pending_usd_paths = [object_usd_path for object_usd_path, _ in pending]
+        # The whole next tile is prefetched while the current one is still being acquired
+        self.prefetcher.max_cached = max(self.prefetcher.max_cached, 2 * tile_size)
+
+        elevation = 35  # Fixed elevation angle (high angle shot)
+        view_angles = [(init_azimuth_angle + i * 360 / sample_number, elevation) for i in range(sample_number)]
+        all_write_futures = []
+        for idx_tile, tile in enumerate(tqdm(split_into_tiles(pending, tile_size), desc=f"Rendering object tiles ({tile_size} per tile)")):
+            show_prim_paths = []
+            bboxes = []
+            # Prefetch the objects of the next tile while this one renders
+            for next_usd_path in pending_usd_paths[(idx_tile + 1) * tile_size:(idx_tile + 2) * tile_size]:
+                self.prefetcher.prefetch(next_usd_path)
+            timing = self.timer.begin_object(f"tile:{tile[0][0]}+{len(tile) - 1}", members=[object_usd_path for object_usd_path, _ in tile])
+            for slot, (object_usd_path, _) in enumerate(tile):
+                print(f"Rendering: {object_usd_path}")
+                show_prim_path = f"/World/Show_{slot}"
+                with self.timer.phase("prim_creation"):
+                    self.prefetcher.acquire(object_usd_path)
+                    usd_prim = self.backend.create_prim(show_prim_path, str(object_usd_path), position=(0, 0, 0), scale=(1, 1, 1))
+                with self.timer.phase("shadow_semantics"):
+                    set_prim_cast_shadow_true(usd_prim)
+                    self.backend.add_semantics(usd_prim, f"instance_{slot}")
+                with self.timer.phase("compute_bbox"):
+                    bboxes.append(compute_bbox(usd_prim))
+                show_prim_paths.append(show_prim_path)
+
+            with self.timer.phase("camera_placement"):
+                layout = compute_tile_layout(
+                    bboxes, view_angles,
+                    focal_length=THUMBNAIL_WO_BG_CAMERA["focal_length"],
+                    horizontal_aperture=CAMERA_HORIZONTAL_APERTURE,
+                    aspect_ratio=THUMBNAIL_WO_BG_CAMERA["image_height"] / THUMBNAIL_WO_BG_CAMERA["image_width"],
+                )
+                for slot, show_prim_path in enumerate(show_prim_paths):
+                    self.backend.set_prim_position(show_prim_path, layout.offsets[slot])
+                    for i, (azimuth, view_elevation) in enumerate(view_angles):
+                        camera = cameras[slot * sample_number + i]
+                        self.backend.set_camera_look_at(camera, layout.centers[slot], azimuth=azimuth, elevation=view_elevation, distance=layout.distances[slot])
+                # A partial last tile leaves the cameras of its empty slots unused
+                for camera in cameras[len(tile) * sample_number:]:
+                    self.backend.set_camera_active(camera, False)
+
+            tile_cameras = cameras[:len(tile) * sample_number]
+            settle_result = self.settle(tile_cameras, f"tile of {len(tile)}")
+            write_futures = []
+            for slot, (object_usd_path, save_dir) in enumerate(tile):
+                write_futures += self._write_thumbnail_views(
+                    object_usd_path, save_dir, tile_cameras[slot * sample_number:(slot + 1) * sample_number],
+                    init_azimuth_angle, naming_style, show_bbox2d, manifest, settle_result,
+                    semantic_label=f"instance_{slot}", timing=timing, render_settings=render_settings,
+                )
+            for camera in cameras[len(tile) * sample_number:]:
+                self.backend.set_camera_active(camera, True)
+            for show_prim_path in show_prim_paths:
+                self.backend.delete_prim(show_prim_path)
+            self._finish_timing(timing, write_futures)
+            all_write_futures += write_futures
+
+        return all_write_futures
+
+    def render_thumbnail_with_bg(
+        self,
+        scene_usd_path,
+        object_usd_dir,
+        thumbnail_with_bg_dir,
+        show_bbox2d=True,
+        manifest: Optional[RenderManifest] = None,
+        annotators: Optional[Iterable[str]] = None,
+        label_all_instances: bool = False,
+        cluster_instances: bool = False,
+        max_cluster_size: int = 6,
+        visibility_precheck: bool = False,
+        scene_cache_dir: Optional[Union[str, Path]] = None,
+    ):
         """
         Render thumbnails for objects within a scene background.
 
+        The scene is loaded as a payload under /World/scene (self.scenes), replacing the
+        previous one, and unloaded once its instances are rendered.
+
         Args:
             scene_usd_path: Path to the scene USD file.
             object_usd_dir: Directory containing object models (expected structure: object_usd_dir/models/).
             thumbnail_with_bg_dir: Directory to save the rendered thumbnails.
             show_bbox2d: Whether to draw 2D bounding boxes on the output images.
+            manifest: Render manifest used for skip decisions and recording completed instances.
+                      If None, each instance output directory is listed instead.
+            annotators: Annotator spec attached to the cameras. Defaults to the minimum the
+                        pipeline reads: {"rgb"}, plus tight and loose bbox2d if show_bbox2d.
+            label_all_instances: Label every instance once when the scene loads and pick the
+                                 target's bbox2d rows by its label in idToLabels, instead of
+                                 adding and removing the target's label around each instance.
+            cluster_instances: Render spatially clustered instances from shared frames and crop
+                               each member's thumbnails out of them (implies label_all_instances).
+                               Members without any valid view fall back to dedicated views.
+            max_cluster_size: Maximum instances per cluster.
+            visibility_precheck: Predict every view's bbox2d outcome on the CPU (OcclusionScene)
+                                 before posing the cameras. Views predicted to fail move to an
+                                 alternative azimuth or are not rendered; instances without any
+                                 passing view are skipped.
+            scene_cache_dir: Render-ready scene cache (see core.preprocess). The cached copy is
+                             loaded instead of the source, and built first on a miss; fix_mdls
+                             no longer runs on the source.
+
+        Returns:
+            Optional[List[str]]: Manifest keys of the instances rendered by this call, or None if
+                                 the scene could not be rendered.
         """
         # Auto exposure
-        omni.kit.commands.execute('ChangeSetting', path='/rtx/post/histogram/enabled', value=True)
-        omni.kit.commands.execute('ChangeSetting', path='/rtx/post/histogram/whiteScale', value=10.0)
+        self.backend.enable_auto_exposure()
         
         # World settings
         if not self.world:
-            self.world = init_world()
+            self.world = self.backend.init_world(static_scene=self.static_scene)
             
-        fix_mdls(str(scene_usd_path), str(DEFAULT_MDL_PATH))
-        add_reference_to_stage(str(scene_usd_path), "/World/scene")
-        stage = omni.usd.get_context().get_stage()
-        switch_all_lights(stage, 'on')
+        object_models_dir = object_usd_dir / "models"
+        if not os.path.exists(object_models_dir):
+             print(f"[RenderManager] Models dir not found: {object_models_dir}")
+             return None
+
+        self.scenes.load(self._render_ready_scene(scene_usd_path, scene_cache_dir))
+        self.bbox_cache.clear()
+        stage = self.backend.get_stage()
         
         # Camera settings
         sample_number = 3 + 3
-        cameras = []
-        for i in range(sample_number):
-            camera = init_camera(f"camera_{i}", image_width=600, image_height=450)
-            setup_camera(camera, with_bbox2d=show_bbox2d, focal_length=9.0)
-            cameras.append(camera)
+        label_all_instances = label_all_instances or cluster_instances
+        required_annotators = {"rgb", "bbox2d_tight", "bbox2d_loose"} if show_bbox2d or cluster_instances else {"rgb"}
+        annotators = validate_annotators(annotators if annotators is not None else required_annotators, required=required_annotators)
+        cameras = self.camera_pool.acquire(sample_number, annotators=annotators, **THUMBNAIL_WITH_BG_CAMERA)
             
         instance_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Instances")
-        object_models_dir = object_usd_dir / "models"
-        
-        if not os.path.exists(object_models_dir):
-             print(f"[RenderManager] Models dir not found: {object_models_dir}")
-             return
-
         extracted_object_names = natsorted(os.listdir(object_models_dir))
-        
-        for index, mesh_prim in enumerate(tqdm(instance_mesh_prims, desc="Rendering scene instances")):
+
+        pending_instances = []
+        for index, mesh_prim in enumerate(instance_mesh_prims):
             mesh_prim_name = mesh_prim.GetName()
             if mesh_prim_name not in extracted_object_names:
                 print(f"[RenderManager: Render Thumbnail With Background] {mesh_prim_name} is not extracted, skip.")
                 continue
-                
             mesh_dir = thumbnail_with_bg_dir / mesh_prim.GetName()
-            if os.path.exists(mesh_dir) and len(os.listdir(mesh_dir)) > 0:
+            manifest_key = scene_instance_key(scene_usd_path, mesh_prim_name)
+            if is_scene_instance_rendered(mesh_dir, manifest_key, manifest):
                 continue
-                
-            set_prim_cast_shadow_true(mesh_prim)
-            add_update_semantics(mesh_prim, semantic_label=f"instance_{index}", type_label="class")
-            bbox_min, bbox_max = compute_bbox(mesh_prim)
+            pending_instances.append((index, mesh_prim, mesh_dir, manifest_key))
+
+        # Lights and the shadows of all pending instances in one change block
+        start_time = time.perf_counter()
+        edit_counts = StageEditBatch(stage).switch_lights("on").cast_shadows(mesh_prim for _, mesh_prim, _, _ in pending_instances).apply()
+        shadow_seconds = (time.perf_counter() - start_time) / max(len(pending_instances), 1)
+        print(f"[RenderManager: Render Thumbnail With Background] Switched on {edit_counts['visibility']} lights, "
+              f"enabled {edit_counts['shadows']} shadow casters in one change block.")
+
+        if label_all_instances and pending_instances:
+            # Labels stay fixed for the whole scene, so the annotators see no semantic change per instance
+            start_time = time.perf_counter()
+            self.backend.add_semantics_batch((mesh_prim, f"instance_{index}") for index, mesh_prim in enumerate(instance_mesh_prims))
+            shadow_seconds += (time.perf_counter() - start_time) / max(len(pending_instances), 1)
+
+        # Bounds of all pending instances in one pass over the shared cache. Semantics
+        # edits below do not move geometry, so the bounds stay valid.
+        start_time = time.perf_counter()
+        instance_bboxes = self.bbox_cache.compute_many([mesh_prim for _, mesh_prim, _, _ in pending_instances])
+        bbox_seconds = (time.perf_counter() - start_time) / max(len(pending_instances), 1)
+
+        occluders = None
+        if visibility_precheck and pending_instances:
+            # Every instance and structure mesh occludes; targets are indexed as in instance_mesh_prims
+            start_time = time.perf_counter()
+            structure_scopes = [scope for key, scope in SCENE_COPY_SCOPES.items() if key != "instances"]
+            occluder_prims = list(instance_mesh_prims)
+            for scope_prims in get_scope_mesh_prims(stage, structure_scopes).values():
+                occluder_prims += scope_prims
+            occluders = OcclusionScene(occluder_prims, self.bbox_cache.compute_many(occluder_prims))
+            bbox_seconds += (time.perf_counter() - start_time) / len(pending_instances)
+
+        dedicated = list(range(len(pending_instances)))
+        if cluster_instances and len(pending_instances) > 1:
+            dedicated = self._render_instance_clusters(
+                pending_instances, instance_bboxes, cameras, show_bbox2d, manifest, max_cluster_size,
+            )
+
+        for position in tqdm(dedicated, desc="Rendering scene instances"):
+            index, mesh_prim, mesh_dir, manifest_key = pending_instances[position]
+            bbox_min, bbox_max = instance_bboxes[position]
+            mesh_prim_name = mesh_prim.GetName()
+            timing = self.timer.begin_object(manifest_key)
+            if timing is not None:
+                # Amortised shares of the batched edits and bounds
+                timing.add("shadow_semantics", shadow_seconds)
+                timing.add("compute_bbox", bbox_seconds)
+            semantic_label = f"instance_{index}"
+            if not label_all_instances:
+                with self.timer.phase("shadow_semantics"):
+                    self.backend.add_semantics(mesh_prim, semantic_label)
             center = (bbox_min + bbox_max) / 2
             distance = np.linalg.norm(bbox_max - bbox_min) * 1.0
-            
-            for i in range(sample_number):
-                azimuth = 30 + i * 360 / (sample_number / 2)
-                elevation = 35 if i < sample_number / 2 else -35
-                set_camera_look_at(cameras[i], center, azimuth=azimuth, elevation=elevation, distance=distance)
-                
-            for _ in range(100): 
-                 self.world.step(render=False)
-            for _ in range(8):
-                 self.world.step(render=True)
+            view_angles = [(30 + i * 360 / (sample_number / 2), 35 if i < sample_number / 2 else -35) for i in range(sample_number)]
+            views = list(range(sample_number))
+
+            if occluders is not None:
+                with self.timer.phase("visibility_precheck"):
+                    view_plan = occluders.plan_views(
+                        index, center, distance, view_angles,
+                        frame_size=(THUMBNAIL_WITH_BG_CAMERA["image_width"], THUMBNAIL_WITH_BG_CAMERA["image_height"]),
+                        focal_length=THUMBNAIL_WITH_BG_CAMERA["focal_length"],
+                        horizontal_aperture=CAMERA_HORIZONTAL_APERTURE,
+                    )
+                # Same rule as below: an undetected top view discards the bottom views
+                top_views_detected = all(estimate.detected for estimate in view_plan[:sample_number // 2])
+                views = [idx for idx, estimate in enumerate(view_plan)
+                         if estimate.passes() and (top_views_detected or idx < sample_number / 2)]
+                view_angles = [(estimate.azimuth, estimate.elevation) for estimate in view_plan]
+                if len(views) < sample_number:
+                    print(f"[RenderManager: Visibility Precheck] {mesh_prim_name}: rendering views {views} of {sample_number}.")
+                if not views:
+                    if not label_all_instances:
+                        self.backend.remove_semantics(mesh_prim)
+                    self._record_when_written([], manifest, manifest_key, views=[], save_dir=str(mesh_dir))
+                    self._finish_timing(timing, [])
+                    continue
+
+            with self.timer.phase("camera_placement"):
+                for i in views:
+                    azimuth, elevation = view_angles[i]
+                    self.backend.set_camera_look_at(cameras[i], center, azimuth=azimuth, elevation=elevation, distance=distance)
+                for i in range(sample_number):
+                    if i not in views:
+                        self.backend.set_camera_active(cameras[i], False)
+
+            settle_result = self.settle([cameras[i] for i in views], mesh_prim_name)
                  
             os.makedirs(mesh_dir, exist_ok=True)
             all_top_views_valid = True
+            write_futures = []
+            saved_views = []
             
-            for idx, camera in enumerate(cameras):
-                rgb = get_src(camera, "rgb")
+            for idx in views:
+                camera = cameras[idx]
+                with self.timer.phase("readback"):
+                    rgb = self.backend.get_src(camera, "rgb")
+                    if show_bbox2d:
+                        bbox2d_tight, tight_id_to_labels = self.backend.get_src(camera, "bbox2d_tight")
+                        bbox2d_loose, loose_id_to_labels = self.backend.get_src(camera, "bbox2d_loose")
                 need_save = True
+                bbox2d_overlay = None
                 
                 if show_bbox2d:
-                    bbox2d_tight = get_src(camera, "bbox2d_tight")[0]
-                    bbox2d_loose = get_src(camera, "bbox2d_loose")[0]
-                    
-                    is_detected = len(bbox2d_tight) > 0 and len(bbox2d_loose) > 0
+                    if label_all_instances:
+                        bbox2d_tight_data = select_bbox_row(bbox2d_tight, tight_id_to_labels, semantic_label)
+                        bbox2d_loose_data = select_bbox_row(bbox2d_loose, loose_id_to_labels, semantic_label)
+                    else:
+                        bbox2d_tight_data = bbox2d_tight[0] if len(bbox2d_tight) > 0 else None  # get the first row data
+                        bbox2d_loose_data = bbox2d_loose[0] if len(bbox2d_loose) > 0 else None  # get the first row data
+                    is_detected = bbox2d_tight_data is not None and bbox2d_loose_data is not None
                     if is_detected:
-                        bbox2d_tight_data = bbox2d_tight[0]  # get the first row data
-                        bbox2d_loose_data = bbox2d_loose[0]  # get the first row data
                         area_ratio = self.compute_2d_bbox_area_ratio(bbox2d_tight_data, bbox2d_loose_data)
                         if area_ratio >= 0.8:
-                            rgb = draw_bbox2d(rgb, bbox2d_tight_data)
+                            bbox2d_overlay = tuple(bbox2d_tight_data)
                         else:
                             need_save = False
                     else:
@@ -277,6 +693,143 @@ class RenderManager:
                         need_save = False
                         
                 if need_save:
-                    cv2.imwrite(f"{mesh_dir}/{mesh_prim.GetName()}_with_bg_{idx}.png", cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB))
+                    output_path = f"{mesh_dir}/{mesh_prim.GetName()}_with_bg_{idx}.png"
+                    with self.timer.phase("write_submit"):
+                        write_futures.append(self.image_writer.submit(rgb, output_path, bbox2d=bbox2d_overlay, timing=timing))
+                    saved_views.append(idx)
                     
-            remove_all_semantics(mesh_prim)
+            for i in range(sample_number):
+                if i not in views:
+                    self.backend.set_camera_active(cameras[i], True)
+            if not label_all_instances:
+                self.backend.remove_semantics(mesh_prim)
+            self._record_when_written(write_futures, manifest, manifest_key, views=saved_views, save_dir=str(mesh_dir), settle=settle_result.to_dict())
+            self._finish_timing(timing, write_futures)
+
+        if label_all_instances:
+            for mesh_prim in instance_mesh_prims:
+                self.backend.remove_semantics(mesh_prim)
+        self.write_errors += self.image_writer.flush()
+        self.scenes.unload()
+        self.bbox_cache.clear()
+        return [manifest_key for _, _, _, manifest_key in pending_instances]
+
+    def _render_ready_scene(self, scene_usd_path, scene_cache_dir: Optional[Union[str, Path]]) -> str:
+        """
+        Path of the scene to load: its preprocessed copy if a cache is given (built now on a
+        miss), else the source after fix_mdls.
+        """
+        if scene_cache_dir is not None:
+            cached_path = cached_scene_path(scene_cache_dir, scene_usd_path, DEFAULT_MDL_PATH)
+            if cached_path is None:
+                print(f"[RenderManager] {scene_usd_path} is not in the scene cache, preprocessing it now.")
+                report = preprocess_scene(scene_usd_path, scene_cache_dir, DEFAULT_MDL_PATH)
+                cached_path = report["cache_path"] if report["status"] != "error" else None
+                if cached_path is None:
+                    print(f"[RenderManager] Preprocessing failed ({report.get('error')}), using the source scene.")
+            if cached_path is not None:
+                return str(cached_path)
+        fix_mdls(str(scene_usd_path), str(DEFAULT_MDL_PATH))
+        return str(scene_usd_path)
+
+    def _render_instance_clusters(
+        self,
+        pending_instances: List[tuple],
+        instance_bboxes: np.ndarray,
+        cameras: List,
+        show_bbox2d: bool,
+        manifest: Optional[RenderManifest],
+        max_cluster_size: int,
+        min_crop_scale: float = 0.5,
+    ) -> List[int]:
+        """
+        Render clusters of co-visible instances from shared frames. All instances must be labelled.
+
+        Every cluster gets the six usual views around its union bound. Each member's bbox2d
+        rows are selected by label and filtered by the same rules as dedicated views (detected,
+        tight/loose area ratio >= 0.8, top views decide the bottom ones); the thumbnail is a crop
+        around the loose bbox covering member / union diagonal of the frame (the framing of a
+        dedicated view), resized to the frame size. Clusters are limited to a union / member
+        diagonal ratio of 1 / min_crop_scale, so crops need at most that much upscaling.
+
+        Returns:
+            Positions in pending_instances still to render with dedicated views: singletons and
+            members that did not get a valid crop from every view.
+        """
+        sample_number = len(cameras)
+        clusters = cluster_instances(instance_bboxes, max_cluster_size=max_cluster_size, max_extent_ratio=1 / min_crop_scale)
+        diagonals = np.linalg.norm(instance_bboxes[:, 1] - instance_bboxes[:, 0], axis=1)
+        dedicated = [members[0] for members in clusters if len(members) == 1]
+        shared = [members for members in clusters if len(members) > 1]
+        print(f"[RenderManager: Cluster] {sum(len(members) for members in shared)} instances in {len(shared)} clusters, "
+              f"{len(dedicated)} rendered alone.")
+
+        for members in tqdm(shared, desc="Rendering instance clusters"):
+            keys = [pending_instances[position][3] for position in members]
+            timing = self.timer.begin_object(f"{keys[0]}+{len(keys) - 1}", members=keys)
+            bbox_min, bbox_max = cluster_bounds(instance_bboxes, members)
+            center = (bbox_min + bbox_max) / 2
+            distance = np.linalg.norm(bbox_max - bbox_min) * 1.0
+            framing = {position: diagonals[position] / max(distance, 1e-9) for position in members}
+            with self.timer.phase("camera_placement"):
+                for i in range(sample_number):
+                    azimuth = 30 + i * 360 / (sample_number / 2)
+                    elevation = 35 if i < sample_number / 2 else -35
+                    self.backend.set_camera_look_at(cameras[i], center, azimuth=azimuth, elevation=elevation, distance=distance)
+            settle_result = self.settle(cameras, f"cluster of {len(members)}")
+
+            frames = []
+            with self.timer.phase("readback"):
+                for camera in cameras:
+                    frames.append((
+                        self.backend.get_src(camera, "rgb"),
+                        self.backend.get_src(camera, "bbox2d_tight"),
+                        self.backend.get_src(camera, "bbox2d_loose"),
+                    ))
+
+            cluster_futures = []
+            for position in members:
+                index, mesh_prim, mesh_dir, manifest_key = pending_instances[position]
+                semantic_label = f"instance_{index}"
+                all_top_views_valid = True
+                views = []
+                for idx, (rgb, (bbox2d_tight, tight_id_to_labels), (bbox2d_loose, loose_id_to_labels)) in enumerate(frames):
+                    bbox2d_tight_data = select_bbox_row(bbox2d_tight, tight_id_to_labels, semantic_label)
+                    bbox2d_loose_data = select_bbox_row(bbox2d_loose, loose_id_to_labels, semantic_label)
+                    if bbox2d_tight_data is None or bbox2d_loose_data is None:
+                        if idx < sample_number / 2:
+                            all_top_views_valid = False
+                        continue
+                    if not all_top_views_valid and idx >= sample_number / 2:
+                        continue
+                    if self.compute_2d_bbox_area_ratio(bbox2d_tight_data, bbox2d_loose_data) < 0.8:
+                        continue
+                    frame_size = (rgb.shape[1], rgb.shape[0])
+                    window = crop_window(bbox2d_loose_data, frame_size, frame_size, scale=framing[position])
+                    if (window[2] - window[0]) < min_crop_scale * frame_size[0]:
+                        continue
+                    views.append((idx, rgb, window, bbox2d_tight_data, frame_size))
+
+                if len(views) < sample_number:
+                    # A dedicated render may recover the views lost in the shared frames
+                    dedicated.append(position)
+                    continue
+                os.makedirs(mesh_dir, exist_ok=True)
+                write_futures = []
+                for idx, rgb, window, bbox2d_tight_data, frame_size in views:
+                    crop, bbox2d_overlay = crop_view(rgb, window, frame_size, bbox2d_tight_data)
+                    output_path = f"{mesh_dir}/{mesh_prim.GetName()}_with_bg_{idx}.png"
+                    with self.timer.phase("write_submit"):
+                        write_futures.append(self.image_writer.submit(
+                            crop, output_path, bbox2d=bbox2d_overlay if show_bbox2d else None, timing=timing,
+                        ))
+                self._record_when_written(
+                    write_futures, manifest, manifest_key, views=[idx for idx, *_ in views], save_dir=str(mesh_dir),
+                    settle=settle_result.to_dict(),
+                )
+                cluster_futures += write_futures
+            self._finish_timing(timing, cluster_futures)
+
+        if dedicated:
+            print(f"[RenderManager: Cluster] {len(dedicated)} instances need dedicated views.")
+        return sorted(dedicated)
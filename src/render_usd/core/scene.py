@@ -1,12 +1,13 @@
 import omni
 import os
+import carb
 from pxr import Usd, UsdLux
 from omni.isaac.core import World
-from omni.isaac.core.utils.semantics import add_update_semantics
 from omni.isaac.core.utils.stage import add_reference_to_stage
 from typing import Dict, Optional
 
-from render_usd.utils.usd_utils.stage_utils import get_all_mesh_prims, get_all_mesh_prims_from_scope
+from render_usd.utils.usd_utils.edit_utils import StageEditBatch
+from render_usd.utils.usd_utils.stage_utils import SCENE_COPY_SCOPES, get_all_mesh_prims, get_scope_mesh_prims
 from render_usd.config.settings import DEFAULT_ENVIRONMENT_PATH
 
 #==============================================================================
@@ -17,7 +18,23 @@ def init_world(
     stage_units_in_meters: float = 1.0,
     physics_dt: float = 0.01,
     rendering_dt: float = 0.01,
+    static_scene: bool = False,
 ) -> World:
+    """
+    Create and reset the Isaac Sim World.
+
+    Args:
+        stage_units_in_meters: Stage units.
+        physics_dt: Physics time step.
+        rendering_dt: Rendering time step.
+        static_scene: Disable physics simulation. Nothing moves in thumbnail scenes,
+                      so frames only need to advance through render ticks (see RenderTick).
+
+    Returns:
+        World: The initialized world.
+    """
+    if static_scene:
+        disable_physics_simulation()
     world = World(
         stage_units_in_meters=stage_units_in_meters,
         physics_dt=physics_dt,
@@ -26,6 +43,28 @@ def init_world(
     world.reset()
     return world
 
+def disable_physics_simulation() -> None:
+    """
+    Stop PhysX from being stepped when the timeline plays ("Play Simulations" off).
+    """
+    carb.settings.get_settings().set_bool("/app/player/playSimulations", False)
+    print("[Scene] Static scene mode: physics simulation disabled.")
+
+class RenderTick:
+    """
+    World stand-in for static scenes.
+
+    Exposes the same ``step(render=...)`` interface as World, but a rendered step is
+    a render-only app update and a physics-only step is a no-op, so no CPU physics
+    cost is paid per object.
+    """
+    def __init__(self, world: World):
+        self.world = world
+
+    def step(self, render: bool = True) -> None:
+        if render:
+            self.world.render()
+
 def setup_environment(env_path: Optional[str] = None):
     """
     Load environment file or create a default Dome Light if file not found.
@@ -45,43 +84,55 @@ def setup_environment(env_path: Optional[str] = None):
 
 def setup_instance_scene(stage: Usd.Stage) -> None:
     object_mesh_prims = get_all_mesh_prims(stage, world_node_path="/World/scene")
+    batch = StageEditBatch(stage)
     for idx, prim in enumerate(object_mesh_prims):
-        add_update_semantics(prim, semantic_label=f"instance_{idx}", type_label="class")
-        print(f"[Scene: Setup Instance] Prim {prim.GetName()} is setted with semantic label 'instance_{idx}'.")
+        batch.add_semantics(prim, semantic_label=f"instance_{idx}", type_label="class")
+    edit_counts = batch.apply()
+    print(f"[Scene: Setup Instance] {edit_counts['semantics']} prims are setted with semantic labels 'instance_<idx>'.")
     
 def setup_instance_copy_scene(stage: Usd.Stage) -> None:
-    object_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Instances")
-    structure_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Structure")
+    scope_mesh_prims = get_scope_mesh_prims(stage, ["scene/Instances", "scene/Structure"])
+    object_mesh_prims = scope_mesh_prims["scene/Instances"]
+    structure_mesh_prims = scope_mesh_prims["scene/Structure"]
     all_mesh_prims = object_mesh_prims + structure_mesh_prims
+    batch = StageEditBatch(stage)
     for idx, prim in enumerate(all_mesh_prims):
-        add_update_semantics(prim, semantic_label=f"instance_{idx}", type_label="class")
-        print(f"[Scene: Setup Instance Copy] Prim {prim.GetName()} is setted with semantic label 'instance_{idx}'.")
+        batch.add_semantics(prim, semantic_label=f"instance_{idx}", type_label="class")
+    edit_counts = batch.apply()
+    print(f"[Scene: Setup Instance Copy] {edit_counts['semantics']} prims are setted with semantic labels 'instance_<idx>'.")
 
 def setup_semantic_object_copy_scene(stage: Usd.Stage, category_annotation: Dict[str, str]) -> None:
-    object_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Instances")
+    object_mesh_prims = get_scope_mesh_prims(stage, ["scene/Instances"])["scene/Instances"]
+    batch = StageEditBatch(stage)
     for prim in object_mesh_prims:
         prim_name = prim.GetName()
         semantic_label = category_annotation[prim_name]
-        add_update_semantics(prim, semantic_label=semantic_label, type_label="class")
-        print(f"[Scene: Setup Semantic] Prim {prim.GetName()} is setted with semantic label '{semantic_label}'.")
+        batch.add_semantics(prim, semantic_label=semantic_label, type_label="class")
+    edit_counts = batch.apply()
+    print(f"[Scene: Setup Semantic] {edit_counts['semantics']} prims are setted with category semantic labels.")
 
 def setup_semantic_scene_copy(stage: Usd.Stage, object_annotation: Dict[str, str]) -> None:
-    object_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Instances")
-    wall_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Structure/Wall")
-    floor_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Structure/Floor")
-    ceiling_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Structure/Ceiling")
-    background_mesh_prims = get_all_mesh_prims_from_scope(stage, scope_name="scene/Structure/BgWall")
+    # All five scopes are classified in one traversal
+    scope_mesh_prims = get_scope_mesh_prims(stage, list(SCENE_COPY_SCOPES.values()))
+    object_mesh_prims = scope_mesh_prims[SCENE_COPY_SCOPES["instances"]]
+    wall_mesh_prims = scope_mesh_prims[SCENE_COPY_SCOPES["wall"]]
+    floor_mesh_prims = scope_mesh_prims[SCENE_COPY_SCOPES["floor"]]
+    ceiling_mesh_prims = scope_mesh_prims[SCENE_COPY_SCOPES["ceiling"]]
+    background_mesh_prims = scope_mesh_prims[SCENE_COPY_SCOPES["background"]]
     
+    batch = StageEditBatch(stage)
     for prim in object_mesh_prims:
         prim_name = prim.GetName()
         semantic_label = object_annotation[prim_name]
-        add_update_semantics(prim, semantic_label=semantic_label, type_label="class")
+        batch.add_semantics(prim, semantic_label=semantic_label, type_label="class")
         
     for wall_prim in wall_mesh_prims:
-        add_update_semantics(wall_prim, semantic_label="wall", type_label="class")
+        batch.add_semantics(wall_prim, semantic_label="wall", type_label="class")
     for floor_prim in floor_mesh_prims:
-        add_update_semantics(floor_prim, semantic_label="floor", type_label="class")
+        batch.add_semantics(floor_prim, semantic_label="floor", type_label="class")
     for ceiling_prim in ceiling_mesh_prims:
-        add_update_semantics(ceiling_prim, semantic_label="ceiling", type_label="class")
+        batch.add_semantics(ceiling_prim, semantic_label="ceiling", type_label="class")
     for background_prim in background_mesh_prims:
-        add_update_semantics(background_prim, semantic_label="background", type_label="class")
+        batch.add_semantics(background_prim, semantic_label="background", type_label="class")
+    edit_counts = batch.apply()
+    print(f"[Scene: Setup Semantic Copy] {edit_counts['semantics']} prims are setted with semantic labels.")
@@ -0,0 +1,115 @@
+import gc
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+#==============================================================================
+#                             SCENE LIFECYCLE
+#==============================================================================
+# A multi-scene run renders every scene on the same stage. Each scene is loaded
+# as a payload under one prim path and removed again once its instances are
+# rendered, so the stage only ever composes one scene and its layers can be
+# released. The environment and the pooled cameras stay on the stage.
+#
+# Caches outside the stage (textures, MDL shaders, renderer resources) still
+# grow with every new scene. The process RSS is therefore checked between
+# scenes: above a ceiling, the renderer process is replaced by a fresh one
+# (os.execv of the same command), which resumes from the manifest or the
+# output directories. Only the current RSS counts; where it cannot be read the
+# check is skipped, since the peak RSS never goes down after a restart point.
+
+SCENE_PRIM_PATH = "/World/scene"
+RESTART_COUNT_ENV = "RENDER_USD_RESTARTS"
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process, or None where /proc is missing.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _format_rss() -> str:
+    rss = process_rss_bytes()
+    return f"{rss / 2**30:.2f} GiB" if rss is not None else "unknown"
+
+
+class SceneLifecycle:
+    """
+    Keeps at most one scene loaded on the backend's stage.
+
+    Example:
+        scene_prim = scenes.load(scene_usd_path)
+        ...  # render its instances
+        scenes.unload()
+        if scenes.memory_exceeded(max_rss_bytes):
+            restart_process()
+    """
+    def __init__(self, backend, prim_path: str = SCENE_PRIM_PATH):
+        self.backend = backend
+        self.prim_path = prim_path
+        self.loaded_path: Optional[str] = None
+        self.loads = 0
+        self._rss_unavailable_reported = False
+
+    def load(self, scene_usd_path: Union[str, Path]):
+        """
+        Load a scene as a payload under prim_path, unloading the previous one first.
+        Loading the scene that is already loaded returns its prim.
+        """
+        scene_usd_path = str(scene_usd_path)
+        if self.loaded_path == scene_usd_path:
+            return self.backend.get_stage().GetPrimAtPath(self.prim_path)
+        self.unload()
+        prim = self.backend.add_payload(scene_usd_path, self.prim_path)
+        self.loaded_path = scene_usd_path
+        self.loads += 1
+        return prim
+
+    def unload(self) -> None:
+        """
+        Unload the payload and remove the scene prim, so its layers can be released.
+        """
+        if self.loaded_path is None:
+            return
+        start_time = time.perf_counter()
+        self.backend.unload_payload(self.prim_path)
+        self.backend.delete_prim(self.prim_path)
+        self.loaded_path = None
+        gc.collect()
+        print(f"[SceneLifecycle] Unloaded scene ({time.perf_counter() - start_time:.2f}s), RSS {_format_rss()}.")
+
+    def memory_exceeded(self, max_rss_bytes: Optional[int]) -> bool:
+        """
+        Whether the current process RSS is above max_rss_bytes. Never if max_rss_bytes is None
+        or the current RSS cannot be read.
+        """
+        if max_rss_bytes is None:
+            return False
+        rss = process_rss_bytes()
+        if rss is None:
+            if not self._rss_unavailable_reported:
+                print("[SceneLifecycle] Current RSS is not available on this platform, skipping the memory check.")
+                self._rss_unavailable_reported = True
+            return False
+        return rss > max_rss_bytes
+
+
+def restart_process(argv: Optional[list] = None) -> None:
+    """
+    Replace the current process with a fresh run of the CLI (same arguments and environment).
+    Pending writes must be flushed, queue leases released and Kit closed first. Does not return.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    restarts = int(os.environ.get(RESTART_COUNT_ENV, "0")) + 1
+    os.environ[RESTART_COUNT_ENV] = str(restarts)
+    print(f"[SceneLifecycle] Restarting the renderer process (restart {restarts}, RSS {_format_rss()}).")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execv(sys.executable, [sys.executable, "-m", "render_usd.cli"] + list(argv))
@@ -0,0 +1,141 @@
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import Callable, List, Optional, Sequence
+
+#==============================================================================
+#                             SETTLE STRATEGY
+#==============================================================================
+
+@dataclass
+class SettleResult:
+    """
+    Steps actually spent settling one object before readback.
+    """
+    physics_steps: int
+    render_steps: int
+    converged: bool
+    last_delta: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def frame_delta(previous: Sequence[Optional[np.ndarray]], current: Sequence[Optional[np.ndarray]]) -> float:
+    """
+    Compute the largest mean absolute difference between two sets of frames.
+
+    Args:
+        previous: Frames of every camera from the previous render step.
+        current: Frames of every camera from the current render step.
+
+    Returns:
+        float: Max over cameras of the mean absolute pixel difference, normalised to [0, 1].
+               Infinity if any frame is missing or the shapes differ.
+    """
+    delta = 0.0
+    for prev_frame, cur_frame in zip(previous, current):
+        if prev_frame is None or cur_frame is None or prev_frame.shape != cur_frame.shape:
+            return float("inf")
+        diff = np.abs(cur_frame.astype(np.float32) - prev_frame.astype(np.float32)).mean()
+        scale = 255.0 if np.issubdtype(cur_frame.dtype, np.integer) else 1.0
+        delta = max(delta, float(diff) / scale)
+    return delta
+
+
+class SettleStrategy:
+    """
+    Decides how many physics and render steps are run before the cameras are read.
+
+    ``fixed`` runs a constant number of steps (the historical 100 physics + 8 render
+    steps). ``adaptive`` renders until consecutive RGB frames of every camera differ
+    by less than ``threshold``, bounded by ``min_render_steps`` and ``max_render_steps``.
+    The strategy only talks to ``world.step`` and a frame getter, so it can be
+    exercised with a fake world and fake cameras.
+    """
+    MODES = ("fixed", "adaptive")
+
+    def __init__(
+        self,
+        mode: str = "fixed",
+        physics_steps: int = 100,
+        render_steps: int = 8,
+        min_render_steps: int = 2,
+        max_render_steps: int = 16,
+        threshold: float = 0.002,
+    ):
+        """
+        Initialize the strategy.
+
+        Args:
+            mode: "fixed" or "adaptive".
+            physics_steps: Physics-only steps run before rendering.
+            render_steps: Rendered steps in fixed mode.
+            min_render_steps: Minimum rendered steps in adaptive mode.
+            max_render_steps: Maximum rendered steps in adaptive mode.
+            threshold: Adaptive convergence threshold on the normalised frame difference.
+        """
+        assert mode in self.MODES, f"Invalid settle mode {mode}, should be one of {self.MODES}"
+        assert 1 <= min_render_steps <= max_render_steps, "Require 1 <= min_render_steps <= max_render_steps"
+        self.mode = mode
+        self.physics_steps = physics_steps
+        self.render_steps = render_steps
+        self.min_render_steps = min_render_steps
+        self.max_render_steps = max_render_steps
+        self.threshold = threshold
+
+    @classmethod
+    def fixed(cls, physics_steps: int = 100, render_steps: int = 8) -> "SettleStrategy":
+        return cls("fixed", physics_steps=physics_steps, render_steps=render_steps)
+
+    @classmethod
+    def adaptive(
+        cls,
+        threshold: float = 0.002,
+        min_render_steps: int = 2,
+        max_render_steps: int = 16,
+        physics_steps: int = 0,
+    ) -> "SettleStrategy":
+        return cls(
+            "adaptive",
+            physics_steps=physics_steps,
+            min_render_steps=min_render_steps,
+            max_render_steps=max_render_steps,
+            threshold=threshold,
+        )
+
+    def settle(
+        self,
+        world,
+        cameras: List,
+        get_frame: Callable[[object], Optional[np.ndarray]],
+    ) -> SettleResult:
+        """
+        Step the world until the cameras are ready to be read.
+
+        Args:
+            world: Object exposing step(render=bool).
+            cameras: Cameras whose frames decide convergence in adaptive mode.
+            get_frame: Returns the current RGB frame of a camera, e.g. get_src(camera, "rgb").
+
+        Returns:
+            SettleResult: The steps actually used.
+        """
+        for _ in range(self.physics_steps):
+            world.step(render=False)
+
+        if self.mode == "fixed":
+            for _ in range(self.render_steps):
+                world.step(render=True)
+            return SettleResult(self.physics_steps, self.render_steps, converged=True)
+
+        previous_frames = None
+        delta = None
+        for render_step in range(1, self.max_render_steps + 1):
+            world.step(render=True)
+            frames = [get_frame(camera) for camera in cameras]
+            if previous_frames is not None:
+                delta = frame_delta(previous_frames, frames)
+                if render_step >= self.min_render_steps and delta < self.threshold:
+                    return SettleResult(self.physics_steps, render_step, converged=True, last_delta=delta)
+            previous_frames = frames
+        return SettleResult(self.physics_steps, self.max_render_steps, converged=False, last_delta=delta)
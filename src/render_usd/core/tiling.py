@@ -0,0 +1,175 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+#==============================================================================
+#                          MULTI-OBJECT TILE LAYOUT
+#==============================================================================
+# Pure NumPy helpers for rendering several assets per settle cycle. Assets are
+# placed on a grid far enough apart that no asset falls inside the view frustum
+# of another asset's cameras, so every thumbnail still shows a single object.
+# The first asset stays where it was loaded and the others only move
+# horizontally; position-dependent lighting (local lights, reflections of the
+# environment) still differs for them from an untiled render.
+
+@dataclass
+class TileLayout:
+    """
+    Placement of one batch of assets.
+
+    Attributes:
+        offsets: (K, 3) translation applied to each asset (loaded at the origin).
+                 Zero for the first asset and horizontal for the others.
+        centers: (K, 3) world-space bbox centers after the translation.
+        distances: (K,) camera distance of each asset.
+        spacing: Grid spacing that isolates all views.
+    """
+    offsets: np.ndarray
+    centers: np.ndarray
+    distances: np.ndarray
+    spacing: float
+
+
+def camera_look_at_frame(
+    target: np.ndarray,
+    distance: float,
+    elevation: float,
+    azimuth: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the position and forward direction of a camera placed by set_camera_look_at.
+
+    Returns:
+        Tuple of (camera position, unit forward vector).
+    """
+    elev_rad = math.radians(elevation)
+    azim_rad = math.radians(azimuth)
+    offset = distance * np.array([
+        math.cos(elev_rad) * math.cos(azim_rad),
+        math.cos(elev_rad) * math.sin(azim_rad),
+        math.sin(elev_rad),
+    ])
+    position = np.asarray(target, dtype=np.float64) + offset
+    return position, -offset / max(np.linalg.norm(offset), 1e-12)
+
+
+def sphere_in_frustum(
+    camera_position: np.ndarray,
+    forward: np.ndarray,
+    center: np.ndarray,
+    radius: float,
+    tan_half_fov_h: float,
+    tan_half_fov_v: float,
+) -> bool:
+    """
+    Conservative test whether a bounding sphere intersects a camera frustum (no far plane).
+    """
+    world_up = np.array([0.0, 0.0, 1.0])
+    right = np.cross(forward, world_up)
+    if np.linalg.norm(right) < 1e-9:
+        right = np.array([1.0, 0.0, 0.0])
+    right = right / np.linalg.norm(right)
+    up = np.cross(right, forward)
+
+    rel = np.asarray(center, dtype=np.float64) - camera_position
+    z = float(rel @ forward)
+    if z + radius <= 0:
+        return False
+    x = abs(float(rel @ right))
+    y = abs(float(rel @ up))
+    # Distance of the sphere center to each side plane must exceed the radius to be outside.
+    margin_h = (x - z * tan_half_fov_h) / math.sqrt(1 + tan_half_fov_h ** 2)
+    margin_v = (y - z * tan_half_fov_v) / math.sqrt(1 + tan_half_fov_v ** 2)
+    return margin_h < radius and margin_v < radius
+
+
+def compute_tile_layout(
+    bboxes: Sequence[np.ndarray],
+    view_angles: Sequence[Tuple[float, float]],
+    distance_scale: float = 1.0,
+    focal_length: float = 18.0,
+    horizontal_aperture: float = 20.0955,
+    aspect_ratio: float = 1.0,
+    max_iterations: int = 32,
+) -> TileLayout:
+    """
+    Place K assets on a square grid so that every view of every asset sees only that asset.
+
+    Args:
+        bboxes: Per-asset [(min_x, min_y, min_z), (max_x, max_y, max_z)] as loaded at the origin.
+        view_angles: (azimuth, elevation) of every camera around an asset.
+        distance_scale: Camera distance as a multiple of the bbox diagonal.
+        focal_length: Camera focal length (mm).
+        horizontal_aperture: Camera horizontal aperture (mm).
+        aspect_ratio: Image height / width.
+        max_iterations: Number of times the spacing may grow before giving up.
+
+    Returns:
+        TileLayout: Offsets, centers, camera distances and the grid spacing.
+
+    Raises:
+        RuntimeError: If no isolating spacing is found.
+    """
+    bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 2, 3)
+    num_assets = len(bboxes)
+    base_centers = bboxes.mean(axis=1)
+    diagonals = np.linalg.norm(bboxes[:, 1] - bboxes[:, 0], axis=1)
+    radii = np.maximum(diagonals / 2, 1e-6)
+    distances = np.maximum(diagonals * distance_scale, 1e-6)
+
+    tan_h = horizontal_aperture / 2 / focal_length
+    tan_v = tan_h * aspect_ratio
+    columns = int(math.ceil(math.sqrt(num_assets)))
+    grid = np.array([(idx % columns, idx // columns, 0) for idx in range(num_assets)], dtype=np.float64)
+
+    spacing = float(2 * (distances.max() + radii.max()))
+    for _ in range(max_iterations):
+        # Grid points, anchored at the first asset, are where the bbox centers land horizontally
+        centers = base_centers[0] + grid * spacing
+        centers[:, 2] = base_centers[:, 2]
+        offsets = centers - base_centers
+        if _layout_is_isolated(centers, radii, distances, view_angles, tan_h, tan_v):
+            return TileLayout(offsets=offsets, centers=centers, distances=distances, spacing=spacing)
+        spacing *= 1.5
+    raise RuntimeError(f"[Tiling] Could not isolate {num_assets} assets within {max_iterations} iterations.")
+
+
+def _layout_is_isolated(centers, radii, distances, view_angles, tan_h, tan_v) -> bool:
+    for target_idx, center in enumerate(centers):
+        for azimuth, elevation in view_angles:
+            position, forward = camera_look_at_frame(center, distances[target_idx], elevation, azimuth)
+            for other_idx, other_center in enumerate(centers):
+                if other_idx == target_idx:
+                    continue
+                if sphere_in_frustum(position, forward, other_center, radii[other_idx], tan_h, tan_v):
+                    return False
+    return True
+
+
+def select_bbox_row(bbox_data: np.ndarray, id_to_labels: Dict, label: str) -> Optional[np.ndarray]:
+    """
+    Pick the bbox2d row whose semantic id maps to `label` in the annotator's idToLabels.
+
+    Args:
+        bbox_data: Structured bbox2d array; field 0 of each row is the semantic id.
+        id_to_labels: idToLabels map, e.g. {"0": {"class": "instance_0"}}.
+        label: Semantic label of the target object.
+
+    Returns:
+        The matching row, or None if the object is not detected.
+    """
+    for row in bbox_data:
+        semantic_id = int(row[0])
+        labels = id_to_labels.get(str(semantic_id), id_to_labels.get(semantic_id, {}))
+        if isinstance(labels, dict) and label in str(labels.get("class", "")).split(","):
+            return row
+    return None
+
+
+def split_into_tiles(items: List, tile_size: int) -> List[List]:
+    """
+    Split pending objects into batches of at most `tile_size`.
+    """
+    assert tile_size >= 1, "tile_size must be positive"
+    return [items[start:start + tile_size] for start in range(0, len(items), tile_size)]
@@ -0,0 +1,330 @@
+import math
+import numpy as np
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from render_usd.core.tiling import camera_look_at_frame
+
+#==============================================================================
+#                          CPU VISIBILITY PRECHECK
+#==============================================================================
+# With a background, a view is only kept if the target is detected and its
+# tight/loose bbox2d area ratio is at least 0.8. The check used to run after the
+# frame was path-traced. Here it is predicted on the CPU before any camera is
+# posed: points sampled on the target's surface are projected with the camera's
+# pinhole model, and each point counts as visible if the segment from the camera
+# to it hits no occluder. The loose bbox is the extent of all projected points and
+# the tight bbox the extent of the visible ones.
+#
+# Occluders are world bounds (broad phase) refined by their triangles (narrow
+# phase), which are flattened lazily with parse_meshes only for bounds that a
+# segment actually crosses. With mesh_occluders=False the bounds alone are used,
+# which is faster but conservative, and bounds that contain the camera or the
+# target point are ignored (rooms, floors).
+
+VIEW_RATIO_THRESHOLD = 0.8
+
+
+@dataclass
+class ViewEstimate:
+    """
+    Predicted outcome of one view.
+
+    Attributes:
+        azimuth: Camera azimuth (degrees).
+        elevation: Camera elevation (degrees).
+        detected: Whether any sampled point of the target is visible in the frame.
+        bbox_ratio: Predicted tight / loose bbox2d area ratio (0 if not detected).
+        visible_fraction: Fraction of the target's in-frame samples that are not occluded.
+    """
+    azimuth: float
+    elevation: float
+    detected: bool
+    bbox_ratio: float
+    visible_fraction: float
+
+    def passes(self, threshold: float = VIEW_RATIO_THRESHOLD) -> bool:
+        return self.detected and self.bbox_ratio >= threshold
+
+
+def triangulate(points: np.ndarray, face_vertex_counts: np.ndarray, face_vertex_indices: np.ndarray) -> np.ndarray:
+    """
+    Fan-triangulate polygons, e.g. the output of parse_meshes.
+
+    Returns:
+        (T, 3, 3) triangle corners.
+    """
+    counts = np.asarray(face_vertex_counts, dtype=np.int64)
+    indices = np.asarray(face_vertex_indices, dtype=np.int64)
+    num_triangles = np.maximum(counts - 2, 0)
+    if num_triangles.sum() == 0:
+        return np.zeros((0, 3, 3), dtype=np.float64)
+    face_starts = np.cumsum(counts) - counts
+    first = np.repeat(face_starts, num_triangles)
+    # Position of every triangle inside its fan: 0 .. count - 3
+    fan = np.arange(num_triangles.sum()) - np.repeat(np.cumsum(num_triangles) - num_triangles, num_triangles)
+    corners = np.stack([indices[first], indices[first + fan + 1], indices[first + fan + 2]], axis=1)
+    return np.asarray(points, dtype=np.float64)[corners]
+
+
+def surface_samples(triangles: np.ndarray, num_samples: int = 512, seed: int = 0) -> np.ndarray:
+    """
+    Points on a triangle soup: its vertices (strided down to num_samples) plus num_samples
+    area-weighted points inside the triangles. Deterministic for a given seed.
+
+    Returns:
+        (S, 3) points.
+    """
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    if len(triangles) == 0:
+        return np.zeros((0, 3), dtype=np.float64)
+    vertices = np.unique(triangles.reshape(-1, 3), axis=0)
+    vertices = vertices[::max(1, math.ceil(len(vertices) / num_samples))]
+    areas = np.linalg.norm(np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1)
+    if areas.sum() <= 0:
+        return vertices
+    rng = np.random.default_rng(seed)
+    chosen = triangles[rng.choice(len(triangles), size=num_samples, p=areas / areas.sum())]
+    u, v = rng.random(num_samples), rng.random(num_samples)
+    flip = u + v > 1
+    u[flip], v[flip] = 1 - u[flip], 1 - v[flip]
+    inner = chosen[:, 0] + u[:, None] * (chosen[:, 1] - chosen[:, 0]) + v[:, None] * (chosen[:, 2] - chosen[:, 0])
+    return np.concatenate([vertices, inner])
+
+
+def _segment_box_hits(origin: np.ndarray, directions: np.ndarray, bboxes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Slab test of segments origin + t * direction, t in [0, 1], against boxes.
+
+    Returns:
+        Tuple of (hit mask (R, B), entry parameter t_near (R, B)).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = 1.0 / np.where(np.abs(directions) < 1e-12, 1e-12, directions)
+        t1 = (bboxes[None, :, 0, :] - origin) * inverse[:, None, :]
+        t2 = (bboxes[None, :, 1, :] - origin) * inverse[:, None, :]
+    t_near = np.minimum(t1, t2).max(axis=2)
+    t_far = np.maximum(t1, t2).min(axis=2)
+    return (t_near <= t_far) & (t_far >= 0) & (t_near <= 1), t_near
+
+
+def _segment_triangle_hits(
+    origin: np.ndarray,
+    directions: np.ndarray,
+    triangles: np.ndarray,
+    t_max: float,
+    chunk_size: int = 1 << 21,
+) -> np.ndarray:
+    """
+    Möller-Trumbore test of segments sharing one origin against triangles.
+
+    Returns:
+        (R,) mask of segments hitting any triangle at 1e-6 < t < t_max.
+    """
+    hits = np.zeros(len(directions), dtype=bool)
+    step = max(1, chunk_size // max(len(directions), 1))
+    for start in range(0, len(triangles), step):
+        v0, v1, v2 = (triangles[start:start + step, k] for k in range(3))
+        edge1, edge2 = v1 - v0, v2 - v0
+        pvec = np.cross(directions[:, None, :], edge2[None, :, :])
+        det = np.einsum("mk,rmk->rm", edge1, pvec)
+        tvec = origin - v0
+        qvec = np.cross(tvec, edge1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse = 1.0 / det
+            u = np.einsum("mk,rmk->rm", tvec, pvec) * inverse
+            v = (directions @ qvec.T) * inverse
+            t = (edge2 * qvec).sum(axis=1)[None, :] * inverse
+        hit = (np.abs(det) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 1e-6) & (t < t_max)
+        hits |= hit.any(axis=1)
+    return hits
+
+
+class OcclusionScene:
+    """
+    Occluders of a scene for visibility prediction.
+
+    Example:
+        occluders = OcclusionScene(prims, bbox_cache.compute_many(prims))
+        estimate = occluders.estimate_view(target_index, center, distance, azimuth=30, elevation=35)
+    """
+    def __init__(
+        self,
+        prims: Sequence,
+        bboxes: np.ndarray,
+        mesh_occluders: bool = True,
+        mesh_cache_dir: Optional[Union[str, Path]] = None,
+        num_samples: int = 512,
+    ):
+        """
+        Args:
+            prims: Occluder prims, e.g. every instance and structure mesh prim of the scene.
+            bboxes: (N, 2, 3) world bounds of prims, e.g. from WorldBBoxCache.compute_many.
+            mesh_occluders: Refine bound hits with the prims' triangles (parse_meshes).
+            mesh_cache_dir: Optional .npz cache directory passed to parse_meshes.
+            num_samples: Surface samples per target, see surface_samples.
+        """
+        self.prims = list(prims)
+        self.bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 2, 3)
+        self.mesh_occluders = mesh_occluders
+        self.mesh_cache_dir = mesh_cache_dir
+        self.num_samples = num_samples
+        self._triangles: Dict[int, np.ndarray] = {}
+        self._samples: Dict[int, np.ndarray] = {}
+        self._xform_cache = None
+
+    def triangles(self, index: int) -> np.ndarray:
+        """
+        World-space triangles of one occluder, flattened on first use.
+        """
+        if index not in self._triangles:
+            from pxr import UsdGeom
+            from render_usd.utils.usd_utils.prim_utils import parse_meshes
+
+            if self._xform_cache is None:
+                self._xform_cache = UsdGeom.XformCache()
+            points, counts, indices = parse_meshes(self.prims[index], xform_cache=self._xform_cache, cache_dir=self.mesh_cache_dir)
+            self._triangles[index] = triangulate(points, counts, indices)
+        return self._triangles[index]
+
+    def samples(self, index: int) -> np.ndarray:
+        """
+        Surface samples of a target; its bound corners if it has no triangles.
+        """
+        if index not in self._samples:
+            samples = surface_samples(self.triangles(index), self.num_samples)
+            if len(samples) == 0:
+                bbox = self.bboxes[index]
+                samples = np.array([[x, y, z] for x in bbox[:, 0] for y in bbox[:, 1] for z in bbox[:, 2]])
+            self._samples[index] = samples
+        return self._samples[index]
+
+    def occluded(self, origin: np.ndarray, points: np.ndarray, exclude: int) -> np.ndarray:
+        """
+        Whether the segment from origin to each point is blocked by an occluder other than `exclude`.
+
+        Returns:
+            (P,) bool mask.
+        """
+        directions = points - origin
+        occluded = np.zeros(len(points), dtype=bool)
+        others = np.array([idx for idx in range(len(self.bboxes)) if idx != exclude], dtype=np.int64)
+        if len(others) == 0 or len(points) == 0:
+            return occluded
+        box_hits, t_near = _segment_box_hits(origin, directions, self.bboxes[others])
+        if not self.mesh_occluders:
+            # Bounds around the camera or the target point would hide everything
+            inside_target = np.all((points[:, None, :] >= self.bboxes[None, others, 0]) & (points[:, None, :] <= self.bboxes[None, others, 1]), axis=2)
+            return (box_hits & (t_near > 0) & (t_near < 1 - 1e-6) & ~inside_target).any(axis=1)
+        for column in np.flatnonzero(box_hits.any(axis=0)):
+            rows = np.flatnonzero(box_hits[:, column] & ~occluded)
+            if len(rows) == 0:
+                continue
+            triangles = self.triangles(int(others[column]))
+            if len(triangles) > 0:
+                occluded[rows] |= _segment_triangle_hits(origin, directions[rows], triangles, t_max=1 - 1e-3)
+        return occluded
+
+    def estimate_view(
+        self,
+        target: int,
+        center: np.ndarray,
+        distance: float,
+        azimuth: float,
+        elevation: float,
+        frame_size: Tuple[int, int] = (600, 450),
+        focal_length: float = 9.0,
+        horizontal_aperture: float = 20.0955,
+    ) -> ViewEstimate:
+        """
+        Predict the bbox2d outcome of a camera placed with set_camera_look_at(center, azimuth, elevation, distance).
+
+        Args:
+            target: Index of the target among the occluder prims; it never occludes itself.
+            center: Look-at point.
+            distance: Camera distance.
+            azimuth: Camera azimuth (degrees).
+            elevation: Camera elevation (degrees).
+            frame_size: (width, height) of the frame.
+            focal_length: Camera focal length (mm).
+            horizontal_aperture: Camera horizontal aperture (mm).
+
+        Returns:
+            ViewEstimate: Detection, tight/loose area ratio and visible fraction.
+        """
+        width, height = frame_size
+        position, forward = camera_look_at_frame(np.asarray(center, dtype=np.float64), distance, elevation, azimuth)
+        right = np.cross(forward, np.array([0.0, 0.0, 1.0]))
+        if np.linalg.norm(right) < 1e-9:
+            right = np.array([0.0, 1.0, 0.0])
+        right = right / np.linalg.norm(right)
+        up = np.cross(right, forward)
+        focal_px = focal_length / horizontal_aperture * width
+
+        points = self.samples(target)
+        rel = points - position
+        depth = rel @ forward
+        in_front = depth > 1e-6
+        points, rel, depth = points[in_front], rel[in_front], depth[in_front]
+        u = width / 2 + (rel @ right) / np.maximum(depth, 1e-9) * focal_px
+        v = height / 2 - (rel @ up) / np.maximum(depth, 1e-9) * focal_px
+        in_frame = (u >= 0) & (u <= width - 1) & (v >= 0) & (v <= height - 1)
+        not_detected = ViewEstimate(azimuth, elevation, False, 0.0, 0.0)
+        if not in_frame.any():
+            return not_detected
+
+        visible = in_frame & ~self.occluded(position, points, exclude=target)
+        visible_fraction = float(visible.sum() / in_frame.sum())
+        if not visible.any():
+            return not_detected
+
+        def _area(mask):
+            x = np.clip(u[mask], 0, width - 1)
+            y = np.clip(v[mask], 0, height - 1)
+            return float((x.max() - x.min()) * (y.max() - y.min()))
+
+        loose_area = _area(np.ones(len(u), dtype=bool))
+        bbox_ratio = _area(visible) / loose_area if loose_area > 0 else 0.0
+        return ViewEstimate(azimuth, elevation, True, bbox_ratio, visible_fraction)
+
+    def plan_views(
+        self,
+        target: int,
+        center: np.ndarray,
+        distance: float,
+        view_angles: Sequence[Tuple[float, float]],
+        azimuth_offsets: Sequence[float] = (15, -15, 30, -30, 45, -45),
+        threshold: float = VIEW_RATIO_THRESHOLD,
+        **camera_kwargs,
+    ) -> List[ViewEstimate]:
+        """
+        Choose a camera pose for every view slot before rendering.
+
+        A slot keeps its (azimuth, elevation) if it is predicted to pass, otherwise the first
+        alternative azimuth (same elevation) that is predicted to pass replaces it. If none
+        passes, the slot keeps the estimate of its own pose, which fails.
+
+        Args:
+            target: Index of the target among the occluder prims.
+            center: Look-at point.
+            distance: Camera distance.
+            view_angles: (azimuth, elevation) of every view slot.
+            azimuth_offsets: Alternative azimuths, relative to the slot's, tried in order.
+            threshold: Minimum predicted tight/loose area ratio.
+            **camera_kwargs: frame_size, focal_length, horizontal_aperture of estimate_view.
+
+        Returns:
+            ViewEstimate of the chosen pose per slot; check passes() before rendering it.
+        """
+        plan: List[ViewEstimate] = []
+        for azimuth, elevation in view_angles:
+            chosen = self.estimate_view(target, center, distance, azimuth, elevation, **camera_kwargs)
+            for offset in azimuth_offsets:
+                if chosen.passes(threshold):
+                    break
+                estimate = self.estimate_view(target, center, distance, azimuth + offset, elevation, **camera_kwargs)
+                if estimate.passes(threshold):
+                    chosen = estimate
+            plan.append(chosen)
+        return plan
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import socket
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+#==============================================================================
+#                          SHARED-FILESYSTEM WORK QUEUE
+#==============================================================================
+# Workers claim small batches of objects instead of fixed chunk slices, so a
+# batch of heavy assets no longer turns one chunk into a straggler. Only
+# primitives that are atomic on NFS-like shared mounts are used (SQLite WAL
+# needs shared memory and is not safe across hosts):
+#
+#   <queue_dir>/tasks/<batch>.json    created once, by renaming a staging dir
+#   <queue_dir>/claims/<batch>.lock   O_CREAT|O_EXCL; mtime is the lease heartbeat
+#   <queue_dir>/done/<batch>          written once all outputs of the batch are on disk
+#
+# A claim whose mtime is older than the lease duration belongs to a crashed or
+# hung worker. It is reclaimed by renaming it to a unique tombstone (only one
+# worker's rename succeeds) and claiming the batch again. Objects finished
+# before the crash are skipped by the usual skip rules.
+
+@dataclass
+class Lease:
+    """
+    A claimed batch of (object USD path, save directory) items.
+    """
+    batch_id: str
+    items: List[Tuple[Path, Path]]
+
+    @property
+    def object_usd_paths(self) -> List[Path]:
+        return [object_usd_path for object_usd_path, _ in self.items]
+
+    @property
+    def save_dirs(self) -> List[Path]:
+        return [save_dir for _, save_dir in self.items]
+
+
+class WorkQueue:
+    """
+    Lease-based work queue on a shared directory, usable by many worker processes.
+    """
+    def __init__(self, queue_dir: Union[str, Path], lease_seconds: float = 600.0, worker_id: Optional[str] = None):
+        """
+        Initialize a queue handle. The queue itself is created by `initialize`.
+
+        Args:
+            queue_dir: Directory shared by all workers.
+            lease_seconds: A claim not renewed for this long is considered abandoned.
+                           Claims are renewed every lease_seconds / 4 while the worker lives.
+            worker_id: Name written into claims. Defaults to host:pid.
+        """
+        self.queue_dir = Path(queue_dir)
+        self.tasks_dir = self.queue_dir / "tasks"
+        self.claims_dir = self.queue_dir / "claims"
+        self.done_dir = self.queue_dir / "done"
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._held: Dict[str, Path] = {}
+        self._released: Set[str] = set()
+        self._lock = threading.Lock()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.completed = 0
+        self.reclaimed = 0
+
+    #--------------------------------------------------------------------------
+    #                               SETUP
+    #--------------------------------------------------------------------------
+    def initialize(self, items: Sequence[Tuple[Path, Path]], batch_size: int = 4) -> bool:
+        """
+        Create the queue from (object USD path, save directory) items, unless it already exists.
+
+        Every worker may call this with the same items; the first to rename its staging
+        directory into place wins and the others reuse its tasks.
+
+        Returns:
+            bool: True if this call created the queue.
+        """
+        self.claims_dir.mkdir(parents=True, exist_ok=True)
+        self.done_dir.mkdir(parents=True, exist_ok=True)
+        if self.tasks_dir.exists():
+            return False
+        staging_dir = self.queue_dir / f".tasks.{self.worker_id.replace(':', '_')}.staging"
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        for idx_batch, start in enumerate(range(0, len(items), batch_size)):
+            batch = [[str(object_usd_path), str(save_dir)] for object_usd_path, save_dir in items[start:start + batch_size]]
+            with open(staging_dir / f"{idx_batch:06d}.json", "w") as f:
+                json.dump({"items": batch}, f)
+        try:
+            os.rename(staging_dir, self.tasks_dir)
+        except OSError:
+            shutil.rmtree(staging_dir, ignore_errors=True)  # another worker created the queue first
+            return False
+        print(f"[WorkQueue] Created {self.queue_dir} with {len(items)} objects in batches of {batch_size}.")
+        return True
+
+    def status(self) -> Dict[str, int]:
+        """
+        Count batches by state: done, claimed (live leases), expired and waiting.
+        """
+        batch_ids = self._batch_ids()
+        done = set(os.listdir(self.done_dir)) if self.done_dir.exists() else set()
+        counts = {"total": len(batch_ids), "done": 0, "claimed": 0, "expired": 0, "waiting": 0}
+        now = time.time()
+        for batch_id in batch_ids:
+            if batch_id in done:
+                counts["done"] += 1
+                continue
+            try:
+                age = now - os.stat(self._claim_path(batch_id)).st_mtime
+            except OSError:
+                counts["waiting"] += 1
+                continue
+            counts["expired" if age > self.lease_seconds else "claimed"] += 1
+        return counts
+
+    #--------------------------------------------------------------------------
+    #                               LEASES
+    #--------------------------------------------------------------------------
+    def _batch_ids(self) -> List[str]:
+        if not self.tasks_dir.exists():
+            return []
+        return sorted(name[:-len(".json")] for name in os.listdir(self.tasks_dir) if name.endswith(".json"))
+
+    def pending_batch_ids(self) -> List[str]:
+        """
+        Batches not yet done (waiting, claimed or expired).
+        """
+        done = set(os.listdir(self.done_dir)) if self.done_dir.exists() else set()
+        return [batch_id for batch_id in self._batch_ids() if batch_id not in done]
+
+    def _claim_path(self, batch_id: str) -> Path:
+        return self.claims_dir / f"{batch_id}.lock"
+
+    def _try_claim(self, batch_id: str) -> bool:
+        claim_path = self._claim_path(batch_id)
+        try:
+            fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                expired = time.time() - os.stat(claim_path).st_mtime > self.lease_seconds
+            except OSError:
+                return False  # released meanwhile; picked up on the next pass
+            if not expired:
+                return False
+            tombstone = claim_path.with_name(f"{claim_path.name}.expired.{self.worker_id.replace(':', '_')}.{time.time_ns()}")
+            try:
+                os.rename(claim_path, tombstone)  # only one reclaiming worker succeeds
+            except OSError:
+                return False
+            if time.time() - os.stat(tombstone).st_mtime <= self.lease_seconds:
+                # Another worker reclaimed it between our stat and rename: put its fresh claim back
+                try:
+                    os.link(tombstone, claim_path)
+                except OSError:
+                    pass
+                os.remove(tombstone)
+                return False
+            os.remove(tombstone)
+            print(f"[WorkQueue] Reclaiming expired lease {batch_id}.")
+            self.reclaimed += 1
+            return self._try_claim(batch_id)
+        with os.fdopen(fd, "w") as f:
+            f.write(self.worker_id)
+        return True
+
+    def claim(self) -> Optional[Lease]:
+        """
+        Claim the next batch that is neither done nor under a live lease. Batches this
+        worker released are left to the others.
+
+        Returns:
+            Lease or None if no batch is available.
+        """
+        done = set(os.listdir(self.done_dir))
+        for batch_id in self._batch_ids():
+            if batch_id in done or batch_id in self._held or batch_id in self._released:
+                continue
+            if not self._try_claim(batch_id):
+                continue
+            if (self.done_dir / batch_id).exists():
+                # Completed between the listing and the claim
+                os.remove(self._claim_path(batch_id))
+                continue
+            with open(self.tasks_dir / f"{batch_id}.json", "r") as f:
+                items = [(Path(object_usd_path), Path(save_dir)) for object_usd_path, save_dir in json.load(f)["items"]]
+            with self._lock:
+                self._held[batch_id] = self._claim_path(batch_id)
+            self._start_heartbeat()
+            return Lease(batch_id, items)
+        return None
+
+    def leases(self) -> Iterator[Lease]:
+        """
+        Claim batches until the queue has none left for this worker.
+        """
+        while True:
+            lease = self.claim()
+            if lease is None:
+                return
+            yield lease
+
+    def complete(self, lease: Lease) -> None:
+        """
+        Mark a batch done and release its claim. Thread-safe (called from writer threads).
+        """
+        (self.done_dir / lease.batch_id).write_text(self.worker_id)
+        with self._lock:
+            claim_path = self._held.pop(lease.batch_id, None)
+            self.completed += 1
+        if claim_path is not None:
+            try:
+                os.remove(claim_path)
+            except OSError:
+                pass
+
+    def release(self, lease: Lease) -> None:
+        """
+        Give a batch back without completing it (e.g. some of its writes failed), so other
+        workers can claim it right away. Thread-safe (called from writer threads).
+        """
+        with self._lock:
+            claim_path = self._held.pop(lease.batch_id, None)
+            self._released.add(lease.batch_id)
+        if claim_path is not None:
+            try:
+                os.remove(claim_path)
+            except OSError:
+                pass
+
+    #--------------------------------------------------------------------------
+    #                               HEARTBEAT
+    #--------------------------------------------------------------------------
+    def _start_heartbeat(self) -> None:
+        if self._heartbeat is not None:
+            return
+        self._heartbeat = threading.Thread(target=self._renew_loop, name="work_queue_heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _renew_loop(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 4):
+            with self._lock:
+                claim_paths = list(self._held.values())
+            for claim_path in claim_paths:
+                try:
+                    os.utime(claim_path)
+                except OSError:
+                    pass  # released meanwhile
+
+    def close(self) -> None:
+        """
+        Stop renewing leases and give back batches that are still held (e.g. after an
+        interrupted render), so other workers retry them right away.
+        """
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        with self._lock:
+            held = list(self._held)
+        for batch_id in held:
+            print(f"[WorkQueue] Releasing unfinished batch {batch_id}.")
+            self.release(Lease(batch_id, []))
@@ -0,0 +1,202 @@
+import os
+import cv2
+import time
+import hashlib
+import threading
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+from render_usd.utils.common_utils.images_utils import draw_bbox2d
+
+#==============================================================================
+#                           ASYNC IMAGE WRITER
+#==============================================================================
+
+@dataclass
+class WriteError:
+    """
+    A failed image write.
+    """
+    path: str
+    error: BaseException
+
+
+class AsyncImageWriter:
+    """
+    Bounded background writer that takes rendered frames off the render loop.
+
+    Colour conversion, bbox overlay, PNG encoding and the atomic file write
+    (temporary name + rename) run on a thread pool; OpenCV releases the GIL while
+    encoding, so threads overlap well with the simulator. ``submit`` blocks once
+    ``max_pending`` frames are queued, which bounds memory when the output mount is
+    slower than the renderer.
+    """
+    def __init__(self, num_workers: int = 4, max_pending: int = 32):
+        """
+        Initialize the writer.
+
+        Args:
+            num_workers: Number of writer threads. 0 writes synchronously in the caller.
+            max_pending: Maximum number of frames queued or in flight before submit blocks.
+        """
+        self.num_workers = num_workers
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="image_writer") if num_workers > 0 else None
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self._errors: List[WriteError] = []
+
+    def submit(self, rgb: np.ndarray, output_path: str, bbox2d: Optional[Sequence[float]] = None, timing=None) -> Future:
+        """
+        Queue a frame to be written.
+
+        Args:
+            rgb: RGB frame as returned by get_src(camera, "rgb"). It is copied before queueing.
+            output_path: Destination PNG path.
+            bbox2d: Optional bbox row (id, x_min, y_min, x_max, y_max, ...) drawn onto the frame.
+            timing: Optional ObjectTiming receiving the "encode" and "write" durations.
+
+        Returns:
+            Future: Resolves to the output description {"path", "size", "sha1"}.
+        """
+        rgb = np.array(rgb, copy=True)
+        if self._executor is None:
+            future = Future()
+            try:
+                future.set_result(self._write(rgb, output_path, bbox2d, timing))
+            except Exception as e:
+                self._report(output_path, e)
+                future.set_exception(e)
+            return future
+
+        self._slots.acquire()
+        self._begin()
+        future = self._executor.submit(self._write, rgb, output_path, bbox2d, timing)
+        future.add_done_callback(lambda f: self._on_done(f, output_path))
+        return future
+
+    def _begin(self) -> None:
+        with self._idle:
+            self._in_flight += 1
+
+    def _end(self) -> None:
+        with self._idle:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.notify_all()
+
+    def _on_done(self, future: Future, output_path: str) -> None:
+        self._slots.release()
+        if future.exception() is not None:
+            self._report(output_path, future.exception())
+        self._end()
+
+    def _report(self, output_path: str, error: BaseException) -> None:
+        print(f"[ImageWriter] Failed to write {output_path}: {error}")
+        with self._idle:
+            self._errors.append(WriteError(str(output_path), error))
+
+    @staticmethod
+    def _write(rgb: np.ndarray, output_path: str, bbox2d: Optional[Sequence[float]], timing=None) -> dict:
+        start_time = time.perf_counter()
+        if bbox2d is not None:
+            try:
+                rgb = draw_bbox2d(rgb, bbox2d)
+            except Exception:
+                print(f"[ImageWriter] {output_path} bbox2d is not valid, saving without it.")
+        success, encoded = cv2.imencode(".png", cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB))
+        if not success:
+            raise IOError(f"PNG encoding failed for {output_path}")
+        data = encoded.tobytes()
+        encoded_time = time.perf_counter()
+        tmp_path = f"{output_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if timing is not None:
+            timing.add("encode", encoded_time - start_time)
+            timing.add("write", time.perf_counter() - encoded_time)
+        return {"path": str(output_path), "size": len(data), "sha1": hashlib.sha1(data).hexdigest()}
+
+    def when_all_done(
+        self,
+        futures: List[Future],
+        callback: Callable[[List[dict]], None],
+        on_error: Optional[Callable[[], None]] = None,
+        offload: bool = False,
+    ) -> None:
+        """
+        Run a callback with all output descriptions once every future succeeded.
+
+        The callback runs on the writer thread that finishes last and is skipped if
+        any write failed, so a partially written object is never reported complete.
+        flush() also waits for pending callbacks.
+
+        Args:
+            futures: Futures returned by submit for one render unit.
+            callback: Called with the list of output descriptions, in submission order.
+            on_error: Called instead of callback once all futures finished, if any write failed.
+            offload: Run the callbacks as a task of the writer pool. Otherwise they run in the
+                     caller if the writes already finished, which is fine for cheap callbacks.
+        """
+        if not futures:
+            callback([])
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+        self._begin()
+
+        def _on_done(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            if offload and self._executor is not None:
+                self._executor.submit(_run)
+            else:
+                _run()
+
+        def _run():
+            try:
+                if all(f.exception() is None for f in futures):
+                    callback([f.result() for f in futures])
+                elif on_error is not None:
+                    on_error()
+            except Exception as e:
+                print(f"[ImageWriter] Completion callback failed: {e}")
+            finally:
+                self._end()
+
+        for future in futures:
+            future.add_done_callback(_on_done)
+
+    def flush(self) -> List[WriteError]:
+        """
+        Block until every queued frame is written (drain barrier).
+
+        Returns:
+            List[WriteError]: Errors reported since the previous flush.
+        """
+        with self._idle:
+            while self._in_flight > 0:
+                self._idle.wait()
+            errors, self._errors = self._errors, []
+        if errors:
+            print(f"[ImageWriter] {len(errors)} file(s) failed to write.")
+        return errors
+
+    def close(self) -> List[WriteError]:
+        """
+        Flush and shut down the worker threads.
+        """
+        errors = self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        return errors
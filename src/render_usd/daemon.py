@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import socket
+import threading
+import traceback
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+#==============================================================================
+#                               RENDER DAEMON
+#==============================================================================
+# A long-lived process that boots Kit once and keeps a RenderManager warm.
+# Jobs are ordinary CLI argument lists (e.g. ["single", "--usd_path", ...]),
+# sent as one JSON line over a local Unix socket. The daemon answers with a
+# stream of JSON-line events:
+#   {"event": "accepted", "argv": [...]}
+#   {"event": "object", "key": ..., "status": "done", "outputs": [...]}
+#   {"event": "warning", "message": ...}
+#   {"event": "finished", "status": "ok" | "error", "rendered": N, "failed": [...], "seconds": T}
+# Jobs run one at a time on the main thread (Kit is not thread-safe); further
+# clients wait in the listen backlog.
+
+class EventStream:
+    """
+    JSON-line writer on a client connection, shared with writer threads.
+
+    A client that disconnects does not stop the job; later events are dropped.
+    """
+    def __init__(self, conn: socket.socket):
+        self.conn = conn
+        self.connected = True
+        self._lock = threading.Lock()
+
+    def send(self, event: str, **payload) -> None:
+        data = (json.dumps({"event": event, **payload}) + "\n").encode()
+        with self._lock:
+            if not self.connected:
+                return
+            try:
+                self.conn.sendall(data)
+            except OSError:
+                self.connected = False
+
+
+def read_message(conn: socket.socket) -> dict:
+    """
+    Read one JSON line from a connection.
+    """
+    buffer = b""
+    while not buffer.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        buffer += chunk
+    return json.loads(buffer.decode()) if buffer.strip() else {}
+
+
+class RenderDaemon:
+    """
+    Serve render jobs over a Unix socket with one warm RenderManager.
+    """
+    def __init__(
+        self,
+        socket_path: Union[str, Path],
+        renderer,
+        parse_job: Callable[[List[str]], Tuple[object, List[str]]],
+        run_job: Callable[[object], None],
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket path to listen on.
+            renderer: The RenderManager kept warm across jobs.
+            parse_job: Turns a job argument list into (parsed CLI arguments, warnings).
+                       May raise SystemExit/ValueError for invalid jobs.
+            run_job: Runs one parsed job with `renderer`.
+        """
+        self.socket_path = Path(socket_path)
+        self.renderer = renderer
+        self.parse_job = parse_job
+        self.run_job = run_job
+        self._stop = False
+
+    def serve_forever(self) -> None:
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # stale socket of a previous daemon
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.socket_path))
+        server.listen(16)
+        print(f"[Daemon] Listening on {self.socket_path}")
+        try:
+            while not self._stop:
+                conn, _ = server.accept()
+                with conn:
+                    self.handle(conn)
+        except KeyboardInterrupt:
+            print("[Daemon] Interrupted.")
+        finally:
+            server.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            print("[Daemon] Stopped.")
+
+    def handle(self, conn: socket.socket) -> None:
+        """
+        Run one job request and stream its events back.
+        """
+        stream = EventStream(conn)
+        try:
+            request = read_message(conn)
+        except (OSError, ValueError) as e:
+            stream.send("finished", status="error", message=f"Invalid request: {e}")
+            return
+        if request.get("shutdown"):
+            stream.send("finished", status="ok", message="Daemon shutting down.")
+            self._stop = True
+            return
+
+        argv = [str(arg) for arg in request.get("argv", [])]
+        try:
+            job_args, warnings = self.parse_job(argv)
+        except (SystemExit, ValueError) as e:
+            stream.send("finished", status="error", message=f"Invalid job {argv}: {e}")
+            return
+        stream.send("accepted", argv=argv)
+        for warning in warnings:
+            stream.send("warning", message=warning)
+        print(f"[Daemon] Job: {' '.join(argv)}")
+
+        rendered = []
+
+        def _on_unit_done(key: str, outputs: List[dict]) -> None:
+            rendered.append(key)
+            stream.send("object", key=key, status="done", outputs=[output["path"] for output in outputs])
+
+        self.renderer.write_errors = []
+        self.renderer.on_unit_done = _on_unit_done
+        previous_cwd = os.getcwd()
+        start_time = time.perf_counter()
+        status, message = "ok", None
+        try:
+            # Relative paths of the job are resolved against the client's directory
+            os.chdir(request.get("cwd") or previous_cwd)
+            self.run_job(job_args)
+        except Exception as e:
+            traceback.print_exc()
+            status, message = "error", f"{type(e).__name__}: {e}"
+        finally:
+            self.renderer.write_errors += self.renderer.image_writer.flush()
+            self.renderer.on_unit_done = None
+            os.chdir(previous_cwd)
+
+        failed = [error.path for error in self.renderer.write_errors]
+        if failed and status == "ok":
+            status = "error"
+        stream.send(
+            "finished",
+            status=status,
+            message=message,
+            rendered=len(rendered),
+            failed=failed,
+            seconds=round(time.perf_counter() - start_time, 3),
+        )
+
+#==============================================================================
+#                                   CLIENT
+#==============================================================================
+
+def submit_job(socket_path: Union[str, Path], argv: Optional[List[str]] = None, shutdown: bool = False) -> int:
+    """
+    Send a job to a running daemon and print its events as they arrive.
+
+    Args:
+        socket_path: Unix socket of the daemon.
+        argv: CLI arguments of the job, e.g. ["single", "--usd_path", "a.usd", "--output_dir", "out"].
+        shutdown: Ask the daemon to exit instead of submitting a job.
+
+    Returns:
+        int: Process exit code, 0 if the job finished without errors.
+    """
+    request = {"shutdown": True} if shutdown else {"argv": list(argv or []), "cwd": os.getcwd()}
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError as e:
+        print(f"[Client] Cannot connect to daemon at {socket_path}: {e}")
+        return 2
+    with client:
+        client.sendall((json.dumps(request) + "\n").encode())
+        for line in client.makefile("r"):
+            event = json.loads(line)
+            if event["event"] == "accepted":
+                print(f"[Client] Accepted: {' '.join(event['argv'])}")
+            elif event["event"] == "object":
+                print(f"[Client] {event['status']}: {event['key']}")
+            elif event["event"] == "warning":
+                print(f"[Client] Warning: {event['message']}")
+            elif event["event"] == "finished":
+                summary = f"{event.get('rendered', 0)} rendered, {len(event.get('failed', []))} failed, {event.get('seconds', 0)}s"
+                print(f"[Client] Finished ({event['status']}): {event.get('message') or summary}")
+                return 0 if event["status"] == "ok" else 1
+    print("[Client] Connection closed before the job finished.")
+    return 1
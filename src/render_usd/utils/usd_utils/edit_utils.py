@@ -0,0 +1,140 @@
+from pxr import Sdf, Usd, UsdGeom
+from typing import Dict, Iterable, List, Optional, Tuple
+
+#==============================================================================
+#                              BATCHED STAGE EDITS
+#==============================================================================
+# Every Usd-level Set fires its own change notification, and Kit/Hydra resyncs
+# on each one. A StageEditBatch first gathers the target prims and values with
+# Usd reads, then writes them as Sdf specs on the edit target layer inside one
+# Sdf.ChangeBlock, so listeners see a single notice. No Usd API is called
+# inside the block (the composed stage is stale there).
+
+LIGHT_TYPES = ("DistantLight", "SphereLight", "DiskLight", "RectLight", "CylinderLight")
+
+SEMANTICS_INSTANCE = "Semantics"
+SEMANTIC_TYPE_ATTR = f"semantic:{SEMANTICS_INSTANCE}:params:semanticType"
+SEMANTIC_DATA_ATTR = f"semantic:{SEMANTICS_INSTANCE}:params:semanticData"
+SEMANTICS_API = f"SemanticsAPI:{SEMANTICS_INSTANCE}"
+
+
+def find_cast_shadow_attributes(prim: Usd.Prim) -> List[Usd.Attribute]:
+    """
+    The "primvars:doNotCastShadows" attributes set_prim_cast_shadow_true would edit:
+    the prim's own if it has one, otherwise those of its Mesh/Xform descendants.
+    """
+    if not (prim.IsA(UsdGeom.Mesh) or prim.IsA(UsdGeom.Xform)):
+        return []
+    attribute = prim.GetAttribute("primvars:doNotCastShadows")
+    if attribute:
+        return [attribute]
+    attributes = []
+    for child in prim.GetChildren():
+        attributes.extend(find_cast_shadow_attributes(child))
+    return attributes
+
+
+class StageEditBatch:
+    """
+    Collects shadow, visibility and semantic edits and applies them in one Sdf.ChangeBlock.
+
+    Example:
+        batch = StageEditBatch(stage)
+        batch.cast_shadows(instance_prims)
+        batch.switch_lights("on")
+        counts = batch.apply()  # {"shadows": ..., "visibility": ..., "semantics": ...}
+    """
+    def __init__(self, stage: Usd.Stage):
+        self.stage = stage
+        self._values: Dict[Sdf.Path, Dict[str, Tuple[Sdf.ValueTypeName, object]]] = {}
+        self._schemas: Dict[Sdf.Path, List[str]] = {}
+        self._counts = {"shadows": 0, "visibility": 0, "semantics": 0}
+        self._fallback_visible: List[Usd.Prim] = []
+
+    def _set(self, path: Sdf.Path, name: str, type_name: Sdf.ValueTypeName, value) -> None:
+        self._values.setdefault(path, {})[name] = (type_name, value)
+
+    def cast_shadows(self, prims: Iterable[Usd.Prim]) -> "StageEditBatch":
+        """
+        Enable shadow casting, same rule as set_prim_cast_shadow_true.
+        """
+        for prim in prims:
+            for attribute in find_cast_shadow_attributes(prim):
+                if attribute.Get() is not False:
+                    self._set(attribute.GetPrim().GetPath(), attribute.GetName(), attribute.GetTypeName(), False)
+                    self._counts["shadows"] += 1
+        return self
+
+    def set_visibility(self, prims: Iterable[Usd.Prim], visible: bool) -> "StageEditBatch":
+        """
+        Make prims visible or invisible. Prims hidden by an invisible ancestor are made visible
+        with UsdGeom.Imageable.MakeVisible after the block, since that also edits the ancestors.
+        """
+        for prim in prims:
+            imageable = UsdGeom.Imageable(prim)
+            current = imageable.GetVisibilityAttr().Get()
+            if visible:
+                if imageable.ComputeVisibility() == UsdGeom.Tokens.invisible and current != UsdGeom.Tokens.invisible:
+                    self._fallback_visible.append(prim)
+                    continue
+                if current == UsdGeom.Tokens.invisible:
+                    self._set(prim.GetPath(), "visibility", Sdf.ValueTypeNames.Token, UsdGeom.Tokens.inherited)
+                    self._counts["visibility"] += 1
+            elif current != UsdGeom.Tokens.invisible:
+                self._set(prim.GetPath(), "visibility", Sdf.ValueTypeNames.Token, UsdGeom.Tokens.invisible)
+                self._counts["visibility"] += 1
+        return self
+
+    def switch_lights(self, action: str = "on") -> "StageEditBatch":
+        """
+        Turn every light of the stage on or off, same as switch_all_lights.
+        """
+        action_list = ["on", "off"]
+        assert action in action_list, f"Invalid action {action}, should be one of {action_list}"
+        lights = [prim for prim in self.stage.Traverse() if prim.GetTypeName() in LIGHT_TYPES]
+        return self.set_visibility(lights, visible=action == "on")
+
+    def add_semantics(self, prim: Usd.Prim, semantic_label: str, type_label: str = "class") -> "StageEditBatch":
+        """
+        Apply SemanticsAPI:Semantics and set its type/data, the same specs add_update_semantics writes.
+        """
+        path = prim.GetPath()
+        applied = prim.GetMetadata("apiSchemas")  # composed list; SemanticsAPI may be unregistered outside Kit
+        if applied is None or SEMANTICS_API not in applied.ApplyOperations([]):
+            self._schemas.setdefault(path, []).append(SEMANTICS_API)
+        self._set(path, SEMANTIC_TYPE_ATTR, Sdf.ValueTypeNames.String, type_label)
+        self._set(path, SEMANTIC_DATA_ATTR, Sdf.ValueTypeNames.String, semantic_label)
+        self._counts["semantics"] += 1
+        return self
+
+    def apply(self, layer: Optional[Sdf.Layer] = None) -> Dict[str, int]:
+        """
+        Write all gathered edits as specs on `layer` (default: the stage's edit target) in one
+        Sdf.ChangeBlock, then clear the batch.
+
+        Returns:
+            Number of edits per kind: {"shadows", "visibility", "semantics"}.
+        """
+        edit_target = self.stage.GetEditTarget()
+        layer = layer if layer is not None else edit_target.GetLayer()
+        with Sdf.ChangeBlock():
+            for path in self._schemas.keys() | self._values.keys():
+                prim_spec = Sdf.CreatePrimInLayer(layer, edit_target.MapToSpecPath(path))
+                schemas = self._schemas.get(path)
+                if schemas:
+                    api_schemas = prim_spec.GetInfo("apiSchemas") if prim_spec.HasInfo("apiSchemas") else Sdf.TokenListOp()
+                    items = list(api_schemas.prependedItems)
+                    api_schemas.prependedItems = items + [schema for schema in schemas if schema not in items]
+                    prim_spec.SetInfo("apiSchemas", api_schemas)
+                attribute_specs = prim_spec.attributes
+                for name, (type_name, value) in self._values.get(path, {}).items():
+                    attribute_spec = attribute_specs.get(name)
+                    if attribute_spec is None:
+                        attribute_spec = Sdf.AttributeSpec(prim_spec, name, type_name)
+                    attribute_spec.default = value
+        for prim in self._fallback_visible:
+            UsdGeom.Imageable(prim).MakeVisible()
+        counts = dict(self._counts, visibility=self._counts["visibility"] + len(self._fallback_visible))
+        self._values, self._schemas, self._fallback_visible = {}, {}, []
+        self._counts = {"shadows": 0, "visibility": 0, "semantics": 0}
+        return counts
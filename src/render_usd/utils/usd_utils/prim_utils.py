@@ -1,6 +1,9 @@
+import os
+import hashlib
 import numpy as np
+from pathlib import Path
 from pxr import Usd, UsdGeom, Gf
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 
 #==============================================================================
@@ -18,67 +21,156 @@ def to_list(data):
 # - faceVertexCounts: 1xM, M is the number of faces
 # - faceVertexIndices: sum(faceVertexCounts), points indices for each face
 def recursive_parse(prim: Usd.Prim) -> Tuple[List[Gf.Vec3f], List[int], List[int]]:
+    """
+    List-based form of parse_meshes, kept for existing callers.
+    Points stay float64 NumPy rows, as they always were; parse_meshes returns float32.
+    """
+    points, face_vertex_counts, face_vertex_indices = _flatten_meshes(prim, UsdGeom.XformCache(), Usd.TimeCode.Default())
+    return list(points), face_vertex_counts.tolist(), face_vertex_indices.tolist()
 
-    points_total = []
-    faceVertexCounts_total = []
-    faceVertexIndices_total = []
 
-    if prim.IsA(UsdGeom.Mesh):
-        prim_imageable = UsdGeom.Imageable(prim)
-        xform_world_transform = np.array(
-            prim_imageable.ComputeLocalToWorldTransform(Usd.TimeCode.Default())
-        )
-
-        points = prim.GetAttribute("points").Get()
-        faceVertexCounts = prim.GetAttribute("faceVertexCounts").Get()
-        faceVertexIndices = prim.GetAttribute("faceVertexIndices").Get()
-        faceVertexCounts = to_list(faceVertexCounts)
-        faceVertexIndices = to_list(faceVertexIndices)
-        points = to_list(points)
-        points = np.array(points)  # Nx3
-        ones = np.ones((points.shape[0], 1))  # Nx1
-        points_h = np.hstack([points, ones])  # Nx4
-        points_transformed_h = np.dot(points_h, xform_world_transform)  # Nx4
-        points_transformed = points_transformed_h[:, :3] / points_transformed_h[:, 3][:, np.newaxis]  # Nx3
-        points = points_transformed.tolist()
-        points = np.array(points)
-
-        if np.isnan(points).any():
-            # There is "nan" in points
-            print("[GRGenerator: Recursive Parse] Found NaN in points, performing clean-up...")
-            nan_mask = np.isnan(points).any(axis=1)  
-            valid_points_mask = ~nan_mask  
-            points_clean = points[valid_points_mask].tolist()
-            faceVertexIndices = np.array(faceVertexIndices).reshape(-1, 3)
-            old_to_new_indices = np.full(points.shape[0], -1)
-            old_to_new_indices[valid_points_mask] = np.arange(np.sum(valid_points_mask))
-            valid_faces_mask = np.all(old_to_new_indices[faceVertexIndices] != -1, axis=1)
-            faceVertexIndices_clean = old_to_new_indices[faceVertexIndices[valid_faces_mask]].flatten().tolist()
-            faceVertexCounts_clean = np.array(faceVertexCounts)[valid_faces_mask].tolist()
-            base_num = len(points_total)
-            faceVertexIndices_total.extend((base_num + np.array(faceVertexIndices_clean)).tolist())
-            faceVertexCounts_total.extend(faceVertexCounts_clean)
-            points_total.extend(points_clean)
-        else:
-            base_num = len(points_total)
-            faceVertexIndices = np.array(faceVertexIndices)
-            faceVertexIndices_total.extend((base_num + faceVertexIndices).tolist())
-            faceVertexCounts_total.extend(faceVertexCounts)
-            points_total.extend(points)
+def _remove_nan_points(
+    points: np.ndarray,
+    face_vertex_counts: np.ndarray,
+    face_vertex_indices: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Drop NaN points and every face that uses one, re-indexing the remaining faces.
+    Works for arbitrary polygons, not only triangles.
+    """
+    valid_points_mask = ~np.isnan(points).any(axis=1)
+    old_to_new_indices = np.full(points.shape[0], -1, dtype=np.int32)
+    old_to_new_indices[valid_points_mask] = np.arange(np.count_nonzero(valid_points_mask), dtype=np.int32)
+    remapped_indices = old_to_new_indices[face_vertex_indices]
+    # A face is valid if none of its vertices was removed
+    face_ids = np.repeat(np.arange(face_vertex_counts.shape[0]), face_vertex_counts)
+    invalid_faces = np.bincount(face_ids[remapped_indices < 0], minlength=face_vertex_counts.shape[0]) > 0
+    return (
+        points[valid_points_mask],
+        face_vertex_counts[~invalid_faces],
+        remapped_indices[~invalid_faces[face_ids]],
+    )
 
-    children = prim.GetChildren()
-    for child in children:
-        child_points, child_faceVertexCounts, child_faceVertexIndices = recursive_parse(child)
-        base_num = len(points_total)
-        child_faceVertexIndices = np.array(child_faceVertexIndices)
-        faceVertexIndices_total.extend((base_num + child_faceVertexIndices).tolist())
-        faceVertexCounts_total.extend(child_faceVertexCounts)
-        points_total.extend(child_points)
 
+# Content hashes of file-backed layers, keyed by (real path, size, mtime_ns), so each
+# layer version is read once per process however many prims are parsed.
+_LAYER_DIGESTS: Dict[Tuple[str, int, int], str] = {}
+
+
+def _layer_digest(real_path: str) -> str:
+    stat = os.stat(real_path)
+    key = (real_path, stat.st_size, stat.st_mtime_ns)
+    digest = _LAYER_DIGESTS.get(key)
+    if digest is None:
+        sha1 = hashlib.sha1()
+        with open(real_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(block)
+        digest = _LAYER_DIGESTS[key] = sha1.hexdigest()
+    return digest
+
+
+def _mesh_cache_key(prim: Usd.Prim, time: Usd.TimeCode) -> str:
+    """
+    Hash of the file-backed layers used by the prim's stage, plus the prim path and time.
+
+    In-memory layers (the session layer, anonymous root layers) are left out: they hold
+    render-time edits (cameras, labels, lights) that would make every lookup miss.
+    """
+    digest = hashlib.sha1(f"{prim.GetPath()}@{time}".encode("utf-8"))
+    for layer in sorted(prim.GetStage().GetUsedLayers(), key=lambda layer: layer.identifier):
+        if layer.realPath and os.path.isfile(layer.realPath):
+            digest.update(f"{layer.identifier}\0{_layer_digest(layer.realPath)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def parse_meshes(
+    prim: Usd.Prim,
+    xform_cache: Optional[UsdGeom.XformCache] = None,
+    time: Usd.TimeCode = Usd.TimeCode.Default(),
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten all meshes under a prim (itself included) into one world-space mesh.
+
+    Vt arrays are read straight into NumPy,
+    world transforms come from one shared XformCache, and per-mesh arrays are
+    concatenated once at the end with index offsets. NaN points are removed together
+    with the faces using them.
+
+    Args:
+        prim: Root prim to flatten.
+        xform_cache: Shared transform cache. A new one is created if not given.
+        time: Time code the points and transforms are read at.
+        cache_dir: Optional directory of .npz results, keyed by the content hash of the
+                   stage's file-backed layers, the prim path and the time code. Geometry
+                   edited only in memory is not part of the key.
+
+    Returns:
+        Tuple of (points float32 Nx3, faceVertexCounts int32 M, faceVertexIndices int32 sum(counts)).
+    """
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"{_mesh_cache_key(prim, time)}.npz"
+        if cache_path.exists():
+            with np.load(cache_path) as cached:
+                return cached["points"], cached["face_vertex_counts"], cached["face_vertex_indices"]
+
+    xform_cache = xform_cache if xform_cache is not None else UsdGeom.XformCache(time)
+    points, face_vertex_counts, face_vertex_indices = _flatten_meshes(prim, xform_cache, time)
+    result = (np.ascontiguousarray(points, dtype=np.float32), face_vertex_counts, face_vertex_indices)
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, points=result[0], face_vertex_counts=result[1], face_vertex_indices=result[2])
+        os.replace(tmp_path, cache_path)
+    return result
+
+
+def _flatten_meshes(
+    prim: Usd.Prim,
+    xform_cache: UsdGeom.XformCache,
+    time: Usd.TimeCode,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Body of parse_meshes. Returns float64 points and int32 face counts/indices.
+    """
+    points_list, counts_list, indices_list = [], [], []
+    num_points = 0
+    for mesh_prim in Usd.PrimRange(prim):
+        if not mesh_prim.IsA(UsdGeom.Mesh):
+            continue
+        mesh = UsdGeom.Mesh(mesh_prim)
+        points = mesh.GetPointsAttr().Get(time)
+        if points is None or len(points) == 0:
+            continue
+        points = np.asarray(points, dtype=np.float64)
+        face_vertex_counts = np.asarray(mesh.GetFaceVertexCountsAttr().Get(time), dtype=np.int32)
+        face_vertex_indices = np.asarray(mesh.GetFaceVertexIndicesAttr().Get(time), dtype=np.int32)
+
+        # Row-vector convention of Gf matrices: p' = [p, 1] @ M
+        matrix = np.asarray(xform_cache.GetLocalToWorldTransform(mesh_prim))
+        points_world = points @ matrix[:3, :3] + matrix[3, :3]
+        w = points @ matrix[:3, 3] + matrix[3, 3]
+        if not np.allclose(w, 1.0):
+            points_world /= w[:, np.newaxis]
+
+        if np.isnan(points_world).any():
+            print(f"[GRGenerator: Parse Meshes] Found NaN in points of {mesh_prim.GetPath()}, performing clean-up...")
+            points_world, face_vertex_counts, face_vertex_indices = _remove_nan_points(points_world, face_vertex_counts, face_vertex_indices)
+
+        points_list.append(points_world)
+        counts_list.append(face_vertex_counts)
+        indices_list.append(face_vertex_indices + num_points)
+        num_points += points_world.shape[0]
+
+    if not points_list:
+        return np.zeros((0, 3), dtype=np.float64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
     return (
-        points_total,
-        faceVertexCounts_total,
-        faceVertexIndices_total,
+        np.concatenate(points_list),
+        np.concatenate(counts_list).astype(np.int32, copy=False),
+        np.concatenate(indices_list).astype(np.int32, copy=False),
     )
 
 
@@ -129,6 +221,60 @@ def compute_bbox(prim: Usd.Prim) -> np.ndarray:
     bbox_max = bound_range.max
     bound_range = np.array([bbox_min, bbox_max])
     return bound_range
+
+
+class WorldBBoxCache:
+    """
+    World-space bounding boxes backed by one UsdGeom.BBoxCache and one UsdGeom.XformCache.
+
+    Bounds and transforms of shared ancestors are computed once and reused by every prim,
+    instead of re-walking them on each compute_bbox call. The caches do not observe the
+    stage: call `clear` after editing transforms or geometry of prims already queried.
+    """
+    def __init__(self, time: Usd.TimeCode = Usd.TimeCode.Default(), purposes: Optional[List[str]] = None):
+        """
+        Args:
+            time: Time code bounds are computed at.
+            purposes: Included purposes. Defaults to [UsdGeom.Tokens.default_], like compute_bbox.
+        """
+        self.time = time
+        self.purposes = purposes if purposes is not None else [UsdGeom.Tokens.default_]
+        self.bbox_cache = UsdGeom.BBoxCache(time, self.purposes, useExtentsHint=False)
+        self.xform_cache = UsdGeom.XformCache(time)
+
+    def clear(self) -> None:
+        """
+        Drop every cached bound and transform, e.g. after prims were moved, added or removed.
+        """
+        self.bbox_cache.Clear()
+        self.xform_cache.Clear()
+
+    def compute(self, prim: Usd.Prim) -> np.ndarray:
+        """
+        Same result as compute_bbox: [(min_x, min_y, min_z), (max_x, max_y, max_z)].
+        """
+        bound_range = self.bbox_cache.ComputeWorldBound(prim).ComputeAlignedBox()
+        return np.array([bound_range.min, bound_range.max])
+
+    def compute_many(self, prims: List[Usd.Prim]) -> np.ndarray:
+        """
+        Bounds of many prims in one pass.
+
+        Returns:
+            A (N, 2, 3) float64 array, bboxes[i] = [min, max] of prims[i].
+        """
+        bboxes = np.empty((len(prims), 2, 3), dtype=np.float64)
+        for idx, prim in enumerate(prims):
+            bound_range = self.bbox_cache.ComputeWorldBound(prim).ComputeAlignedBox()
+            bboxes[idx, 0] = bound_range.min
+            bboxes[idx, 1] = bound_range.max
+        return bboxes
+
+    def local_to_world(self, prim: Usd.Prim) -> np.ndarray:
+        """
+        Cached 4x4 local-to-world matrix (row-vector convention).
+        """
+        return np.asarray(self.xform_cache.GetLocalToWorldTransform(prim))
             
 #==============================================================================
 #                              ATTRIBUTE UTILS
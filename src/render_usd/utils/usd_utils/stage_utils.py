@@ -1,26 +1,103 @@
-from pxr import Usd, UsdGeom
-from typing import List
-from .prim_utils import IsEmptyXform, IsMeshXform
+from pxr import Sdf, Usd, UsdGeom
+from typing import Dict, List, Sequence, Tuple
+from .prim_utils import IsEmptyXform
+from .edit_utils import StageEditBatch
+
+# Scopes of a GRScenes copy stage that receive semantics, relative to /World
+SCENE_COPY_SCOPES = {
+    "instances": "scene/Instances",
+    "wall": "scene/Structure/Wall",
+    "floor": "scene/Structure/Floor",
+    "ceiling": "scene/Structure/Ceiling",
+    "background": "scene/Structure/BgWall",
+}
+
+
+def contains_mesh(prim: Usd.Prim) -> bool:
+    """
+    Whether a prim is a Mesh or has one below it (iterative IsMeshXform).
+
+    Walks the subtree with one Usd.PrimRange and stops at the first Mesh.
+    """
+    return any(descendant.IsA(UsdGeom.Mesh) for descendant in Usd.PrimRange(prim))
+
+
+def discover_mesh_prims(
+    stage,
+    roots: Dict[str, Tuple[str, int]],
+) -> Dict[str, List[Sdf.Path]]:
+    """
+    Find the mesh-containing prims at a fixed depth below several roots in one traversal.
+
+    A prim at the requested depth (a candidate) is selected if it is a Mesh, or a non-empty
+    Xform with a Mesh somewhere below it (same rule as get_all_mesh_prims). A single
+    Usd.PrimRange walks the common ancestor of all roots and prunes every branch that is
+    neither on the way to a root nor above the requested depth; each candidate is then
+    checked by contains_mesh, which stops at its first Mesh.
+
+    Args:
+        stage: Stage (or a prim of it) to search.
+        roots: {key: (root prim path, depth)}; depth 1 selects children of the root,
+               depth 2 grandchildren.
+
+    Returns:
+        {key: [prim paths]} in traversal order; missing roots give empty lists.
+    """
+    stage = stage.GetStage() if isinstance(stage, Usd.Prim) else stage
+    results: Dict[str, List[Sdf.Path]] = {key: [] for key in roots}
+    roots_at: Dict[Sdf.Path, List[Tuple[str, int]]] = {}
+    for key, (path, depth) in roots.items():
+        if stage.GetPrimAtPath(path):
+            roots_at.setdefault(Sdf.Path(path), []).append((key, depth))
+    if not roots_at:
+        return results
+    root_paths = list(roots_at)
+    common_path = root_paths[0]
+    for path in root_paths[1:]:
+        common_path = common_path.GetCommonPrefix(path)
+    # Ancestors of the roots must be walked whatever their content
+    route = {prefix for path in root_paths for prefix in path.GetPrefixes()}
+
+    # Roots the prims of the current branch are under: (key, depth below root, wanted depth)
+    frames: List[List[Tuple[str, int, int]]] = []
+    iterator = iter(Usd.PrimRange.PreAndPostVisit(stage.GetPrimAtPath(common_path)))
+    for prim in iterator:
+        if iterator.IsPostVisit():
+            frames.pop()
+            continue
+        path = prim.GetPath()
+        levels = [(key, relative_depth + 1, depth) for key, relative_depth, depth in frames[-1]] if frames else []
+        levels.extend((key, 0, depth) for key, depth in roots_at.get(path, ()))
+        for key, relative_depth, depth in levels:
+            if relative_depth == depth and (prim.IsA(UsdGeom.Mesh) or prim.IsA(UsdGeom.Xform)) and contains_mesh(prim):
+                results[key].append(path)
+        levels = [level for level in levels if level[1] < level[2]]
+        frames.append(levels)
+        if not levels and path not in route:
+            iterator.PruneChildren()
+    return results
+
+
+def get_scope_mesh_prims(stage, scope_names: Sequence[str]) -> Dict[str, List[Usd.Prim]]:
+    """
+    Mesh prims of several scopes under /World (e.g. SCENE_COPY_SCOPES values) in one pass.
+
+    Returns:
+        {scope_name: [prims]}, each list equal to get_all_mesh_prims_from_scope(stage, scope_name).
+    """
+    stage = stage.GetStage() if isinstance(stage, Usd.Prim) else stage
+    paths = discover_mesh_prims(stage, {scope_name: (f"/World/{scope_name}", 2) for scope_name in scope_names})
+    return {scope_name: [stage.GetPrimAtPath(path) for path in scope_paths] for scope_name, scope_paths in paths.items()}
 
 
 # Get all mesh prims in the stage, including those inside Xform type prims.
 def get_all_mesh_prims(stage, world_node_path="/World"):
-    world_prim = stage.GetPrimAtPath(world_node_path)
-    mesh_prims = []
-    for prim in world_prim.GetAllChildren():
-        if prim.IsA(UsdGeom.Mesh):
-            mesh_prims.append(prim)
-        if prim.IsA(UsdGeom.Xform) and not IsEmptyXform(prim) and IsMeshXform(prim):
-            mesh_prims.append(prim)
-    return mesh_prims
+    stage = stage.GetStage() if isinstance(stage, Usd.Prim) else stage
+    paths = discover_mesh_prims(stage, {world_node_path: (world_node_path, 1)})[world_node_path]
+    return [stage.GetPrimAtPath(path) for path in paths]
 
 def get_all_mesh_prims_from_scope(stage, scope_name="Instances"):
-    all_mesh_list = []
-    instance_scope = stage.GetPrimAtPath(f"/World/{scope_name}")
-    for type_scope in instance_scope.GetChildren():
-        mesh_list = get_all_mesh_prims(type_scope, f"/World/{scope_name}/{type_scope.GetName()}")
-        all_mesh_list.extend(mesh_list)
-    return all_mesh_list
+    return get_scope_mesh_prims(stage, [scope_name])[scope_name]
 
 def get_all_mesh_prims_from_copy_stage(
     stage, 
@@ -54,22 +131,6 @@ def strip_world_prim(stage):
         scene_root = mesh_prims[0]
     return scene_root
 
-# Turn on all lighting in the stage.
+# Turn on all lighting in the stage, in one change block. Returns the number of lights switched.
 def switch_all_lights(stage, action="on"):
-    action_list = ["on", "off"]
-    assert action in action_list, f"Invalid action {action}, should be one of {action_list}"
-    light_types = [
-        "DistantLight",
-        "SphereLight",
-        "DiskLight",
-        "RectLight",
-        "CylinderLight"
-    ]
-
-    for prim in stage.Traverse():
-        prim_type_name = prim.GetTypeName()
-        if prim_type_name in light_types:
-            if action == "on":
-                UsdGeom.Imageable(prim).MakeVisible()
-            else:
-                UsdGeom.Imageable(prim).MakeInvisible()
+    return StageEditBatch(stage).switch_lights(action).apply()["visibility"]
@@ -0,0 +1,51 @@
+import pytest
+from pxr import Gf, Usd, UsdGeom
+
+
+@pytest.fixture
+def box_assets(tmp_path):
+    """
+    Five single-cube assets of increasing size, as standalone USD files.
+    """
+    usd_paths = []
+    for idx in range(5):
+        usd_path = tmp_path / "assets" / f"box_{idx}.usd"
+        stage = Usd.Stage.CreateNew(str(usd_path))
+        root = UsdGeom.Xform.Define(stage, "/root")
+        stage.SetDefaultPrim(root.GetPrim())
+        UsdGeom.Cube.Define(stage, "/root/cube").CreateSizeAttr(0.5 + 0.25 * idx)
+        stage.Save()
+        usd_paths.append(usd_path)
+    return usd_paths
+
+
+def define_cube_mesh(stage, path, position):
+    xform = UsdGeom.Xform.Define(stage, path)
+    xform.AddTranslateOp().Set(Gf.Vec3d(*position))
+    mesh = UsdGeom.Mesh.Define(stage, f"{path}/mesh")
+    mesh.CreatePointsAttr([(x, y, z) for z in (-0.5, 0.5) for y in (-0.5, 0.5) for x in (-0.5, 0.5)])
+    mesh.CreateFaceVertexCountsAttr([4] * 6)
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 3, 2, 4, 6, 7, 5, 0, 4, 5, 1, 2, 3, 7, 6, 0, 2, 6, 4, 1, 5, 7, 3])
+
+
+@pytest.fixture
+def grscenes_args(tmp_path, monkeypatch):
+    """
+    Arguments of a grscenes run over one scene with three instances, without a manifest.
+    """
+    monkeypatch.setattr("render_usd.core.renderer.fix_mdls", lambda *args, **kwargs: None)
+    scene_dir = tmp_path / "scenes" / "part1" / "1_usd" / "sA"
+    scene_dir.mkdir(parents=True)
+    scene = Usd.Stage.CreateNew(str(scene_dir / "sA_copy.usd"))
+    scene.SetDefaultPrim(UsdGeom.Xform.Define(scene, "/Root").GetPrim())
+    for idx in range(3):
+        define_cube_mesh(scene, f"/Root/Instances/box/m{idx}", (idx * 3.0, 0, 0.5))
+        model_dir = tmp_path / "objects" / "part1" / "1_usd" / "sA" / "models" / f"m{idx}"
+        model_dir.mkdir(parents=True)
+        model = Usd.Stage.CreateNew(str(model_dir / f"m{idx}.usd"))
+        model.SetDefaultPrim(UsdGeom.Xform.Define(model, "/m").GetPrim())
+        UsdGeom.Cube.Define(model, "/m/cube")
+        model.Save()
+    define_cube_mesh(scene, "/Root/Structure/Floor/floor0", (0, 0, -0.5))
+    scene.Save()
+    return ["grscenes", "--part", "1", "--usd", "1", "--objects_dir", str(tmp_path / "objects"), "--scene_dir", str(tmp_path / "scenes")]
@@ -0,0 +1,143 @@
+import json
+import threading
+
+import pytest
+
+from render_usd.cli import build_parser, check_arguments, plan_render, rebuild_manifest, run_command
+from render_usd.core.backends import create_backend
+from render_usd.core.backends.mock import MockBackend
+from render_usd.core.manifest import RenderManifest
+from render_usd.core import renderer as renderer_module
+from render_usd.core.renderer import RenderManager
+from render_usd.core.settle import SettleStrategy
+
+
+def make_renderer():
+    return RenderManager(
+        backend=create_backend("mock", frame_size=(64, 64)),
+        settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1),
+        writer_workers=2,
+    )
+
+
+def rendered_pngs(output_dir):
+    return sorted(path.name for path in output_dir.rglob("*.png"))
+
+
+def test_manifest_append_and_reload(tmp_path):
+    manifest_path = tmp_path / "manifest.jsonl"
+    output_path = tmp_path / "a_0.png"
+    output_path.write_bytes(b"png")
+    manifest = RenderManifest(manifest_path)
+    manifest.record("a.usd", [output_path])
+    manifest.record_outputs("b.usd", [], views=[0, 1])
+    # A worker killed mid-append leaves a torn trailing line
+    with open(manifest_path, "a") as f:
+        f.write('{"key": "c.usd", "vie')
+
+    reloaded = RenderManifest(manifest_path)
+    assert len(reloaded) == 2 and "c.usd" not in reloaded
+    assert reloaded.get("a.usd")["outputs"][0]["size"] == 3
+    assert reloaded.is_complete("b.usd", expected_views=2)
+    assert not reloaded.is_complete("b.usd", expected_views=4)
+
+    # The next record starts on a fresh line
+    reloaded.record_outputs("c.usd", [], views=[0])
+    assert RenderManifest(manifest_path).is_complete("c.usd", expected_views=1)
+    assert json.loads(manifest_path.read_text().splitlines()[-1])["key"] == "c.usd"
+
+
+def test_manifest_skips_recorded_objects(tmp_path, box_assets):
+    manifest_path = tmp_path / "manifest.jsonl"
+    output_dir = tmp_path / "out"
+    make_renderer().render_thumbnail_wo_bg(box_assets[:2], output_dir, show_bbox2d=False, manifest=RenderManifest(manifest_path))
+    manifest = RenderManifest(manifest_path)
+    assert all(manifest.is_complete(str(usd_path), expected_views=4) for usd_path in box_assets[:2])
+
+    # Recorded objects are skipped without listing their output directories
+    for png_path in output_dir.rglob("*.png"):
+        png_path.unlink()
+    make_renderer().render_thumbnail_wo_bg(box_assets[:3], output_dir, show_bbox2d=False, manifest=manifest)
+    assert rendered_pngs(output_dir) == [f"box_2_{view}.png" for view in range(4)]
+
+
+def test_manifest_record_with_missing_views_is_rendered_again(tmp_path, box_assets):
+    manifest = RenderManifest(tmp_path / "manifest.jsonl")
+    manifest.record_outputs(str(box_assets[0]), [], views=[0])
+    output_dir = tmp_path / "out"
+    make_renderer().render_thumbnail_wo_bg(box_assets[:1], output_dir, show_bbox2d=False, manifest=manifest)
+    assert rendered_pngs(output_dir) == [f"box_0_{view}.png" for view in range(4)]
+    assert manifest.is_complete(str(box_assets[0]), expected_views=4)
+
+
+def test_skip_rule_without_manifest_counts_written_views(tmp_path, box_assets):
+    output_dir = tmp_path / "out"
+    make_renderer().render_thumbnail_wo_bg(box_assets[:2], output_dir, show_bbox2d=False)
+    (output_dir / "box_0" / "box_0_3.png").unlink()
+    kept_path = output_dir / "box_1" / "box_1_0.png"
+    kept_path.write_bytes(b"kept")
+
+    make_renderer().render_thumbnail_wo_bg(box_assets[:2], output_dir, show_bbox2d=False)
+    assert (output_dir / "box_0" / "box_0_3.png").exists()
+    assert kept_path.read_bytes() == b"kept"
+
+
+class HidingBackend(MockBackend):
+    """
+    Mock backend that never labels one scene instance, so none of its views is detected.
+    """
+    hidden_instance = "m1"
+
+    def add_semantics(self, prim, semantic_label):
+        if not (prim.GetPath().pathString.startswith("/World/scene") and prim.GetName() == self.hidden_instance):
+            super().add_semantics(prim, semantic_label)
+
+
+def test_incremental_fingerprints_are_computed_on_writer_threads(tmp_path, box_assets, monkeypatch):
+    threads = []
+
+    def recording_fingerprint(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return compute_fingerprint(*args, **kwargs)
+
+    compute_fingerprint = renderer_module.compute_fingerprint
+    monkeypatch.setattr(renderer_module, "compute_fingerprint", recording_fingerprint)
+    output_dir = tmp_path / "out"
+    renderer = make_renderer()
+    renderer.render_thumbnail_wo_bg(box_assets, output_dir, show_bbox2d=False, incremental=True)
+    assert len(threads) == 5 and threading.main_thread() not in threads
+    assert len(list(output_dir.rglob("*.fingerprint.json"))) == 5
+    # Unchanged assets are up to date
+    assert renderer.render_thumbnail_wo_bg(box_assets, output_dir, show_bbox2d=False, incremental=True) == []
+
+
+def test_incremental_never_writes_fingerprints_next_to_assets(tmp_path, box_assets):
+    parser = build_parser()
+    args = parser.parse_args(["grscenes100", "--chunk_id", "0", "--chunk_total", "1", "--save_dir", "inplace", "--incremental"])
+    with pytest.raises(SystemExit):
+        check_arguments(parser, args)
+    make_renderer().render_thumbnail_wo_bg(box_assets, None, show_bbox2d=False, incremental=True)
+    assert len(rendered_pngs(box_assets[0].parent)) == 20
+    assert not list(box_assets[0].parent.glob("*.fingerprint.json"))
+
+
+def pending_keys(argv):
+    return {unit["key"] for unit in plan_render(build_parser().parse_args(argv))["pending"]}
+
+
+def test_instance_without_views_is_pending_with_any_manifest(tmp_path, grscenes_args):
+    manifest_argv = grscenes_args + ["--manifest", str(tmp_path / "manifest.jsonl")]
+    renderer = RenderManager(
+        backend=HidingBackend(frame_size=(64, 64)),
+        settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1),
+        writer_workers=0,
+    )
+    run_command(build_parser().parse_args(manifest_argv), renderer)
+
+    pending = pending_keys(manifest_argv)
+    assert len(pending) == 1 and pending.pop().endswith(":m1")
+    # The directory rule and a manifest rebuilt from disk agree with the recorded manifest
+    assert pending_keys(grscenes_args) == pending_keys(manifest_argv)
+    rebuilt_argv = grscenes_args + ["--manifest", str(tmp_path / "rebuilt.jsonl")]
+    rebuild_manifest(build_parser().parse_args(rebuilt_argv))
+    assert pending_keys(rebuilt_argv) == pending_keys(manifest_argv)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from pxr import Gf, Usd, UsdGeom
+
+from render_usd.utils.usd_utils import prim_utils
+from render_usd.utils.usd_utils.prim_utils import parse_meshes, recursive_parse
+
+QUAD_POINTS = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+
+
+def define_quad(stage, path, translate, points=QUAD_POINTS):
+    xform = UsdGeom.Xform.Define(stage, path)
+    xform.AddTranslateOp().Set(Gf.Vec3d(*translate))
+    mesh = UsdGeom.Mesh.Define(stage, f"{path}/mesh")
+    mesh.CreatePointsAttr([Gf.Vec3f(*point) for point in points])
+    mesh.CreateFaceVertexCountsAttr([4])
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 2, 3])
+    return mesh
+
+
+@pytest.fixture
+def quad_stage(tmp_path):
+    stage = Usd.Stage.CreateNew(str(tmp_path / "quads.usda"))
+    define_quad(stage, "/World/a", (0, 0, 0))
+    define_quad(stage, "/World/b", (0, 0, 2))
+    stage.Save()
+    return stage
+
+
+def test_parse_meshes_flattens_into_world_space(quad_stage):
+    points, face_vertex_counts, face_vertex_indices = parse_meshes(quad_stage.GetPrimAtPath("/World"))
+    assert points.dtype == np.float32 and face_vertex_indices.dtype == np.int32
+    np.testing.assert_allclose(points[4:], np.asarray(QUAD_POINTS) + [0, 0, 2])
+    assert face_vertex_counts.tolist() == [4, 4]
+    assert face_vertex_indices.tolist() == [0, 1, 2, 3, 4, 5, 6, 7]
+
+    list_points, list_counts, list_indices = recursive_parse(quad_stage.GetPrimAtPath("/World"))
+    # The list form keeps its float64 rows
+    assert all(point.dtype == np.float64 for point in list_points)
+    np.testing.assert_allclose(np.asarray(list_points), points)
+    assert list_counts == face_vertex_counts.tolist() and list_indices == face_vertex_indices.tolist()
+
+
+def test_parse_meshes_drops_nan_points_with_their_faces():
+    stage = Usd.Stage.CreateInMemory()
+    mesh = define_quad(stage, "/World/a", (0, 0, 0), points=QUAD_POINTS + [(float("nan"), 0, 0), (2, 0, 0), (2, 1, 0)])
+    mesh.GetFaceVertexCountsAttr().Set([4, 3, 3])
+    mesh.GetFaceVertexIndicesAttr().Set([0, 1, 2, 3, 1, 4, 2, 1, 5, 6])
+    points, face_vertex_counts, face_vertex_indices = parse_meshes(stage.GetPrimAtPath("/World"))
+    assert points.shape == (6, 3)
+    assert face_vertex_counts.tolist() == [4, 3]
+    assert face_vertex_indices.tolist() == [0, 1, 2, 3, 1, 4, 5]
+
+
+def test_parse_meshes_npz_cache(tmp_path, quad_stage):
+    cache_dir = tmp_path / "mesh_cache"
+    prim = quad_stage.GetPrimAtPath("/World")
+    first = parse_meshes(prim, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.npz"))) == 1
+    for cached, computed in zip(parse_meshes(prim, cache_dir=cache_dir), first):
+        np.testing.assert_array_equal(cached, computed)
+    assert len(list(cache_dir.glob("*.npz"))) == 1
+
+    # Saved edits change the key, so the mesh is parsed again
+    UsdGeom.Xformable(quad_stage.GetPrimAtPath("/World/b")).GetOrderedXformOps()[0].Set(Gf.Vec3d(0, 0, 5))
+    quad_stage.Save()
+    points = parse_meshes(prim, cache_dir=cache_dir)[0]
+    np.testing.assert_allclose(points[4:], np.asarray(QUAD_POINTS) + [0, 0, 5])
+    assert len(list(cache_dir.glob("*.npz"))) == 2
+
+
+def test_mesh_cache_key_reads_each_layer_once_and_ignores_session_edits(tmp_path, quad_stage, monkeypatch):
+    monkeypatch.setattr(prim_utils, "_LAYER_DIGESTS", {})
+    cache_dir = tmp_path / "mesh_cache"
+    for path in ("/World/a", "/World/b", "/World"):
+        parse_meshes(quad_stage.GetPrimAtPath(path), cache_dir=cache_dir)
+    assert len(prim_utils._LAYER_DIGESTS) == 1
+    assert len(list(cache_dir.glob("*.npz"))) == 3
+
+    # Render-time edits in the session layer do not invalidate the cache
+    with Usd.EditContext(quad_stage, quad_stage.GetSessionLayer()):
+        UsdGeom.Camera.Define(quad_stage, "/World/camera")
+    parse_meshes(quad_stage.GetPrimAtPath("/World"), cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.npz"))) == 3
@@ -0,0 +1,101 @@
+import json
+
+from render_usd.cli import build_parser, select_grscenes100_chunk
+from render_usd.core.backends import create_backend
+from render_usd.core.partition import contiguous_loads, estimate_costs, load_measured_times, lpt_partition
+from render_usd.core.renderer import RenderManager
+from render_usd.core.settle import SettleStrategy
+
+
+def make_assets(tmp_path, sizes):
+    usd_paths = []
+    for idx, size in enumerate(sizes):
+        usd_path = tmp_path / f"asset_{idx}.usd"
+        usd_path.write_bytes(b"#usda 1.0\n" + b" " * size)
+        usd_paths.append(usd_path)
+    return usd_paths
+
+
+def test_lpt_partition_balances_costs():
+    costs = [1.0, 1.0, 1.0, 1.0, 8.0, 7.0, 2.0, 3.0]
+    bins, loads = lpt_partition(costs, 3)
+    assert sorted(idx for items in bins for idx in items) == list(range(len(costs)))
+    assert all(items == sorted(items) for items in bins)
+    assert loads == [sum(costs[idx] for idx in items) for items in bins]
+    assert max(loads) == 8.0 < max(contiguous_loads(costs, 3))
+    # Every worker computes the same partition
+    assert lpt_partition(costs, 3) == (bins, loads)
+
+
+def test_measured_times_calibrate_estimates(tmp_path):
+    usd_paths = make_assets(tmp_path, [0, 0, 0])
+    timing_path = tmp_path / "timings.jsonl"
+    with open(timing_path, "w") as f:
+        f.write(json.dumps({"key": str(usd_paths[0]), "phases": {"render_steps": 4.0, "encode": 1.0}, "total": 5.0}) + "\n")
+        f.write(json.dumps({"key": str(usd_paths[0]), "phases": {"render_steps": 6.0, "write": 3.0}, "total": 9.0}) + "\n")
+        f.write('{"key": "torn')
+    measured_times = load_measured_times([timing_path])
+    # Writer phases are left out
+    assert measured_times == {str(usd_paths[0]): 5.0}
+    costs, calibrated = estimate_costs(usd_paths, measured_times=measured_times)
+    assert calibrated and costs[0] == 5.0
+    assert costs[1] == costs[2] > 4.0
+
+
+def test_tiled_timings_are_measured_per_object(tmp_path, box_assets):
+    timing_path = tmp_path / "timings.jsonl"
+    renderer = RenderManager(
+        backend=create_backend("mock", frame_size=(64, 64)),
+        settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1),
+        writer_workers=2,
+        profile=True,
+        profile_output=timing_path,
+    )
+    renderer.render_thumbnail_wo_bg(box_assets, tmp_path / "out", tile_size=3)
+    renderer.image_writer.flush()
+    records = [json.loads(line) for line in timing_path.read_text().splitlines()]
+    assert [len(record["members"]) for record in records] == [3, 2]
+    measured_times = load_measured_times([timing_path])
+    assert sorted(measured_times) == sorted(str(usd_path) for usd_path in box_assets)
+    first_tile = records[0]
+    render_seconds = sum(value for name, value in first_tile["phases"].items() if name not in ("write_submit", "encode", "write"))
+    assert abs(measured_times[first_tile["members"][0]] - render_seconds / 3) < 1e-9
+
+
+def test_cost_cache_is_reused_while_mtimes_are_unchanged(tmp_path, monkeypatch):
+    usd_paths = make_assets(tmp_path, [10, 20])
+    cache_path = tmp_path / "costs.json"
+    costs, _ = estimate_costs(usd_paths, cache_path=cache_path)
+    assert len(json.loads(cache_path.read_text())) == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("asset measured again")
+
+    monkeypatch.setattr("render_usd.core.partition.measure_asset", fail)
+    assert estimate_costs(usd_paths, cache_path=cache_path)[0] == costs
+
+
+def test_chunks_cover_every_asset_once(tmp_path):
+    usd_paths = make_assets(tmp_path, [1 << 20, 10, 3 << 20, 20, 30, 2 << 20, 40])
+    for partition in ("contiguous", "lpt"):
+        chunks = []
+        for chunk_id in range(3):
+            args = build_parser().parse_args(["grscenes100", "--chunk_id", str(chunk_id), "--chunk_total", "3", "--partition", partition])
+            chunks.append(select_grscenes100_chunk(args, usd_paths)[0])
+        assert sorted(usd_path for chunk in chunks for usd_path in chunk) == sorted(usd_paths)
+
+
+def test_precheck_and_render_share_one_partition(tmp_path, monkeypatch):
+    usd_paths = make_assets(tmp_path, [10, 20, 30])
+    calls = []
+
+    def count_calls(usd_paths, *args, **kwargs):
+        calls.append(len(usd_paths))
+        return [1.0] * len(usd_paths), False
+
+    monkeypatch.setattr("render_usd.core.partition.estimate_costs", count_calls)
+    args = build_parser().parse_args(["grscenes100", "--chunk_id", "0", "--chunk_total", "2", "--partition", "lpt"])
+    chunk_cache = {}
+    selection = select_grscenes100_chunk(args, usd_paths, report=True, chunk_cache=chunk_cache)
+    assert select_grscenes100_chunk(args, usd_paths, chunk_cache=chunk_cache) == selection
+    assert calls == [3]
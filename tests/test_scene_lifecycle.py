@@ -0,0 +1,30 @@
+from render_usd import cli
+from render_usd.core import scene_lifecycle
+from render_usd.core.backends import create_backend
+from render_usd.core.renderer import RenderManager
+from render_usd.core.scene_lifecycle import SceneLifecycle
+from render_usd.core.work_queue import WorkQueue
+
+
+def test_memory_check_uses_current_rss_only(monkeypatch):
+    scenes = SceneLifecycle(create_backend("mock"))
+    monkeypatch.setattr(scene_lifecycle, "process_rss_bytes", lambda: 3 * 2**30)
+    assert scenes.memory_exceeded(2 * 2**30)
+    assert not scenes.memory_exceeded(None)
+    # Without a current reading the check is skipped
+    monkeypatch.setattr(scene_lifecycle, "process_rss_bytes", lambda: None)
+    assert not scenes.memory_exceeded(2 * 2**30)
+
+
+def test_restart_releases_everything_before_exec(tmp_path, box_assets, monkeypatch):
+    events = []
+    renderer = RenderManager(backend=create_backend("mock", frame_size=(64, 64)), writer_workers=2)
+    work_queue = WorkQueue(tmp_path / "queue")
+    work_queue.initialize([(usd_path, tmp_path / "out" / usd_path.stem) for usd_path in box_assets], batch_size=5)
+    lease = next(work_queue.leases())
+    monkeypatch.setattr(cli, "close_app", lambda kit: events.append(("close_app", kit)))
+    monkeypatch.setattr(scene_lifecycle, "restart_process", lambda: events.append(("exec", work_queue.pending_batch_ids())))
+
+    cli.restart_renderer(renderer, "kit", work_queue)
+    # The held batch went back to the queue and Kit was closed before the process was replaced
+    assert events == [("close_app", "kit"), ("exec", [lease.batch_id])]
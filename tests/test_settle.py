@@ -0,0 +1,55 @@
+import numpy as np
+
+from render_usd.core.settle import SettleStrategy, frame_delta
+
+
+class FadingWorld:
+    """
+    Fake world whose single camera frame halves its distance to black on every render step.
+    """
+    def __init__(self):
+        self.physics_steps = 0
+        self.render_steps = 0
+        self.frame = np.full((8, 8, 3), 255, dtype=np.uint8)
+
+    def step(self, render=True):
+        if render:
+            self.render_steps += 1
+            self.frame = (self.frame // 2).astype(np.uint8)
+        else:
+            self.physics_steps += 1
+
+
+def test_frame_delta():
+    black = np.zeros((4, 4, 3), dtype=np.uint8)
+    white = np.full((4, 4, 3), 255, dtype=np.uint8)
+    assert frame_delta([black], [black]) == 0.0
+    assert frame_delta([black, black], [black, white]) == 1.0
+    assert frame_delta([black], [None]) == float("inf")
+    assert frame_delta([black], [np.zeros((2, 2, 3), dtype=np.uint8)]) == float("inf")
+
+
+def test_fixed_runs_every_step():
+    world = FadingWorld()
+    result = SettleStrategy.fixed(physics_steps=100, render_steps=8).settle(world, ["camera"], lambda _: world.frame)
+    assert (world.physics_steps, world.render_steps) == (100, 8)
+    assert result.converged and result.render_steps == 8
+
+
+def test_adaptive_stops_once_frames_converge():
+    world = FadingWorld()
+    strategy = SettleStrategy.adaptive(threshold=0.01, min_render_steps=2, max_render_steps=16)
+    result = strategy.settle(world, ["camera"], lambda _: world.frame.copy())
+    # Frames 127, 63, 31, 15, 7, 3, ...: the step from 3 to 1 is the first below 1% of 255
+    assert result.converged
+    assert result.render_steps == world.render_steps == 7
+    assert world.physics_steps == 0
+    assert result.last_delta < 0.01
+
+
+def test_adaptive_gives_up_at_max_render_steps():
+    world = FadingWorld()
+    frames = iter(np.random.default_rng(0).integers(0, 256, size=(16, 8, 8, 3), dtype=np.uint8))
+    result = SettleStrategy.adaptive(threshold=0.001, max_render_steps=5).settle(world, ["camera"], lambda _: next(frames))
+    assert not result.converged
+    assert result.render_steps == world.render_steps == 5
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from render_usd.core.backends import create_backend
+from render_usd.core.backends.mock import MockBackend
+from render_usd.core.renderer import RenderManager
+from render_usd.core.settle import SettleStrategy
+from render_usd.core.tiling import camera_look_at_frame, compute_tile_layout, sphere_in_frustum, split_into_tiles
+
+VIEW_ANGLES = [(idx * 90.0, 35.0) for idx in range(4)]
+
+
+def test_split_into_tiles():
+    assert split_into_tiles(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+    assert split_into_tiles([], 3) == []
+
+
+@pytest.mark.parametrize("focal_length, aspect_ratio", [(18.0, 1.0), (24.0, 0.75)])
+def test_tile_layout_isolates_every_view(focal_length, aspect_ratio):
+    bboxes = [np.array([[-0.5, -0.5, 0.0], [0.5, 0.5, 1.0]]) * scale for scale in (1.0, 0.3, 2.0, 0.7)]
+    layout = compute_tile_layout(bboxes, VIEW_ANGLES, focal_length=focal_length, aspect_ratio=aspect_ratio)
+    tan_half_fov = 20.0955 / 2 / focal_length
+    radii = [np.linalg.norm(bbox[1] - bbox[0]) / 2 for bbox in bboxes]
+    for target_idx, center in enumerate(layout.centers):
+        np.testing.assert_allclose(center, np.mean(bboxes[target_idx], axis=0) + layout.offsets[target_idx])
+        for azimuth, elevation in VIEW_ANGLES:
+            position, forward = camera_look_at_frame(center, layout.distances[target_idx], elevation, azimuth)
+            assert sphere_in_frustum(position, forward, center, radii[target_idx], tan_half_fov, tan_half_fov * aspect_ratio)
+            for other_idx, other_center in enumerate(layout.centers):
+                if other_idx != target_idx:
+                    assert not sphere_in_frustum(position, forward, other_center, radii[other_idx], tan_half_fov, tan_half_fov * aspect_ratio)
+
+
+def test_tile_layout_moves_assets_as_little_as_possible():
+    bboxes = [np.array([[0.2, -0.1, 0.0], [0.6, 0.3, 0.5]]), np.array([[-1.0, -1.0, 0.5], [1.0, 1.0, 2.5]])]
+    layout = compute_tile_layout(bboxes, VIEW_ANGLES)
+    # The first asset keeps its lighting; the others only slide along the ground
+    np.testing.assert_allclose(layout.offsets[0], 0.0)
+    np.testing.assert_allclose(layout.offsets[:, 2], 0.0)
+    assert compute_tile_layout(bboxes[:1], VIEW_ANGLES).offsets.tolist() == [[0.0, 0.0, 0.0]]
+
+
+@pytest.mark.parametrize("tile_size", [1, 3])
+def test_tiled_render_writes_every_view(tmp_path, box_assets, tile_size):
+    renderer = RenderManager(
+        backend=create_backend("mock", frame_size=(64, 64)),
+        settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1),
+        writer_workers=0,
+    )
+    output_dir = tmp_path / f"out_{tile_size}"
+    renderer.render_thumbnail_wo_bg(box_assets, output_dir, show_bbox2d=True, tile_size=tile_size)
+    written = sorted(path.name for path in output_dir.rglob("*.png"))
+    assert written == sorted(f"box_{idx}_{view}_bbox2d.png" for idx in range(5) for view in range(4))
+
+
+def test_tiled_render_prefetches_the_next_tile(tmp_path, box_assets):
+    renderer = RenderManager(
+        backend=create_backend("mock", frame_size=(64, 64)),
+        settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1),
+        writer_workers=0,
+        prefetch_lookahead=1,
+    )
+    renderer.render_thumbnail_wo_bg(box_assets, tmp_path / "out", tile_size=3)
+    # Only the first tile is loaded without prefetch, whatever the lookahead
+    assert renderer.prefetcher.misses == 3
+    assert renderer.prefetcher.hits + renderer.prefetcher.late_hits == 2
+
+
+class ActivationRecordingBackend(MockBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cameras = []
+        self.inactive_at_readback = []
+
+    def create_camera(self, *args, **kwargs):
+        camera = super().create_camera(*args, **kwargs)
+        self.cameras.append(camera)
+        return camera
+
+    def get_src(self, camera, type):
+        self.inactive_at_readback.append(sum(not other.active for other in self.cameras))
+        return super().get_src(camera, type)
+
+
+def test_partial_tile_deactivates_unused_cameras(tmp_path, box_assets):
+    backend = ActivationRecordingBackend(frame_size=(64, 64))
+    renderer = RenderManager(
+        backend=backend,
+        settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1),
+        writer_workers=0,
+    )
+    renderer.render_thumbnail_wo_bg(box_assets, tmp_path / "out", tile_size=3)
+    # 5 objects: a full tile of 3, then 2 objects leaving one slot's 4 cameras unused
+    assert sorted(set(backend.inactive_at_readback)) == [0, 4]
+    assert backend.inactive_at_readback[-1] == 4
+    assert all(camera.active for camera in backend.cameras)
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+from pxr import Gf, Usd, UsdGeom
+
+from render_usd.cli import build_parser, run_command
+from render_usd.core.backends.mock import MockBackend
+from render_usd.core.renderer import RenderManager
+from render_usd.core.settle import SettleStrategy
+from render_usd.core.visibility import OcclusionScene, triangulate
+from render_usd.utils.usd_utils.prim_utils import WorldBBoxCache
+
+# Quads of a box whose corners are ordered by (x, y, z) sign bits
+BOX_FACE_VERTEX_INDICES = [0, 1, 3, 2, 4, 6, 7, 5, 0, 4, 5, 1, 2, 3, 7, 6, 0, 2, 6, 4, 1, 5, 7, 3]
+
+
+def define_box(stage, path, center, size):
+    half_size = np.asarray(size, dtype=float) / 2
+    corners = [np.asarray(center) + half_size * np.array([x, y, z]) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    mesh = UsdGeom.Mesh.Define(stage, path)
+    mesh.CreatePointsAttr([Gf.Vec3f(*map(float, corner)) for corner in corners])
+    mesh.CreateFaceVertexCountsAttr([4] * 6)
+    mesh.CreateFaceVertexIndicesAttr(BOX_FACE_VERTEX_INDICES)
+    return mesh.GetPrim()
+
+
+@pytest.fixture(scope="module")
+def occluded_target():
+    """
+    A unit box on a floor, with a wall standing between it and cameras at azimuth 30.
+    """
+    stage = Usd.Stage.CreateInMemory()
+    prims = [
+        define_box(stage, "/World/target", (0, 0, 0.5), (1, 1, 1)),
+        define_box(stage, "/World/blocker", (1.2, 0.8, 0.6), (0.3, 2.5, 1.4)),
+        define_box(stage, "/World/floor", (0, 0, -0.01), (20, 20, 0.02)),
+    ]
+    bboxes = WorldBBoxCache().compute_many(prims)
+    center = bboxes[0].mean(axis=0)
+    distance = float(np.linalg.norm(bboxes[0, 1] - bboxes[0, 0]))
+    yield OcclusionScene(prims, bboxes), center, distance
+    del stage  # prims are read lazily, so the stage must outlive the tests
+
+
+def test_occluder_fails_the_view_behind_it(occluded_target):
+    scene, center, distance = occluded_target
+    estimate = scene.estimate_view(0, center, distance, azimuth=30, elevation=35)
+    assert estimate.detected
+    assert estimate.bbox_ratio < 0.8
+    assert not estimate.passes()
+
+
+@pytest.mark.parametrize("azimuth", [150, 270])
+def test_clear_views_pass(occluded_target, azimuth):
+    scene, center, distance = occluded_target
+    estimate = scene.estimate_view(0, center, distance, azimuth=azimuth, elevation=35)
+    assert estimate.passes()
+    assert estimate.bbox_ratio == pytest.approx(1.0)
+    assert estimate.visible_fraction == pytest.approx(1.0)
+
+
+def test_floor_hides_bottom_views(occluded_target):
+    scene, center, distance = occluded_target
+    estimate = scene.estimate_view(0, center, distance, azimuth=30, elevation=-35)
+    assert not estimate.detected
+    assert estimate.bbox_ratio == 0.0
+
+
+def test_plan_views_moves_occluded_view(occluded_target):
+    scene, center, distance = occluded_target
+    view_angles = [(30 + idx * 120, 35 if idx < 3 else -35) for idx in range(6)]
+    plan = scene.plan_views(0, center, distance, view_angles)
+    assert plan[0].passes() and plan[0].azimuth != 30
+    assert abs(plan[0].azimuth - 30) <= 45
+    assert [(estimate.azimuth, estimate.elevation) for estimate in plan[1:3]] == view_angles[1:3]
+    assert not any(estimate.passes() for estimate in plan[3:])
+
+
+def test_triangulate_fans_polygons():
+    triangles = triangulate(np.zeros((5, 3)), np.array([3, 5]), np.array([0, 1, 2, 0, 1, 2, 3, 4]))
+    assert triangles.shape == (4, 3, 3)
+
+
+class CameraRecordingBackend(MockBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cameras = []
+
+    def create_camera(self, *args, **kwargs):
+        camera = super().create_camera(*args, **kwargs)
+        self.cameras.append(camera)
+        return camera
+
+
+def test_precheck_predicts_with_the_render_cameras(grscenes_args, monkeypatch):
+    plan_kwargs = []
+    plan_views = OcclusionScene.plan_views
+
+    def recording_plan_views(self, *args, **kwargs):
+        plan_kwargs.append(kwargs)
+        return plan_views(self, *args, **kwargs)
+
+    monkeypatch.setattr(OcclusionScene, "plan_views", recording_plan_views)
+    backend = CameraRecordingBackend()
+    renderer = RenderManager(backend=backend, settle_strategy=SettleStrategy.fixed(physics_steps=0, render_steps=1), writer_workers=0)
+    run_command(build_parser().parse_args(grscenes_args + ["--visibility_precheck"]), renderer)
+    assert len(plan_kwargs) == 3
+    camera = backend.cameras[-1]
+    for kwargs in plan_kwargs:
+        assert kwargs["frame_size"] == (camera.image_width, camera.image_height)
+        assert kwargs["focal_length"] == camera.focal_length
+        assert kwargs["horizontal_aperture"] == camera.horizontal_aperture
@@ -0,0 +1,87 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from render_usd.core.work_queue import WorkQueue
+
+
+def make_queue(queue_dir, num_objects=6, batch_size=2, lease_seconds=60.0, worker_id="worker"):
+    queue = WorkQueue(queue_dir, lease_seconds=lease_seconds, worker_id=worker_id)
+    queue.initialize([(Path(f"obj_{idx}.usd"), Path("out")) for idx in range(num_objects)], batch_size=batch_size)
+    return queue
+
+
+@pytest.fixture
+def queue_dir(tmp_path):
+    return tmp_path / "queue"
+
+
+def test_initialize_once(queue_dir):
+    queue = make_queue(queue_dir)
+    other = WorkQueue(queue_dir, worker_id="other")
+    assert not other.initialize([(Path("ignored.usd"), Path("out"))], batch_size=1)
+    assert queue.status() == {"total": 3, "done": 0, "claimed": 0, "expired": 0, "waiting": 3}
+
+
+def test_claim_is_exclusive(queue_dir):
+    first = make_queue(queue_dir, worker_id="first")
+    second = WorkQueue(queue_dir, worker_id="second")
+    lease = first.claim()
+    assert lease.batch_id == "000000"
+    assert lease.object_usd_paths == [Path("obj_0.usd"), Path("obj_1.usd")]
+    assert second.claim().batch_id == "000001"
+    assert second.claim().batch_id == "000002"
+    assert second.claim() is None
+    first.close()
+    second.close()
+
+
+def test_expired_lease_is_reclaimed(queue_dir):
+    crashed = make_queue(queue_dir, num_objects=2, lease_seconds=5.0, worker_id="crashed")
+    lease = crashed.claim()
+    crashed._stop.set()  # no heartbeat: the worker is gone
+    survivor = WorkQueue(queue_dir, lease_seconds=5.0, worker_id="survivor")
+    assert survivor.claim() is None
+
+    stale = time.time() - 10.0
+    os.utime(survivor._claim_path(lease.batch_id), (stale, stale))
+    assert survivor.status()["expired"] == 1
+    reclaimed = survivor.claim()
+    assert reclaimed.batch_id == lease.batch_id
+    assert survivor.reclaimed == 1
+    assert survivor.status()["claimed"] == 1
+    survivor.close()
+
+
+def test_complete_marks_done_and_drops_claim(queue_dir):
+    queue = make_queue(queue_dir)
+    leases = list(queue.leases())
+    assert [lease.batch_id for lease in leases] == ["000000", "000001", "000002"]
+    for lease in leases:
+        queue.complete(lease)
+    assert queue.completed == 3
+    assert queue.status() == {"total": 3, "done": 3, "claimed": 0, "expired": 0, "waiting": 0}
+    assert queue.pending_batch_ids() == []
+    assert not any(queue.claims_dir.iterdir())
+    assert WorkQueue(queue_dir, worker_id="late").claim() is None
+    queue.close()
+
+
+def test_released_batch_goes_to_other_workers(queue_dir):
+    queue = make_queue(queue_dir, num_objects=2)
+    lease = queue.claim()
+    queue.release(lease)
+    assert queue.status()["waiting"] == 1
+    assert queue.claim() is None
+    assert WorkQueue(queue_dir, worker_id="other").claim().batch_id == lease.batch_id
+    queue.close()
+
+
+def test_close_releases_unfinished_batches(queue_dir):
+    queue = make_queue(queue_dir)
+    queue.claim()
+    queue.close()
+    assert queue.status()["claimed"] == 0
+    assert queue.status()["waiting"] == 3
@@ -0,0 +1,84 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from render_usd.core.writer import AsyncImageWriter
+
+FRAME = np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+class GatedWriter(AsyncImageWriter):
+    """
+    Writer whose writes wait until the test opens the gate.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.gate = threading.Event()
+
+    def _write(self, *args):
+        self.gate.wait()
+        return AsyncImageWriter._write(*args)
+
+
+def test_submit_blocks_once_max_pending_frames_are_queued(tmp_path):
+    writer = GatedWriter(num_workers=1, max_pending=2)
+    writer.submit(FRAME, str(tmp_path / "0.png"))
+    writer.submit(FRAME, str(tmp_path / "1.png"))
+    submitted = threading.Event()
+
+    def submit_third():
+        writer.submit(FRAME, str(tmp_path / "2.png"))
+        submitted.set()
+
+    thread = threading.Thread(target=submit_third)
+    thread.start()
+    assert not submitted.wait(0.2)
+    writer.gate.set()
+    assert submitted.wait(5.0)
+    thread.join()
+    assert writer.close() == []
+    assert sorted(path.name for path in tmp_path.glob("*.png")) == ["0.png", "1.png", "2.png"]
+
+
+def test_completion_callback_gets_outputs_in_submission_order(tmp_path):
+    writer = AsyncImageWriter(num_workers=2)
+    completed = []
+    futures = [writer.submit(FRAME, str(tmp_path / f"{idx}.png")) for idx in range(3)]
+    writer.when_all_done(futures, completed.append)
+    assert writer.flush() == []
+    assert [[Path(output["path"]).name for output in outputs] for outputs in completed] == [["0.png", "1.png", "2.png"]]
+    writer.close()
+
+
+def test_failed_write_skips_the_completion_callback(tmp_path):
+    writer = AsyncImageWriter(num_workers=2)
+    (tmp_path / "not_a_dir").write_text("")
+    completed = []
+    futures = [writer.submit(FRAME, str(tmp_path / "ok.png")), writer.submit(FRAME, str(tmp_path / "not_a_dir" / "bad.png"))]
+    writer.when_all_done(futures, completed.append)
+    errors = writer.flush()
+    assert [Path(error.path).name for error in errors] == ["bad.png"]
+    assert completed == []
+    writer.close()
+
+
+def test_on_error_runs_once_when_a_write_fails(tmp_path):
+    writer = AsyncImageWriter(num_workers=2)
+    (tmp_path / "not_a_dir").write_text("")
+    completed, failed = [], []
+    futures = [writer.submit(FRAME, str(tmp_path / "not_a_dir" / f"{idx}.png")) for idx in range(3)]
+    writer.when_all_done(futures, completed.append, on_error=lambda: failed.append(True))
+    assert len(writer.flush()) == 3
+    assert completed == [] and failed == [True]
+    writer.close()
+
+
+def test_offloaded_callback_never_runs_in_the_caller(tmp_path):
+    writer = AsyncImageWriter(num_workers=1)
+    future = writer.submit(FRAME, str(tmp_path / "0.png"))
+    future.result()  # already written: a plain callback would run right here
+    threads = []
+    writer.when_all_done([future], lambda _: threads.append(threading.current_thread()), offload=True)
+    assert writer.flush() == []
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()